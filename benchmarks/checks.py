@@ -0,0 +1,51 @@
+# benchmarks/checks.py
+"""
+Проверки, которые должны проходить перед слиянием (и в CI)
+
+Каждая проверка — скрипт из benchmarks, который при нарушении завершается
+с кодом 1. Скрипты запускаются по очереди в отдельных процессах (часть из
+них включает трассировку при импорте), их вывод печатается как есть.
+Итоговый код — 1, если не прошла хотя бы одна проверка.
+
+Запуск из корня проекта:
+    python -m benchmarks.checks
+    python -m benchmarks.checks update_budget probe_check
+"""
+import subprocess
+import sys
+import time
+
+# Скрипты-проверки в порядке запуска
+CHECKS = (
+    "update_budget",
+    "trace_nesting",
+    "probe_check",
+    "nearest_colors",
+)
+
+
+def main():
+    names = sys.argv[1:] or CHECKS
+    unknown = [name for name in names if name not in CHECKS]
+    if unknown:
+        print(f"Неизвестные проверки: {', '.join(unknown)}; доступны: {', '.join(CHECKS)}")
+        sys.exit(2)
+
+    failed = []
+    for name in names:
+        print(f"=== {name}", flush=True)
+        started = time.perf_counter()
+        code = subprocess.run([sys.executable, "-m", f"benchmarks.{name}"]).returncode
+        status = "ok" if code == 0 else f"FAIL (код {code})"
+        print(f"=== {name}: {status}, {time.perf_counter() - started:.1f} с\n", flush=True)
+        if code != 0:
+            failed.append(name)
+
+    if failed:
+        print(f"Не прошли: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"Все проверки пройдены ({len(names)})")
+
+
+if __name__ == "__main__":
+    main()
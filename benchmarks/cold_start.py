@@ -0,0 +1,72 @@
+# benchmarks/cold_start.py
+"""
+Время до готовности страниц "Иконки" и "Цвета" при холодном старте
+
+Каждый замер идёт в новом процессе: первый — с пустой папкой снимков
+(рефлексия и запись снимка), второй — со снимком, записанным первым.
+Снимок есть только у каталога иконок: страницу цветов почти целиком
+занимает построение карточек, а чтение снимка её только замедляло.
+
+Запуск из корня проекта:
+    python -m benchmarks.cold_start
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Страницы, каталог которых сохраняется в снимок
+SNAPSHOT_KINDS = ("icons",)
+
+
+def measure_child(kind: str):
+    """Замер в текущем процессе (вызывается в дочернем процессе)"""
+    started = time.perf_counter()
+    from benchmarks.harness import make_page
+    imported = time.perf_counter()
+
+    page, conn, loop = make_page()
+    if kind == "icons":
+        from ui.views.icons import IconsView
+        view = IconsView(page=page)
+        page.add(view)
+    else:
+        from ui.views.colors import ColorsView
+        view = ColorsView(page=page)
+        page.add(view)
+        loop.run_until_complete(view.load_colors_async())
+    ready = time.perf_counter()
+
+    print(json.dumps({
+        "import_s": imported - started,
+        "interactive_s": ready - imported,
+    }))
+
+
+def run(kind: str, cache_dir: str):
+    env = dict(os.environ, FLETAPP_CACHE_DIR=cache_dir)
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.cold_start", "--child", kind],
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    print(f"{'страница':<10}{'импорт, мс':>12}{'без снимка, мс':>17}{'со снимком, мс':>17}")
+    for kind in ("icons", "colors"):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold = run(kind, cache_dir)
+            warm = run(kind, cache_dir) if kind in SNAPSHOT_KINDS else None
+        warm_ms = f"{warm['interactive_s'] * 1000:>17.1f}" if warm else f"{'—':>17}"
+        print(f"{kind:<10}{cold['import_s'] * 1000:>12.0f}"
+              f"{cold['interactive_s'] * 1000:>17.1f}{warm_ms}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        measure_child(sys.argv[2])
+    else:
+        main()
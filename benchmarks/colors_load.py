@@ -0,0 +1,57 @@
+# benchmarks/colors_load.py
+"""
+Задержка ColorsView.load_colors_async
+
+Замеряется время от вызова до готовой сетки (без отправки клиенту) и
+число итераций цикла событий за загрузку: первая сессия процесса
+(каталог строится) и следующие (каталог общий). Снимок каталога на диске
+при этом используется как обычно.
+
+Запуск из корня проекта:
+    python -m benchmarks.colors_load
+"""
+import asyncio
+import statistics
+import time
+
+from benchmarks.harness import make_page
+
+SESSIONS = 20
+
+
+class CountingEventLoop(asyncio.SelectorEventLoop):
+    """Цикл событий, считающий свои итерации"""
+
+    iterations = 0
+
+    def _run_once(self):
+        self.iterations += 1
+        super()._run_once()
+
+
+def main():
+    from ui.views.colors import ColorsView
+
+    loop = CountingEventLoop()
+    timings = []
+    iterations = []
+    for index in range(SESSIONS):
+        page, conn, _ = make_page(session_id=f"s{index}", loop=loop)
+        view = ColorsView(page=page)
+        page.add(view)
+
+        before = loop.iterations
+        started = time.perf_counter()
+        loop.run_until_complete(view.load_colors_async())
+        timings.append((time.perf_counter() - started) * 1000)
+        iterations.append(loop.iterations - before)
+
+    print(f"Цветов: {len(view.all_colors_data)}")
+    print(f"Первая сессия:     {timings[0]:7.1f} мс, итераций цикла: {iterations[0]}")
+    rest = timings[1:]
+    print(f"Следующие сессии:  {statistics.median(rest):7.1f} мс (медиана), "
+          f"итераций цикла: {statistics.median(iterations[1:]):.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/export_stream.py
+"""
+Потоковый экспорт каталогов
+
+Для каждого формата каталог иконок (повторённый REPEAT раз, чтобы
+выгрузка была крупной) пишется в файл через export_to_file. Замеряются
+время, размер файла, пик памяти (tracemalloc) и самая долгая пауза
+цикла событий во время записи — её видит корутина, тикающая каждые 5 мс.
+Для сравнения приведён пик памяти при сборке всей выгрузки в одну строку.
+
+Запуск из корня проекта:
+    python -m benchmarks.export_stream
+"""
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from ui.helpers.catalog_export import EXPORT_FORMATS, export_preview, export_to_file, iter_export
+from ui.helpers.icon_catalog import get_icon_catalog
+
+REPEAT = 20
+TICK_S = 0.005
+
+
+async def measure(records, fmt, path):
+    """Время, пик памяти и самая долгая пауза цикла событий при записи файла"""
+    max_gap = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat():
+        nonlocal max_gap
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(TICK_S)
+            now = time.perf_counter()
+            max_gap = max(max_gap, now - last - TICK_S)
+            last = now
+
+    beat = asyncio.ensure_future(heartbeat())
+    started = time.perf_counter()
+    await export_to_file(records, "icons", fmt, path=path)
+    elapsed = time.perf_counter() - started
+    done.set()
+    await beat
+
+    # Память — отдельным прогоном: tracemalloc сильно замедляет запись
+    tracemalloc.start()
+    await export_to_file(records, "icons", fmt, path=path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, max_gap
+
+
+def string_peak(records, fmt):
+    """Пик памяти при сборке всей выгрузки одной строкой"""
+    tracemalloc.start()
+    text = "".join(iter_export(records, "icons", fmt))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del text
+    return peak
+
+
+async def run():
+    records = get_icon_catalog().icons * REPEAT
+    print(f"Записей: {len(records)}\n")
+    print(f"{'формат':<8}{'мс':>8}{'файл, КБ':>10}{'пик, КБ':>10}"
+          f"{'строкой, КБ':>13}{'пауза цикла, мс':>17}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in EXPORT_FORMATS:
+            path = Path(tmp) / f"icons.{fmt}"
+            elapsed, peak, gap = await measure(records, fmt, path)
+            size = os.path.getsize(path)
+            print(f"{fmt:<8}{elapsed * 1000:>8.0f}{size / 1024:>10.0f}{peak / 1024:>10.0f}"
+                  f"{string_peak(records, fmt) / 1024:>13.0f}{gap * 1000:>17.1f}")
+
+    started = time.perf_counter()
+    text, truncated = export_preview(records, "icons", "py")
+    print(f"\nПредпросмотр для буфера: {len(text)} символов, обрезан: {truncated}, "
+          f"{(time.perf_counter() - started) * 1000:.2f} мс")
+
+
+def main():
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# benchmarks/harness.py
+"""
+Страница Flet без клиента для бенчмарков
+
+RecordingConnection обрабатывает команды так же, как локальное
+соединение Flet, но вместо отправки во Flutter запоминает каждый пакет,
+его сериализованный размер и число затронутых контролов. RecordingPage
+дополнительно считает вызовы page.update(). wait_settled() дожидается,
+пока действие полностью отработает и отправит свои изменения.
+"""
+import asyncio
+import json
+import time
+from typing import List, Optional, Tuple
+
+import flet as ft
+from flet.core.local_connection import LocalConnection
+from flet.core.protocol import CommandEncoder, PageCommandsBatchResponsePayload
+
+from ui.helpers.render_scheduler import get_render_scheduler
+from ui.helpers.update_meter import count_controls
+
+# Фоновые задачи процесса, которые работают всё время и не относятся к действию
+DAEMON_TASKS = ("Ticker._run", "LoopLagMonitor._monitor", "ConnectionProbe._monitor")
+
+
+def _is_action_task(task: asyncio.Task) -> bool:
+    """Задача приложения (из пакета ui), запущенная действием, а не фоновая"""
+    coro = task.get_coro()
+    frame = getattr(coro, "cr_frame", None)
+    if frame is None or not frame.f_globals.get("__name__", "").startswith("ui."):
+        # Служебные задачи asyncio (например, ожидание внутри wait_for таймера)
+        return False
+    return coro.__qualname__ not in DAEMON_TASKS
+
+
+class RecordingConnection(LocalConnection):
+    """Соединение, которое записывает отправленные обновления"""
+
+    def __init__(self):
+        super().__init__()
+        # Размер каждого пакета команд в байтах
+        self.batches: List[int] = []
+        # Сколько контролов добавлено, изменено или удалено в каждом пакете
+        self.batch_controls: List[int] = []
+
+    def send_commands(self, session_id: str, commands):
+        results = []
+        messages = []
+        controls = 0
+        for command in commands:
+            controls += self.count_controls(command)
+            result, message = self._process_command(command)
+            if command.name in ["add", "get"]:
+                results.append(result)
+            if message:
+                messages.append(message)
+
+        # Как и сервер Flet, пустой пакет клиенту не отправляется
+        if messages:
+            payload = json.dumps(messages, cls=CommandEncoder, separators=(",", ":"))
+            self.batches.append(len(payload.encode("utf-8")))
+            self.batch_controls.append(controls)
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+    def send_command(self, session_id: str, command):
+        return self.send_commands(session_id, [command])
+
+    # Число контролов, которых касается команда
+    count_controls = staticmethod(count_controls)
+
+    def reset(self):
+        """Сбрасывает записанные пакеты"""
+        self.batches.clear()
+        self.batch_controls.clear()
+
+    @property
+    def bytes_sent(self) -> int:
+        """Суммарный размер записанных пакетов"""
+        return sum(self.batches)
+
+    @property
+    def controls_sent(self) -> int:
+        """Суммарное число контролов в записанных пакетах"""
+        return sum(self.batch_controls)
+
+
+class RecordingPage(ft.Page):
+    """Страница, которая считает вызовы update()"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.update_calls = 0
+
+    def update(self, *controls):
+        self.update_calls += 1
+        super().update(*controls)
+
+
+def make_page(width: int = 1200, height: int = 900, session_id: str = "bench",
+              loop: Optional[asyncio.AbstractEventLoop] = None
+              ) -> Tuple[RecordingPage, RecordingConnection, asyncio.AbstractEventLoop]:
+    """
+    Создаёт страницу без клиента с заданным размером окна
+
+    Страницы нескольких сессий должны использовать общий цикл событий
+    (как на веб-сервере Flet) — его можно передать в loop.
+    """
+    loop = loop or asyncio.new_event_loop()
+    conn = RecordingConnection()
+    page = RecordingPage(conn, session_id, loop)
+    # Размеры обычно приходят от клиента
+    page._set_attr("width", width, False)
+    page._set_attr("height", height, False)
+    return page, conn, loop
+
+
+def _pending_tasks() -> List[asyncio.Task]:
+    """Незавершённые задачи приложения, кроме текущей и фоновых задач процесса"""
+    current = asyncio.current_task()
+    return [
+        task for task in asyncio.all_tasks()
+        if task is not current and not task.done() and _is_action_task(task)
+    ]
+
+
+async def wait_settled(page: ft.Page, timeout: float = 10.0):
+    """
+    Ждёт, пока действие на странице полностью отработает
+
+    Действие готово, когда завершились запущенные им задачи (debounce
+    поиска, фоновая загрузка, ...) и у планировщика отрисовки нет ни
+    отмеченных изменений, ни идущей отправки. Условие проверяется дважды
+    подряд через проход цикла событий: задачи, запущенные из потоков
+    (page.run_task), появляются в цикле не сразу.
+
+    Raises:
+        TimeoutError: Если страница не успокоилась за timeout секунд
+    """
+    scheduler = get_render_scheduler(page)
+    deadline = time.monotonic() + timeout
+    quiet = 0
+    while quiet < 2:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"Страница не успокоилась за {timeout:g} с")
+        tasks = _pending_tasks()
+        if tasks:
+            quiet = 0
+            await asyncio.wait(tasks, timeout=remaining)
+        elif scheduler.busy:
+            quiet = 0
+            await asyncio.sleep(0)
+        else:
+            quiet += 1
+            await asyncio.sleep(0)
@@ -0,0 +1,83 @@
+# benchmarks/icon_categories.py
+"""
+Проверка и бенчмарк категоризации иконок
+
+Сверяет CategoryMatcher с эталонным корпусом и сравнивает скорость с
+прежним перебором подстрок (первая совпавшая категория).
+
+Запуск из корня проекта:
+    python -m benchmarks.icon_categories
+"""
+import timeit
+
+from ui.helpers.icon_catalog import CATEGORY_PATTERNS, categorize_icon, get_icon_catalog
+
+# Имя иконки -> ожидаемые категории (в порядке правил)
+CORPUS = {
+    # Токены, которые раньше совпадали как подстроки
+    "CUPS": ("Разное",),
+    "GROUP": ("Социальные",),
+    "GROUP_ADD": ("Действия", "Социальные"),
+    "FACEBOOK": ("Разное",),
+    "LIVE_TV": ("Разное",),
+    "TIMELAPSE": ("Разное",),
+    "UPDATE": ("Разное",),
+    "KEYBOARD": ("Разное",),
+    # Точные токены
+    "ARROW_BACK": ("Навигация",),
+    "KEYBOARD_ARROW_DOWN": ("Навигация",),
+    "HOME": ("Навигация",),
+    "SETTINGS": ("Действия",),
+    "DELETE_FOREVER": ("Действия",),
+    "MAIL_OUTLINE": ("Коммуникации",),
+    "ACCESS_TIME": ("Время",),
+    "DATE_RANGE": ("Время",),
+    "PLACE": ("Карты и места",),
+    "TV": ("Разное",),
+    "WIFI": ("Разное",),
+    # Множественное число
+    "NOTIFICATIONS_ACTIVE": ("Уведомления",),
+    "DIRECTIONS_CAR": ("Карты и места",),
+    "STARS": ("Социальные",),
+    "PHOTOS": ("Файлы и папки",),
+    # Несколько категорий
+    "THUMB_UP": ("Навигация", "Социальные"),
+    "ADD_A_PHOTO": ("Действия", "Файлы и папки"),
+    "LOCK_CLOCK": ("Время", "Разное"),
+    "NAVIGATE_NEXT": ("Навигация", "Карты и места"),
+    "PHONE_ANDROID": ("Коммуникации", "Разное"),
+    "CLOUD_UPLOAD": ("Действия", "Файлы и папки"),
+}
+
+
+def legacy_categorize(name: str) -> str:
+    """Прежний алгоритм load_all_icons: подстроки, первая категория побеждает"""
+    for cat_name, patterns in CATEGORY_PATTERNS.items():
+        if any(pattern in name.upper() for pattern in patterns):
+            return cat_name
+    return "Разное"
+
+
+def main(number: int = 5):
+    errors = [
+        (name, expected, categorize_icon(name))
+        for name, expected in CORPUS.items()
+        if categorize_icon(name) != expected
+    ]
+    for name, expected, actual in errors:
+        print(f"ОШИБКА {name}: ожидалось {expected}, получено {actual}")
+    print(f"Корпус: {len(CORPUS) - len(errors)} из {len(CORPUS)} верно")
+
+    names = [icon['name'] for icon in get_icon_catalog().icons]
+    legacy = timeit.timeit(lambda: [legacy_categorize(n) for n in names], number=number) / number
+    current = timeit.timeit(lambda: [categorize_icon(n) for n in names], number=number) / number
+    print(f"Иконок: {len(names)}")
+    print(f"Подстроки: {legacy * 1000:.1f} мс, токены: {current * 1000:.1f} мс "
+          f"({legacy / current:.1f}x)")
+
+    if errors:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/icon_search.py
+"""
+Микробенчмарк поиска иконок: индекс триграмм против линейного фильтра
+и время ранжированного поиска с опечатками
+
+Запуск из корня проекта:
+    python -m benchmarks.icon_search
+"""
+import timeit
+
+from ui.helpers.icon_catalog import get_icon_catalog
+
+QUERIES = ["a", "ar", "arrow", "delete", "back_ios", "outlined", "xyzq"]
+
+# Запросы с опечатками и ожидаемый первый результат
+RANKED_QUERIES = {
+    "dleete": "DELETE",
+    "arow bak": "ARROW_BACK",
+    "setings": "SETTINGS",
+    "shoping cart": "SHOPPING_CART",
+    "keybord arow dwn": "KEYBOARD_ARROW_DOWN",
+    "bluetoth": "BLUETOOTH",
+}
+
+# Бюджет одного кадра при 60 FPS
+FRAME_BUDGET = 1 / 60
+
+
+def linear_filter(icons, query):
+    """Прежний фильтр IconsView.apply_filters: копия списка и перебор"""
+    filtered = list(icons)
+    return [
+        icon for icon in filtered
+        if query in icon['name'].lower() or query in icon['display_name'].lower()
+    ]
+
+
+def main(number: int = 20):
+    catalog = get_icon_catalog()
+    icons = catalog.icons
+
+    build_time = timeit.timeit(lambda: catalog.search_index, number=1)
+    print(f"Иконок: {len(icons)}, построение индекса: {build_time * 1000:.1f} мс\n")
+    print(f"{'запрос':<12}{'найдено':>9}{'линейно, мс':>14}{'индекс, мс':>13}{'ускорение':>11}")
+
+    for query in QUERIES:
+        expected = linear_filter(icons, query)
+        found = catalog.search(query)
+        assert [i['name'] for i in found] == [i['name'] for i in expected], query
+
+        linear = timeit.timeit(lambda: linear_filter(icons, query), number=number) / number
+        indexed = timeit.timeit(lambda: catalog.search(query), number=number) / number
+        print(f"{query:<12}{len(found):>9}{linear * 1000:>14.3f}{indexed * 1000:>13.3f}"
+              f"{linear / indexed:>10.1f}x")
+
+    # Ранжирование строится заранее: холодный запрос — это только пустой кэш токенов
+    _, ranker = catalog.warm()
+    print(f"\n{'запрос':<20}{'первым':<24}{'холодный, мс':>14}{'повтор, мс':>12}{'в кадре':>9}")
+    for query, expected_top in RANKED_QUERIES.items():
+        # Холодный запрос — без кэша токенов
+        ranker.clear_cache()
+        cold = timeit.timeit(lambda: catalog.rank(query), number=1)
+        warm = timeit.timeit(lambda: catalog.rank(query), number=number) / number
+        top = catalog.rank(query)[0]['name']
+        assert top == expected_top, (query, top)
+        in_frame = "да" if cold < FRAME_BUDGET else "НЕТ"
+        print(f"{query:<20}{top:<24}{cold * 1000:>14.2f}{warm * 1000:>12.2f}{in_frame:>9}")
+
+
+if __name__ == "__main__":
+    main()
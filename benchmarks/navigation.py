@@ -0,0 +1,62 @@
+# benchmarks/navigation.py
+"""
+Количество отправок клиенту на одно действие пользователя
+
+Приложение открывается на странице без клиента, после чего выполняется
+сценарий: переходы по разделам через боковую панель, листание страниц и
+поиск иконок. Для каждого шага печатаются число пакетов и байт, а в конце —
+статистика планировщика отрисовки (отправок на действие).
+
+Запуск из корня проекта:
+    python -m benchmarks.navigation
+"""
+import asyncio
+
+from benchmarks.harness import make_page
+
+# Пауза после шага: отложенные обновления и фоновая загрузка успевают уйти
+SETTLE_S = 0.4
+
+
+async def run_scenario(page, conn):
+    from ui.main_app import FletApp
+    from ui.helpers.render_scheduler import get_render_scheduler
+
+    app = FletApp(page)
+    page.add(app)
+    await asyncio.sleep(SETTLE_S)
+
+    async def step(name, action):
+        conn.reset()
+        await action()
+        await asyncio.sleep(SETTLE_S)
+        print(f"{name:<24}{len(conn.batches):>8}{conn.bytes_sent:>12}")
+
+    def navigate(route):
+        # Синхронные обработчики Flet выполняются в потоках
+        return lambda: asyncio.to_thread(app.sidebar._handle_menu_click, route)
+
+    async def search(text):
+        view = app.views["icons"]
+        view.search_field.value = text
+        await view.on_search_change(None)
+
+    print(f"{'шаг':<24}{'пакетов':>8}{'байт':>12}")
+    for route in ["icons", "colors", "dashboard", "settings", "icons"]:
+        await step(f"переход: {route}", navigate(route))
+    await step("следующая страница", lambda: app.views["icons"].next_page(None))
+    await step("поиск: arrow", lambda: search("arrow"))
+
+    scheduler = get_render_scheduler(page)
+    print(f"\nВсего отправок планировщика: {scheduler.flush_count}")
+    for name, value in sorted(scheduler.flushes_per_interaction().items()):
+        print(f"  {name:<22}{value:.2f} отправок на действие")
+
+
+def main():
+    page, conn, loop = make_page()
+    loop.run_until_complete(run_scenario(page, conn))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/nearest_colors.py
+"""
+Поиск ближайших цветов Flet (OKLab)
+
+Замеряются построение индекса палитры, одиночный запрос и пакет случайных
+"фирменных" цветов — отдельно для векторного пути на NumPy и для чистого
+Python. Результаты двух путей сверяются: те же цвета в том же порядке и
+те же расстояния. При расхождении (или если NumPy не установлен) скрипт
+завершается с кодом 1.
+
+Запуск из корня проекта:
+    python -m benchmarks.nearest_colors
+"""
+import math
+import random
+import statistics
+import sys
+import time
+
+from ui.helpers.color_catalog import ColorCatalog, reflect_colors
+from ui.helpers.color_match import NearestColorIndex
+
+SINGLE_RUNS = 200
+BATCH_SIZE = 1000
+K = 5
+
+
+def measure(catalog: ColorCatalog, colors, vectorized: bool):
+    """Замеры одного пути вычислений; возвращает индекс и ответы на пакет"""
+    started = time.perf_counter()
+    index = NearestColorIndex(catalog.colors, vectorized=vectorized)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    single = []
+    for color in colors[:SINGLE_RUNS]:
+        started = time.perf_counter()
+        index.nearest(color, K)
+        single.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    results = index.nearest_many(colors, K)
+    batch_ms = (time.perf_counter() - started) * 1000
+
+    print(f"{'NumPy' if index.vectorized else 'чистый Python':<16}{build_ms:>14.2f}"
+          f"{statistics.median(single):>16.3f}{batch_ms:>14.1f}"
+          f"{batch_ms / BATCH_SIZE * 1000:>14.0f}")
+    return index, results
+
+
+def same_results(expected, actual) -> bool:
+    """Совпадают ли ответы двух путей (HEX по порядку и расстояния)"""
+    for left, right in zip(expected, actual):
+        if [m['hex'] for m in left] != [m['hex'] for m in right]:
+            return False
+        if not all(math.isclose(a['distance'], b['distance'], abs_tol=1e-9)
+                   for a, b in zip(left, right)):
+            return False
+    return len(expected) == len(actual)
+
+
+def main():
+    catalog = ColorCatalog(reflect_colors())
+    rng = random.Random(42)
+    colors = [f"#{rng.randrange(0x1000000):06X}" for _ in range(BATCH_SIZE)]
+
+    print(f"{'вычисления':<16}{'индекс, мс':>14}{'запрос k=' + str(K) + ', мс':>16}"
+          f"{'пакет, мс':>14}{'мкс на цвет':>14}")
+    python_index, python_results = measure(catalog, colors, vectorized=False)
+    numpy_index, numpy_results = measure(catalog, colors, vectorized=True)
+    print(f"\nЦветов в индексе: {len(python_index)}, пакет: {BATCH_SIZE} цветов")
+
+    match = numpy_index.nearest("#1DA1F2", 1)[0]
+    print(f"#1DA1F2 -> {', '.join(c['name'] for c in match['colors'])} "
+          f"{match['hex']} (ΔE {match['distance'] * 100:.1f})")
+
+    if not numpy_index.vectorized:
+        print("\nNumPy не установлен: векторный путь не проверен", file=sys.stderr)
+        sys.exit(1)
+    if not same_results(python_results, numpy_results):
+        print("\nОтветы NumPy и чистого Python расходятся", file=sys.stderr)
+        sys.exit(1)
+    print("Ответы NumPy и чистого Python совпадают")
+
+
+if __name__ == "__main__":
+    main()
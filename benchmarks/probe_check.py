@@ -0,0 +1,185 @@
+# benchmarks/probe_check.py
+"""
+Проверка ConnectionProbe на локальном сервере-заглушке
+
+Заглушка — маленький HTTP-сервер на 127.0.0.1, которому можно задать
+задержку ответа и код статуса или остановить его совсем. Скрипт проверяет
+успешную проверку, таймаут медленного сервера, ответ 5xx, недоступный
+адрес, рост задержек между проверками после сбоев и то, что одновременные
+проверки используют одно соединение, а без FLETAPP_PROBE_URL проверка
+выключена. Перцентили (общие для футера, монитора цикла событий и
+трассировки) сверяются на известных выборках. При ошибке завершается
+с кодом 1.
+
+Запуск из корня проекта:
+    python -m benchmarks.probe_check
+    python -m benchmarks.probe_check --serve --port 8089 --delay 0.2
+Во втором режиме заглушка просто работает, а приложение можно направить
+на неё через FLETAPP_PROBE_URL=http://127.0.0.1:8089/.
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+from ui.helpers.connection_probe import ConnectionProbe, percentile
+
+
+class StandInServer:
+    """HTTP-заглушка с настраиваемой задержкой и кодом ответа"""
+
+    def __init__(self, delay: float = 0.0, status: int = 200):
+        self.delay = delay
+        self.status = status
+        self.connections = 0
+        self.port = None
+        self._server = None
+
+    async def start(self, port: int = 0):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Останавливает сервер: адрес становится недоступен"""
+        self._server.close()
+        await self._server.wait_closed()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/health"
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            # Читаем заголовки запроса (TCP-проверка закрывает соединение сразу)
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            await asyncio.sleep(self.delay)
+            writer.write(f"HTTP/1.1 {self.status} X\r\nContent-Length: 0\r\n\r\n".encode())
+            await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+async def run_checks() -> list:
+    errors = []
+
+    def expect(condition: bool, message: str):
+        print(f"  {'ok ' if condition else 'FAIL'} {message}")
+        if not condition:
+            errors.append(message)
+
+    print("Перцентили (метод ближайшего ранга)")
+    for n, fraction, expected in ((20, 0.95, 19), (50, 0.5, 25), (100, 0.99, 99),
+                                  (10, 0.5, 5), (1, 0.95, 1), (3, 0.0, 1)):
+        value = percentile(list(range(1, n + 1)), fraction)
+        expect(value == expected, f"p{fraction * 100:g} из 1..{n} = {value} (ожидалось {expected})")
+
+    print("Без FLETAPP_PROBE_URL")
+    saved_url = os.environ.pop("FLETAPP_PROBE_URL", None)
+    try:
+        disabled = ConnectionProbe()
+    finally:
+        if saved_url is not None:
+            os.environ["FLETAPP_PROBE_URL"] = saved_url
+    expect(not disabled.enabled, f"проверка выключена: {disabled.target}")
+    disabled.watch(None)
+    expect(disabled._monitor_task is None, "фоновые проверки не запускаются")
+
+    server = StandInServer()
+    await server.start()
+    probe = ConnectionProbe(url=server.url, timeout=0.5, backoff_base=1.0, backoff_max=8.0)
+
+    print("Доступный сервер")
+    result = await probe.check()
+    expect(result['ok'] and probe.is_up, f"проверка успешна ({result['latency_ms']:.1f} мс)")
+
+    print("Одновременные проверки")
+    server.delay = 0.1
+    before_connections, before_probes = server.connections, probe.probe_count
+    results = await asyncio.gather(*(probe.check() for _ in range(10)))
+    expect(all(r['ok'] for r in results), "все 10 вызовов получили результат")
+    expect(server.connections - before_connections == 1, "сервер получил одно соединение")
+    expect(probe.probe_count - before_probes == 1, "выполнена одна проверка")
+
+    print("Окно задержек")
+    server.delay = 0.0
+    for _ in range(5):
+        await probe.check()
+    p50, p95 = probe.latency_percentiles()
+    expect(len(probe.latencies) == 7 and p50 <= p95, f"p50 {p50:.1f} мс, p95 {p95:.1f} мс")
+
+    print("Медленный сервер")
+    server.delay = 1.0
+    result = await probe.check()
+    expect(not result['ok'] and "Таймаут" in result['error'], f"сбой: {result['error']}")
+    server.delay = 0.0
+
+    print("Ответ 5xx")
+    server.status = 503
+    result = await probe.check()
+    expect(not result['ok'] and "503" in result['error'], f"сбой: {result['error']}")
+    server.status = 200
+
+    print("TCP-проверка")
+    tcp_probe = ConnectionProbe(url=f"tcp://127.0.0.1:{server.port}", timeout=0.5)
+    result = await tcp_probe.check()
+    expect(result['ok'], f"соединение открыто ({result['latency_ms']:.1f} мс)")
+
+    print("Недоступный сервер и задержки между проверками")
+    await server.stop()
+    probe.failures = 0
+    delays = []
+    for attempt in range(6):
+        result = await probe.check()
+        delays.append(probe.next_delay())
+    expect(not result['ok'] and probe.is_up is False, f"сбой: {result['error']}")
+    expect(probe.failures == 6, "сбои подряд считаются")
+    in_bounds = all(
+        min(8.0, 2 ** n) / 2 <= delay <= min(8.0, 2 ** n)
+        for n, delay in enumerate(delays)
+    )
+    expect(in_bounds, "задержки: " + ", ".join(f"{d:.2f}" for d in delays))
+
+    print("Восстановление")
+    await server.start(server.port)
+    result = await probe.check()
+    expect(result['ok'] and probe.next_delay() == probe.interval,
+           "после успешной проверки период снова обычный")
+    await server.stop()
+    return errors
+
+
+async def serve(port: int, delay: float, status: int):
+    server = StandInServer(delay=delay, status=status)
+    await server.start(port)
+    print(f"Заглушка: {server.url} (задержка {delay} с, статус {status}); Ctrl+C — выход")
+    await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--serve", action="store_true", help="только запустить заглушку")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--delay", type=float, default=0.0, help="задержка ответа, с")
+    parser.add_argument("--status", type=int, default=200, help="код ответа")
+    args = parser.parse_args()
+
+    if args.serve:
+        try:
+            asyncio.run(serve(args.port, args.delay, args.status))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    errors = asyncio.run(run_checks())
+    if errors:
+        print(f"\nОшибок: {len(errors)}")
+        sys.exit(1)
+    print("\nВсе проверки пройдены")
+
+
+if __name__ == "__main__":
+    main()
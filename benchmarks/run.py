@@ -0,0 +1,338 @@
+# benchmarks/run.py
+"""
+Набор бенчмарков горячих путей без клиента Flutter
+
+Каждый бенчмарк готовит страницу (RecordingConnection вместо клиента) и
+замеряет одно действие вместе с отправкой его обновления: построение
+приложения, загрузку и фильтрацию иконок, листание, режим "Показать все",
+загрузку, поиск и смену темы палитры цветов.
+
+Для каждого бенчмарка в JSON записываются:
+    wall_ms         — медиана времени по повторам (и минимум, wall_ms_min)
+    alloc_peak_kb   — пик памяти за действие (tracemalloc, отдельный прогон)
+    alloc_net_kb    — сколько памяти осталось занятым после действия
+    controls        — контролов на странице после действия
+    diff_bytes      — размер отправленных клиенту пакетов
+    diff_controls   — контролов в этих пакетах
+    batches         — число пакетов
+
+Запуск из корня проекта:
+    python -m benchmarks.run                          # JSON в stdout
+    python -m benchmarks.run -o before.json           # сохранить результат
+    python -m benchmarks.run -k colors --repeat 10    # только бенчмарки с "colors"
+    python -m benchmarks.run --compare before.json    # сравнить с прошлым запуском
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import flet as ft
+import flet.version
+
+from benchmarks.harness import make_page
+
+# Бенчмарк получает страницу, готовит состояние и возвращает замеряемое действие
+Benchmark = Callable[[ft.Page], Awaitable[Callable[[], Awaitable[Any]]]]
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+# Сколько проходов цикла событий дать отложенным обновлениям после действия
+SETTLE_ITERATIONS = 3
+
+
+def benchmark(name: str):
+    """Регистрирует бенчмарк под именем name"""
+    def register(func: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+async def settle():
+    """Даёт планировщику отрисовки отправить накопленные изменения"""
+    for _ in range(SETTLE_ITERATIONS):
+        await asyncio.sleep(0)
+
+
+def sync(func, *args):
+    """Оборачивает синхронный вызов в корутину-действие"""
+    async def action():
+        func(*args)
+    return action
+
+
+async def mount(page: ft.Page, control: ft.Control) -> ft.Control:
+    """Добавляет контрол на страницу и ждёт отправки"""
+    page.add(control)
+    await settle()
+    return control
+
+
+async def mounted_colors_view(page: ft.Page):
+    """ColorsView на странице с уже загруженной палитрой"""
+    from ui.views.colors import ColorsView
+
+    view = await mount(page, ColorsView(page))
+    # did_mount запускает загрузку в фоне — ждём её окончания
+    while not view._initialized:
+        await asyncio.sleep(0)
+    await settle()
+    return view
+
+
+# --- Приложение --------------------------------------------------------------
+
+@benchmark("app.construct")
+async def app_construct(page):
+    from ui.main_app import FletApp
+
+    async def action():
+        page.add(FletApp(page))
+    return action
+
+
+# --- Иконки ------------------------------------------------------------------
+
+@benchmark("icons.construct")
+async def icons_construct(page):
+    from ui.views.icons import IconsView
+
+    async def action():
+        page.add(IconsView(page))
+    return action
+
+
+@benchmark("icons.load_all_icons")
+async def icons_load_all(page):
+    from ui.views.icons import IconsView
+
+    view = await mount(page, IconsView(page))
+    # Без каталога load_all_icons проходит полный путь, как при первом показе
+    view.catalog = None
+    return sync(view.load_all_icons)
+
+
+def icons_filter_benchmark(name: str, search: str = "", category: str = "Все",
+                           ranked: bool = False):
+    """Регистрирует бенчмарк apply_filters для запроса и категории"""
+    @benchmark(name)
+    async def icons_filter(page):
+        from ui.views.icons import IconsView
+
+        view = await mount(page, IconsView(page))
+
+        async def action():
+            view.current_search = search
+            view.current_category = category
+            view.ranked_search = ranked
+            view.apply_filters()
+        return action
+    return icons_filter
+
+
+icons_filter_benchmark("icons.apply_filters[arrow]", search="arrow")
+icons_filter_benchmark("icons.apply_filters[a]", search="a")
+icons_filter_benchmark("icons.apply_filters[xyzzy]", search="xyzzy")
+icons_filter_benchmark("icons.apply_filters[category]", category="Навигация (454)")
+icons_filter_benchmark("icons.apply_filters[ranked:arow]", search="arow", ranked=True)
+
+
+@benchmark("icons.load_page")
+async def icons_load_page(page):
+    from ui.views.icons import IconsView
+
+    view = await mount(page, IconsView(page))
+    return sync(view.load_page, 5)
+
+
+@benchmark("icons.show_all")
+async def icons_show_all(page):
+    from ui.views.icons import IconsView
+
+    view = await mount(page, IconsView(page))
+
+    async def action():
+        await view.show_all(None)
+    return action
+
+
+# --- Цвета -------------------------------------------------------------------
+
+@benchmark("colors.load")
+async def colors_load(page):
+    from ui.views.colors import ColorsView
+
+    view = ColorsView(page)
+
+    async def action():
+        # Показ страницы: монтирование и _load_colors_task из did_mount
+        page.add(view)
+        while not view._initialized:
+            await asyncio.sleep(0)
+    return action
+
+
+def colors_filter_benchmark(name: str, query: str, previous: str = ""):
+    """Регистрирует бенчмарк filter_colors (previous — предыдущий запрос)"""
+    @benchmark(name)
+    async def colors_filter(page):
+        view = await mounted_colors_view(page)
+        if previous:
+            view.search_field.value = previous
+            view.filter_colors(None)
+            await settle()
+
+        async def action():
+            view.search_field.value = query
+            view.filter_colors(None)
+        return action
+    return colors_filter
+
+
+colors_filter_benchmark("colors.filter_colors[blue]", "blue")
+colors_filter_benchmark("colors.filter_colors[blue->blue_]", "blue_", previous="blue")
+colors_filter_benchmark("colors.filter_colors[#f44336]", "#f44336")
+colors_filter_benchmark("colors.filter_colors[clear]", "", previous="blue")
+
+
+@benchmark("colors.toggle_background")
+async def colors_toggle(page):
+    view = await mounted_colors_view(page)
+
+    async def action():
+        view.theme_toggle.value = not view.theme_toggle.value
+        view.toggle_background(None)
+    return action
+
+
+# --- Запуск ------------------------------------------------------------------
+
+async def run_once(loop, name: str, bench: Benchmark, index: int, trace: bool) -> Dict[str, Any]:
+    """Один прогон бенчмарка на новой странице"""
+    page, conn, _ = make_page(session_id=f"{name}-{index}", loop=loop)
+    action = await bench(page)
+    await settle()
+    conn.reset()
+
+    if trace:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+    await action()
+    await settle()
+    elapsed = time.perf_counter() - started
+    result = {
+        'wall_ms': elapsed * 1000,
+        'controls': len(page.index) - 1,
+        'diff_bytes': conn.bytes_sent,
+        'diff_controls': conn.controls_sent,
+        'batches': len(conn.batches),
+    }
+    if trace:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result['alloc_peak_kb'] = (peak - before) / 1024
+        result['alloc_net_kb'] = (current - before) / 1024
+    return result
+
+
+async def run_suite(names: List[str], repeat: int) -> List[Dict[str, Any]]:
+    loop = asyncio.get_running_loop()
+    results = []
+    for name in names:
+        bench = BENCHMARKS[name]
+        # Первый прогон прогревает общие каталоги и снимки; не учитывается
+        await run_once(loop, name, bench, 0, trace=False)
+        runs = [await run_once(loop, name, bench, i + 1, trace=False) for i in range(repeat)]
+        traced = await run_once(loop, name, bench, repeat + 1, trace=True)
+        walls = [run['wall_ms'] for run in runs]
+        last = runs[-1]
+        results.append({
+            'name': name,
+            'wall_ms': round(statistics.median(walls), 3),
+            'wall_ms_min': round(min(walls), 3),
+            'repeat': repeat,
+            'alloc_peak_kb': round(traced['alloc_peak_kb'], 1),
+            'alloc_net_kb': round(traced['alloc_net_kb'], 1),
+            'controls': last['controls'],
+            'diff_bytes': last['diff_bytes'],
+            'diff_controls': last['diff_controls'],
+            'batches': last['batches'],
+        })
+        print(f"[bench] {name}: {results[-1]['wall_ms']:.2f} мс", file=sys.stderr)
+    return results
+
+
+def git_revision() -> Optional[str]:
+    """Текущий коммит (если запуск из git-репозитория)"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]):
+    """Печатает изменения относительно прошлого отчёта"""
+    base = {result['name']: result for result in baseline['results']}
+    print(f"\nСравнение с {baseline.get('revision') or 'базой'}:", file=sys.stderr)
+    print(f"{'бенчмарк':<40}{'мс':>18}{'байт':>22}{'пик, КБ':>20}", file=sys.stderr)
+    for result in report['results']:
+        old = base.get(result['name'])
+        if old is None:
+            continue
+
+        def delta(key, fmt):
+            new_value, old_value = result[key], old[key]
+            change = f"{(new_value - old_value) / old_value * 100:+.0f}%" if old_value else "  "
+            return f"{new_value:{fmt}} ({change})"
+
+        print(f"{result['name']:<40}{delta('wall_ms', '.2f'):>18}"
+              f"{delta('diff_bytes', 'd'):>22}{delta('alloc_peak_kb', '.0f'):>20}",
+              file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-k", "--filter", default="", help="подстрока имени бенчмарка")
+    parser.add_argument("--repeat", type=int, default=5, help="повторов на бенчмарк")
+    parser.add_argument("-o", "--output", help="файл для JSON-отчёта")
+    parser.add_argument("--compare", help="JSON-отчёт прошлого запуска для сравнения")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    # Сообщения компонентов (например, монитора задержки) не должны попасть в JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        results = asyncio.run(run_suite(names, max(1, args.repeat)))
+    report = {
+        'revision': git_revision(),
+        'flet': flet.version.version,
+        'python': platform.python_version(),
+        'results': results,
+    }
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# benchmarks/ticker_load.py
+"""
+Пробуждения цикла событий в зависимости от числа открытых сессий
+
+На общем цикле событий (как на веб-сервере Flet) открывается N страниц с
+футером. Режим "legacy" повторяет прежнюю схему: у каждой сессии свои
+корутины часов и мониторинга со своим sleep. Режим "ticker" — текущий
+футер, подписанный на общий таймер процесса. Для каждого N печатаются
+итерации цикла событий в секунду и процессорное время.
+
+Футер запускает и монитор задержки цикла событий, поэтому его замеры
+входят в число пробуждений; отдельной колонкой печатается, сколько
+замеров в секунду он сделал. Без действий пользователя монитор мерит
+опоздание тиков общего таймера и своих пробуждений не добавляет.
+
+В конце проверяется, что подписки отключённых сессий снимаются сами.
+
+Запуск из корня проекта:
+    python -m benchmarks.ticker_load
+"""
+import asyncio
+import time
+from datetime import datetime
+
+from benchmarks.harness import make_page
+
+SESSION_COUNTS = (1, 10, 100, 500)
+DURATION_S = 3.0
+
+
+class CountingEventLoop(asyncio.SelectorEventLoop):
+    """Цикл событий, считающий свои итерации (пробуждения)"""
+
+    iterations = 0
+
+    def _run_once(self):
+        self.iterations += 1
+        super()._run_once()
+
+
+async def legacy_clock(page, text):
+    """Прежний цикл часов: свой sleep и обновление всей страницы"""
+    while True:
+        text.value = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+        page.update()
+        await asyncio.sleep(1)
+
+
+async def legacy_monitor():
+    """Прежний цикл мониторинга подключения"""
+    while True:
+        await asyncio.sleep(30)
+
+
+def open_sessions(loop, count):
+    from ui.layouts.footer import Footer
+
+    sessions = []
+    for index in range(count):
+        page, conn, _ = make_page(session_id=f"s{index}", loop=loop)
+        footer = Footer(page=page, clock_resolution="seconds")
+        page.add(footer)
+        sessions.append((page, footer))
+    return sessions
+
+
+async def measure(loop, sessions, mode):
+    from ui.helpers.loop_monitor import get_loop_monitor
+
+    monitor = get_loop_monitor()
+    tasks = []
+    for page, footer in sessions:
+        if mode == "legacy":
+            tasks.append(asyncio.create_task(legacy_clock(page, footer.time_display_text)))
+            tasks.append(asyncio.create_task(legacy_monitor()))
+        else:
+            await footer.start_background_tasks()
+
+    # Ждём границы секунды, чтобы окна замера были одинаковыми
+    await asyncio.sleep(1 - time.time() % 1)
+    iterations = loop.iterations
+    samples = monitor.samples
+    cpu = time.process_time()
+    await asyncio.sleep(DURATION_S)
+    result = (
+        (loop.iterations - iterations) / DURATION_S,
+        (time.process_time() - cpu) / DURATION_S * 1000,
+        (monitor.samples - samples) / DURATION_S,
+    )
+
+    for task in tasks:
+        task.cancel()
+    for _, footer in sessions:
+        await footer.dispose()
+    return result
+
+
+def main():
+    from ui.helpers.ticker import get_ticker
+
+    loop = CountingEventLoop()
+    asyncio.set_event_loop(loop)
+
+    print(f"{'сессий':>7}{'режим':>9}{'пробуждений/с':>16}{'CPU мс/с':>11}{'замеров задержки/с':>21}")
+    for count in SESSION_COUNTS:
+        for mode in ("legacy", "ticker"):
+            sessions = open_sessions(loop, count)
+            wakeups, cpu_ms, samples = loop.run_until_complete(measure(loop, sessions, mode))
+            print(f"{count:>7}{mode:>9}{wakeups:>16.1f}{cpu_ms:>11.1f}{samples:>21.1f}")
+
+    # Отключение сессий: подписки должны исчезнуть без явной отписки
+    sessions = open_sessions(loop, 10)
+
+    async def disconnect_half():
+        for _, footer in sessions:
+            await footer.start_background_tasks()
+        for page, _ in sessions[:5]:
+            page._close()
+        await asyncio.sleep(1.1)
+
+    loop.run_until_complete(disconnect_half())
+    print(f"\nПодписок после отключения 5 из 10 сессий: "
+          f"{get_ticker().subscriber_count} (ожидается 11: 10 футеров и монитор задержки)")
+
+
+if __name__ == "__main__":
+    main()
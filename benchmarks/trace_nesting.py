@@ -0,0 +1,86 @@
+# benchmarks/trace_nesting.py
+"""
+Проверка спанов трассировки вложенных обработчиков
+
+Клик по меню (Sidebar._handle_menu_click) вызывает FletApp.on_navigate,
+и патч перехода должен попасть в оба спана: внешний включает вложенный.
+Синхронные обработчики Flet выполняются в пуле потоков, поэтому клики
+запускаются через asyncio.to_thread — спан внешнего обработчика может
+закрываться, пока цикл событий уже отправляет его патч.
+
+Для каждого перехода проверяется, что байт и отправок у внешнего спана
+не меньше, чем у вложенного, а сам патч не потерян. При нарушении скрипт
+печатает таблицу и завершается с кодом 1.
+
+Запуск из корня проекта:
+    python -m benchmarks.trace_nesting
+"""
+import os
+
+# Трассировка включается при импорте модулей приложения
+os.environ["FLETAPP_TRACE"] = "1"
+
+import asyncio
+import sys
+
+from benchmarks.harness import make_page
+
+# Маршруты переходов по кругу и число кругов
+ROUTES = ("icons", "colors", "dashboard", "settings")
+ROUNDS = 5
+
+# Пауза после клика: отложенная отправка и фоновая загрузка успевают пройти
+SETTLE_S = 0.3
+
+OUTER = "Sidebar._handle_menu_click"
+INNER = "FletApp.on_navigate"
+
+
+async def check_nesting() -> bool:
+    from ui.helpers.tracing import get_tracer
+    from ui.main_app import FletApp
+
+    loop = asyncio.get_running_loop()
+    page, conn, _ = make_page(loop=loop)
+    app = FletApp(page)
+    page.add(app)
+    await asyncio.sleep(SETTLE_S)
+    await app.footer.dispose()
+
+    tracer = get_tracer()
+    ok = True
+    print(f"{'переход':<14}{'внешний, байт':>16}{'вложенный, байт':>18}{'отправок':>12}")
+    for _ in range(ROUNDS):
+        for route in ROUTES:
+            tracer.clear()
+            conn.reset()
+            await asyncio.to_thread(app.sidebar._handle_menu_click, route)
+            await asyncio.sleep(SETTLE_S)
+
+            spans = {span['name']: span for span in tracer.snapshot()}
+            outer, inner = spans.get(OUTER), spans.get(INNER)
+            if outer is None or inner is None:
+                print(f"{route:<14}спаны не записаны")
+                ok = False
+                continue
+            passed = (
+                outer['bytes'] >= inner['bytes']
+                and outer['updates'] >= inner['updates']
+                and (outer['bytes'] > 0 or not conn.bytes_sent)
+            )
+            ok = ok and passed
+            print(f"{route:<14}{outer['bytes']:>16}{inner['bytes']:>18}"
+                  f"{outer['updates']:>7}/{inner['updates']:<4}{'' if passed else ' ✗'}")
+    return ok
+
+
+def main():
+    ok = asyncio.run(check_nesting())
+    if not ok:
+        print("\nВнешний спан получил меньше отправок, чем вложенный", file=sys.stderr)
+        sys.exit(1)
+    print("\nСпаны вложенных обработчиков согласованы")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# benchmarks/update_budget.py
+"""
+Бюджеты обновлений на действия пользователя
+
+Приложение открывается на странице без клиента (RecordingPage и
+RecordingConnection из harness), после чего выполняются сценарии:
+переход к иконкам, ввод "arrow", смена категории, перетаскивание
+слайдера размера и смена темы палитры цветов. Для каждого сценария
+проверяются верхние границы числа вызовов page.update(), контролов в
+отправленных пакетах и байт.
+
+Лишний page.update() (например, в update_stats или update_window_title)
+превышает бюджет так же, как функциональная ошибка ломает сценарий:
+скрипт печатает таблицу и завершается с кодом 1.
+
+После каждого шага скрипт не спит фиксированное время, а ждёт, пока
+завершатся запущенные действием задачи и планировщик отрисовки отправит
+изменения (wait_settled из harness), поэтому результат не зависит от
+загрузки машины. Проверка входит в набор benchmarks.checks.
+
+Запуск из корня проекта:
+    python -m benchmarks.update_budget
+"""
+import asyncio
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from benchmarks.harness import make_page, wait_settled
+
+# Сценарий -> (вызовов update(), контролов в пакетах, байт)
+BUDGETS: Dict[str, Tuple[int, int, int]] = {
+    "переход: icons": (1, 620, 110_000),
+    "ввод: arrow": (2, 300, 45_000),
+    "категория: Действия": (1, 300, 45_000),
+    "слайдер размера": (1, 130, 12_000),
+    "переход: colors": (2, 3_000, 560_000),
+    "тема палитры": (1, 2, 300),
+}
+
+
+async def run_scenarios(page, conn) -> List[Dict[str, Any]]:
+    from ui.main_app import FletApp
+
+    app = FletApp(page)
+    page.add(app)
+    await wait_settled(page)
+    # Тики часов и проверки сети в футере не относятся к действиям пользователя
+    await app.footer.dispose()
+
+    results = []
+
+    async def scenario(name: str, action: Callable[[], Awaitable[Any]]):
+        conn.reset()
+        page.update_calls = 0
+        await action()
+        # debounce поиска, фоновая загрузка и отправка планировщика
+        await wait_settled(page)
+        results.append({
+            'name': name,
+            'updates': page.update_calls,
+            'controls': conn.controls_sent,
+            'bytes': conn.bytes_sent,
+        })
+
+    def navigate(route):
+        # Синхронные обработчики Flet выполняются в потоках
+        return lambda: asyncio.to_thread(app.sidebar._handle_menu_click, route)
+
+    async def type_text(text):
+        view = app.views["icons"]
+        # Каждое нажатие клавиши — отдельное событие on_change
+        for length in range(1, len(text) + 1):
+            view.search_field.value = text[:length]
+            await view.on_search_change(None)
+            await asyncio.sleep(0.05)
+
+    async def choose_category(prefix):
+        view = app.views["icons"]
+        view.category_dropdown.value = next(
+            option.key for option in view.category_dropdown.options
+            if option.key.startswith(prefix)
+        )
+        await view.filter_by_category(None)
+
+    async def drag_slider():
+        view = app.views["icons"]
+        # Перетаскивание: несколько тиков подряд
+        for value in (48, 56, 64, 56):
+            view.size_slider.value = value
+            await view.change_icon_size(None)
+            await asyncio.sleep(0.01)
+
+    async def toggle_theme():
+        view = app.views["colors"]
+        view.theme_toggle.value = not view.theme_toggle.value
+        await asyncio.to_thread(view.toggle_background, None)
+
+    await scenario("переход: icons", navigate("icons"))
+    await scenario("ввод: arrow", lambda: type_text("arrow"))
+    await scenario("категория: Действия", lambda: choose_category("Действия"))
+    await scenario("слайдер размера", drag_slider)
+    await scenario("переход: colors", navigate("colors"))
+    await scenario("тема палитры", toggle_theme)
+    return results
+
+
+def check(results: List[Dict[str, Any]]) -> bool:
+    """Печатает таблицу и возвращает True, если все бюджеты соблюдены"""
+    ok = True
+    print(f"{'сценарий':<24}{'update()':>14}{'контролов':>16}{'байт':>20}")
+    for result in results:
+        limits = BUDGETS[result['name']]
+        cells = []
+        for key, limit in zip(('updates', 'controls', 'bytes'), limits):
+            over = result[key] > limit
+            ok = ok and not over
+            cells.append(f"{result[key]}/{limit}{' !' if over else '  '}")
+        print(f"{result['name']:<24}{cells[0]:>14}{cells[1]:>16}{cells[2]:>20}")
+    return ok
+
+
+def main():
+    page, conn, loop = make_page()
+    results = loop.run_until_complete(run_scenarios(page, conn))
+    if check(results):
+        print("\nБюджеты обновлений соблюдены")
+    else:
+        print("\nПревышен бюджет обновлений (отмечено '!')")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
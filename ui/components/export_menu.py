@@ -0,0 +1,60 @@
+# ui/components/export_menu.py
+from typing import Awaitable, Callable
+
+import flet as ft
+
+# Подписи форматов экспорта
+FORMAT_LABELS = {
+    "json": "JSON",
+    "csv": "CSV",
+    "py": "Python (.py)",
+}
+
+
+class ExportMenu(ft.PopupMenuButton):
+    """
+    Меню экспорта каталога: сохранение в файл и копирование в буфер
+
+    Args:
+        on_save: Корутина on_save(fmt), сохраняющая выгрузку в файл
+        on_copy: Обработчик копирования начала выгрузки в буфер обмена
+        tooltip: Подсказка кнопки
+    """
+
+    def __init__(self, on_save: Callable[[str], Awaitable[None]],
+                 on_copy: Callable, tooltip: str = "Экспорт"):
+        super().__init__()
+        self.on_save = on_save
+        self.on_copy = on_copy
+        self.tooltip = tooltip
+        self.init_ui()
+
+    def init_ui(self):
+        """Инициализация интерфейса"""
+        self.content = ft.Container(
+            content=ft.Row([
+                ft.Icon(ft.Icons.DOWNLOAD, size=18),
+                ft.Text("Экспорт", size=14),
+            ], spacing=6, tight=True),
+            padding=ft.padding.symmetric(horizontal=12, vertical=8),
+        )
+        self.items = [
+            ft.PopupMenuItem(
+                text=f"Сохранить {label}",
+                icon=ft.Icons.SAVE_ALT,
+                on_click=self._save_handler(fmt),
+            )
+            for fmt, label in FORMAT_LABELS.items()
+        ] + [
+            ft.PopupMenuItem(),
+            ft.PopupMenuItem(
+                text="Копировать в буфер",
+                icon=ft.Icons.COPY_ALL,
+                on_click=self.on_copy,
+            ),
+        ]
+
+    def _save_handler(self, fmt: str):
+        async def handler(e):
+            await self.on_save(fmt)
+        return handler
@@ -0,0 +1,196 @@
+# ui/components/virtual_grid.py
+import math
+from typing import Any, Callable, List, Sequence
+
+import flet as ft
+from ui.helpers.render_scheduler import mark_dirty
+
+
+class VirtualGrid(ft.Container):
+    """
+    Виртуализированная сетка с прокруткой
+
+    Реальными контролами существуют только видимые строки и небольшой
+    запас (overscan) сверху и снизу. Остальная высота списка занята двумя
+    пустыми контейнерами-распорками. Строки окна — постоянные слоты: при
+    прокрутке их карточки не пересоздаются, а заново привязываются к
+    элементам, поэтому в обновление попадают только изменившиеся свойства.
+    Число контролов и размер обновления не зависят от длины списка.
+
+    Args:
+        create_item: Функция, создающая пустую карточку
+        bind_item: Функция, привязывающая карточку к элементу
+        columns: Количество колонок
+        row_height: Высота строки в пикселях
+        overscan: Сколько строк держать сверх видимых с каждой стороны
+        spacing: Отступ между карточками и строками
+        viewport_height: Начальная оценка высоты области просмотра
+    """
+
+    def __init__(
+        self,
+        create_item: Callable[[], ft.Control],
+        bind_item: Callable[[ft.Control, Any], None],
+        columns: int = 6,
+        row_height: int = 110,
+        overscan: int = 2,
+        spacing: int = 5,
+        viewport_height: float = 600,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.create_item = create_item
+        self.bind_item = bind_item
+        self.columns = columns
+        self.row_height = row_height
+        self.overscan = overscan
+        self.spacing = spacing
+        self.viewport_height = viewport_height
+
+        # Данные и текущее окно строк [window_start, window_end)
+        self.items: Sequence[Any] = ()
+        self.first_visible_row = 0
+        self.window_start = 0
+        self.window_end = 0
+
+        # Слоты строк окна (переиспользуются при прокрутке)
+        self.slot_rows: List[ft.Row] = []
+
+        self.init_ui()
+
+    def init_ui(self):
+        """Инициализация интерфейса"""
+        self.top_spacer = ft.Container(height=0)
+        self.bottom_spacer = ft.Container(height=0)
+
+        self.rows_column = ft.Column(
+            controls=[self.top_spacer, self.bottom_spacer],
+            spacing=0,
+            expand=True,
+            scroll=ft.ScrollMode.AUTO,
+            on_scroll=self._on_scroll,
+            on_scroll_interval=50,
+        )
+        self.content = self.rows_column
+
+    @property
+    def row_extent(self) -> int:
+        """Высота строки вместе с отступом"""
+        return self.row_height + self.spacing
+
+    @property
+    def total_rows(self) -> int:
+        """Общее количество строк"""
+        return math.ceil(len(self.items) / self.columns) if self.columns else 0
+
+    @property
+    def rendered_controls_count(self) -> int:
+        """Количество реально созданных карточек"""
+        return sum(len(row.controls) for row in self.slot_rows)
+
+    def set_items(self, items: Sequence[Any], columns: int = None, row_height: int = None):
+        """
+        Задаёт новый список элементов и возвращает окно к началу
+
+        Args:
+            items: Элементы для отображения
+            columns: Новое количество колонок (необязательно)
+            row_height: Новая высота строки (необязательно)
+        """
+        self.items = items
+        if columns:
+            self.columns = columns
+        if row_height:
+            self.row_height = row_height
+
+        self.first_visible_row = 0
+        self._render_window(force=True)
+
+        # Новый список показываем с начала
+        if self.rows_column.page:
+            self.rows_column.scroll_to(offset=0)
+
+    def refresh(self):
+        """Заново привязывает карточки окна (например, после смены размера карточек)"""
+        self._render_window(force=True)
+
+    def set_viewport_height(self, height: float) -> bool:
+        """
+        Задаёт высоту области просмотра (например, после изменения размера окна)
+
+        Returns:
+            True, если окно строк изменилось и сетку нужно обновить
+        """
+        self.viewport_height = height
+        return self._render_window()
+
+    def _on_scroll(self, e: ft.OnScrollEvent):
+        """Пересчитывает окно строк при прокрутке"""
+        if e.viewport_dimension:
+            self.viewport_height = e.viewport_dimension
+
+        # Распорка сверху занимает ровно window_start строк
+        first_row = int(max(0.0, e.pixels or 0.0) // self.row_extent)
+        self.first_visible_row = min(first_row, max(0, self.total_rows - 1))
+
+        if self._render_window():
+            mark_dirty(self.page, self.rows_column)
+
+    def _visible_range(self):
+        """Возвращает окно строк с учётом запаса"""
+        visible_rows = max(1, math.ceil(self.viewport_height / self.row_extent))
+        start = max(0, self.first_visible_row - self.overscan)
+        end = min(self.total_rows, self.first_visible_row + visible_rows + self.overscan)
+        return start, end
+
+    def _render_window(self, force: bool = False) -> bool:
+        """
+        Приводит набор отрисованных строк к текущему окну
+
+        Returns:
+            True, если окно изменилось
+        """
+        start, end = self._visible_range()
+        if not force and (start, end) == (self.window_start, self.window_end):
+            return False
+
+        self.window_start, self.window_end = start, end
+
+        # Число слотов равно высоте окна; лишние убираем, недостающие создаём
+        slots_needed = end - start
+        del self.slot_rows[slots_needed:]
+        while len(self.slot_rows) < slots_needed:
+            self.slot_rows.append(ft.Row(
+                spacing=self.spacing,
+                vertical_alignment=ft.CrossAxisAlignment.START,
+            ))
+
+        for slot_index, row in enumerate(self.slot_rows):
+            self._bind_row(row, start + slot_index)
+
+        self.top_spacer.height = start * self.row_extent
+        self.bottom_spacer.height = (self.total_rows - end) * self.row_extent
+        self.rows_column.controls = [self.top_spacer, *self.slot_rows, self.bottom_spacer]
+        return True
+
+    def _bind_row(self, row: ft.Row, row_index: int):
+        """Привязывает карточки слота к элементам строки row_index"""
+        row.height = self.row_extent
+
+        while len(row.controls) < self.columns:
+            row.controls.append(self.create_item())
+        del row.controls[self.columns:]
+
+        first = row_index * self.columns
+        row_items = self.items[first:first + self.columns]
+        for cell_index, cell in enumerate(row.controls):
+            cell.expand = True
+            cell.height = self.row_height
+            if cell_index < len(row_items):
+                cell.opacity = 1.0
+                cell.disabled = False
+                self.bind_item(cell, row_items[cell_index])
+            else:
+                # Пустая ячейка последней строки сохраняет ширину колонки
+                cell.opacity = 0.0
+                cell.disabled = True
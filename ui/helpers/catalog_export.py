@@ -0,0 +1,203 @@
+# ui/helpers/catalog_export.py
+import asyncio
+import csv
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, TextIO, Tuple
+
+# Поля записей каталога, попадающие в экспорт
+EXPORT_FIELDS: Mapping[str, Tuple[str, ...]] = {
+    "colors": ("name", "value", "hex", "category"),
+    "icons": ("name", "value", "category", "categories"),
+}
+
+# Перечисление Flet, константы которого перечисляет модуль .py
+EXPORT_ENUMS: Mapping[str, str] = {
+    "colors": "ft.Colors",
+    "icons": "ft.Icons",
+}
+
+EXPORT_FORMATS: Tuple[str, ...] = ("json", "csv", "py")
+
+# Предел текста, который кладётся в буфер обмена
+PREVIEW_LIMIT = 4000
+
+# Сколько строк накапливается перед записью в файл
+WRITE_BATCH = 256
+
+
+def export_dir() -> Path:
+    """Папка для файлов экспорта (FLETAPP_EXPORT_DIR или ~/Downloads/fletapp)"""
+    custom_dir = os.environ.get("FLETAPP_EXPORT_DIR")
+    if custom_dir:
+        return Path(custom_dir)
+    return Path.home() / "Downloads" / "fletapp"
+
+
+def _row(record: Mapping[str, Any], fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Запись каталога -> словарь полей экспорта (кортежи -> списки)"""
+    row = {}
+    for field in fields:
+        value = record.get(field)
+        row[field] = list(value) if isinstance(value, tuple) else value
+    return row
+
+
+class _Lines(list):
+    """Приёмник csv.writer: каждая строка CSV забирается сразу после записи"""
+
+    write = list.append
+
+
+def iter_json(records: Iterable[Mapping[str, Any]], kind: str) -> Iterator[str]:
+    """Массив JSON по одной записи на строку"""
+    fields = EXPORT_FIELDS[kind]
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    yield "["
+    separator = "\n"
+    for record in records:
+        yield separator + encode(_row(record, fields))
+        separator = ",\n"
+    yield "\n]\n"
+
+
+def iter_csv(records: Iterable[Mapping[str, Any]], kind: str) -> Iterator[str]:
+    """CSV с заголовком; списки категорий записываются через "|" """
+    fields = EXPORT_FIELDS[kind]
+    lines = _Lines()
+    writer = csv.writer(lines, lineterminator="\n")
+
+    writer.writerow(fields)
+    yield lines.pop()
+    for record in records:
+        writer.writerow([
+            "|".join(value) if isinstance(value, tuple) else value
+            for value in (record.get(field) for field in fields)
+        ])
+        yield lines.pop()
+
+
+def iter_python(records: Iterable[Mapping[str, Any]], kind: str) -> Iterator[str]:
+    """Модуль Python с константами, ссылающимися на перечисление Flet"""
+    enum_name = EXPORT_ENUMS[kind]
+    yield f"# Сгенерировано FletApp: {enum_name}\n"
+    yield "import flet as ft\n\n"
+    for record in records:
+        name = record['name']
+        comment = record.get('hex') or record['value']
+        yield f"{name} = {enum_name}.{name}  # {comment}\n"
+
+
+_WRITERS = {
+    "json": iter_json,
+    "csv": iter_csv,
+    "py": iter_python,
+}
+
+
+def iter_export(records: Iterable[Mapping[str, Any]], kind: str, fmt: str) -> Iterator[str]:
+    """
+    Потоковая выгрузка записей каталога фрагментами текста
+
+    Args:
+        records: Записи каталога (например, текущий результат фильтра)
+        kind: Тип каталога ("colors", "icons")
+        fmt: Формат ("json", "csv", "py")
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"Неизвестный формат экспорта: {fmt}")
+    return _WRITERS[fmt](records, kind)
+
+
+def write_export(stream: TextIO, records: Iterable[Mapping[str, Any]],
+                 kind: str, fmt: str) -> int:
+    """
+    Записывает выгрузку в поток пачками строк
+
+    Returns:
+        Количество записанных символов
+    """
+    written = 0
+    batch = []
+    for chunk in iter_export(records, kind, fmt):
+        batch.append(chunk)
+        if len(batch) >= WRITE_BATCH:
+            written += stream.write("".join(batch))
+            batch.clear()
+    if batch:
+        written += stream.write("".join(batch))
+    return written
+
+
+def export_preview(records: Iterable[Mapping[str, Any]], kind: str, fmt: str,
+                   limit: int = PREVIEW_LIMIT) -> Tuple[str, bool]:
+    """
+    Начало выгрузки не длиннее limit символов (для буфера обмена)
+
+    Генерация останавливается, как только предел достигнут, поэтому
+    стоимость не зависит от размера каталога.
+
+    Returns:
+        Текст и признак того, что выгрузка обрезана
+    """
+    parts = []
+    size = 0
+    truncated = False
+    for chunk in iter_export(records, kind, fmt):
+        if size + len(chunk) > limit:
+            truncated = True
+            break
+        parts.append(chunk)
+        size += len(chunk)
+    if truncated:
+        parts.append("...\n" if fmt != "py" else "# ...\n")
+    return "".join(parts), truncated
+
+
+def export_filename(kind: str, fmt: str, label: Optional[str] = None) -> str:
+    """Имя файла выгрузки: colors-20240101-120000.json"""
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    suffix = f"-{label}" if label else ""
+    return f"{kind}{suffix}-{stamp}.{fmt}"
+
+
+def _write_file(path: Path, records: Tuple[Mapping[str, Any], ...], kind: str, fmt: str) -> int:
+    """Пишет выгрузку атомарно, через временный файл"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{kind}-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            written = write_export(f, records, kind, fmt)
+        os.replace(tmp_name, path)
+        return written
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+async def export_to_file(records: Iterable[Mapping[str, Any]], kind: str, fmt: str,
+                         path: Optional[Path] = None, label: Optional[str] = None) -> Path:
+    """
+    Сохраняет выгрузку в файл в отдельном потоке, не блокируя цикл событий
+
+    Args:
+        records: Записи каталога; фиксируются до передачи в поток
+        kind: Тип каталога ("colors", "icons")
+        fmt: Формат ("json", "csv", "py")
+        path: Путь к файлу (по умолчанию — в export_dir())
+        label: Метка в имени файла по умолчанию (например, "filtered")
+
+    Returns:
+        Путь к записанному файлу
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"Неизвестный формат экспорта: {fmt}")
+    # Записи общие и неизменяемые, кортеж ссылок на них дёшев
+    records = tuple(records)
+    path = Path(path) if path else export_dir() / export_filename(kind, fmt, label)
+    await asyncio.to_thread(_write_file, path, records, kind, fmt)
+    return path
@@ -0,0 +1,101 @@
+# ui/helpers/catalog_snapshot.py
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import flet.version
+
+# Версия формата файла: меняется при изменении структуры данных
+# или алгоритма, по которому они строятся
+SNAPSHOT_FORMAT = 1
+
+
+def snapshot_dir() -> Path:
+    """Папка со снимками каталогов (FLETAPP_CACHE_DIR или ~/.cache/fletapp)"""
+    custom_dir = os.environ.get("FLETAPP_CACHE_DIR")
+    if custom_dir:
+        return Path(custom_dir)
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "fletapp"
+
+
+def rules_hash(rules: Any) -> str:
+    """Хеш правил категоризации (любая JSON-совместимая структура)"""
+    data = json.dumps(rules, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+def snapshot_key(kind: str, rules: Any) -> Dict[str, Any]:
+    """Ключ снимка: тип каталога, версия Flet, хеш правил и версия формата"""
+    return {
+        "kind": kind,
+        "flet": flet.version.version,
+        "rules": rules_hash(rules),
+        "format": SNAPSHOT_FORMAT,
+    }
+
+
+def snapshot_path(kind: str) -> Path:
+    """Путь к файлу снимка каталога"""
+    return snapshot_dir() / f"{kind}.jsonl"
+
+
+def load_snapshot(kind: str, rules: Any) -> Optional[Dict[str, Any]]:
+    """
+    Читает снимок каталога, если он соответствует текущим Flet и правилам
+
+    Файл состоит из двух JSON-строк: ключ снимка и данные по колонкам.
+
+    Args:
+        kind: Тип каталога ("icons", "colors")
+        rules: Правила категоризации, от которых зависят данные
+
+    Returns:
+        Данные снимка или None, если файла нет или он устарел
+    """
+    path = snapshot_path(kind)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header != snapshot_key(kind, rules):
+                return None
+            return json.loads(f.readline())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"[Snapshot] Не удалось прочитать {path}: {e}")
+        return None
+
+
+def save_snapshot(kind: str, rules: Any, payload: Dict[str, Any]) -> bool:
+    """
+    Сохраняет снимок каталога (атомарно, через временный файл)
+
+    Args:
+        kind: Тип каталога ("icons", "colors")
+        rules: Правила категоризации, от которых зависят данные
+        payload: Данные по колонкам
+
+    Returns:
+        True, если снимок записан
+    """
+    path = snapshot_path(kind)
+    tmp_name = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{kind}-", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps(snapshot_key(kind, rules), ensure_ascii=False))
+            f.write("\n")
+            f.write(json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+        os.replace(tmp_name, path)
+        return True
+    except OSError as e:
+        print(f"[Snapshot] Не удалось записать {path}: {e}")
+        if tmp_name and os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        return False
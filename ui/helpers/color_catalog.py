@@ -0,0 +1,278 @@
+# ui/helpers/color_catalog.py
+import re
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import flet as ft
+from ui.helpers.color_match import (
+    NearestColorIndex, contrast_ratio, parse_color, relative_luminance, wcag_level,
+)
+from ui.helpers.icon_index import TrigramIndex
+from ui.helpers.material_palette import normalize_hex, resolve_hex
+
+# Категории в порядке отображения
+COLOR_CATEGORIES = (
+    "Основные цвета",
+    "Material Design",
+    "Системные цвета",
+    "Оттенки серого",
+    "Прочие",
+)
+
+# Правила категоризации цветов
+COLOR_PATTERNS = {
+    "Основные цвета": [
+        'RED', 'PINK', 'PURPLE', 'DEEP_PURPLE', 'INDIGO', 'BLUE',
+        'LIGHT_BLUE', 'CYAN', 'TEAL', 'GREEN', 'LIGHT_GREEN', 'LIME',
+        'YELLOW', 'AMBER', 'ORANGE', 'DEEP_ORANGE', 'BROWN', 'BLUE_GREY'
+    ],
+    "Оттенки серого": ['GREY', 'BLACK', 'WHITE'],
+}
+SHADE_PATTERN = r'_\d+$'
+SYSTEM_PATTERN = r'(PRIMARY|SECONDARY|TERTIARY|ERROR|SURFACE|BACKGROUND|ON)'
+
+
+def _substring_regex(words) -> "re.Pattern":
+    """Одно регулярное выражение вместо проверки каждой подстроки по очереди"""
+    return re.compile("|".join(re.escape(word) for word in words))
+
+
+# Классификаторы компилируются один раз при импорте
+_PRIMARY_RE = _substring_regex(COLOR_PATTERNS["Основные цвета"])
+_GREY_RE = _substring_regex(COLOR_PATTERNS["Оттенки серого"])
+_SHADE_RE = re.compile(SHADE_PATTERN)
+_SYSTEM_RE = re.compile(SYSTEM_PATTERN)
+
+
+def categorize_color(name: str) -> str:
+    """Определяет категорию цвета по имени"""
+    if _PRIMARY_RE.search(name):
+        return "Основные цвета"
+    elif '_' in name and _SHADE_RE.search(name):
+        return "Material Design"
+    elif _GREY_RE.search(name):
+        return "Оттенки серого"
+    elif _SYSTEM_RE.search(name):
+        return "Системные цвета"
+    return "Прочие"
+
+
+def reflect_colors() -> List[Dict[str, Any]]:
+    """Собирает записи цветов из ft.Colors и категоризирует их"""
+    return [
+        {'name': color_name, 'value': color_enum.value, 'category': categorize_color(color_name)}
+        for color_name, color_enum in ft.Colors.__members__.items()
+    ]
+
+
+def contrast_entry(hex_code: Optional[str]) -> Optional[Mapping[str, Any]]:
+    """
+    Контраст WCAG цвета с белым и чёрным
+
+    Для полупрозрачных цветов и токенов схемы (без HEX) контраст зависит
+    от фона и не считается.
+
+    Returns:
+        luminance, on_white, on_black, white_level, black_level и text_color
+        (BLACK или WHITE — более контрастный цвет текста) либо None
+    """
+    if not hex_code or len(hex_code) != 7:
+        return None
+    luminance = relative_luminance(parse_color(hex_code))
+    on_white = contrast_ratio(luminance, 1.0)
+    on_black = contrast_ratio(luminance, 0.0)
+    return MappingProxyType({
+        'luminance': luminance,
+        'on_white': on_white,
+        'on_black': on_black,
+        'white_level': wcag_level(on_white),
+        'black_level': wcag_level(on_black),
+        'text_color': ft.Colors.BLACK if on_black >= on_white else ft.Colors.WHITE,
+    })
+
+
+def scheme_text_color(name: str) -> ft.Colors:
+    """
+    Цвет текста поверх цвета без фиксированного HEX
+
+    Для токена схемы — парный токен (PRIMARY <-> ON_PRIMARY), для
+    полупрозрачных цветов — ON_SURFACE.
+    """
+    pair = name[len("ON_"):] if name.startswith("ON_") else f"ON_{name}"
+    if pair in ft.Colors.__members__:
+        return ft.Colors[pair]
+    return ft.Colors.ON_SURFACE
+
+
+class ColorCatalog:
+    """
+    Неизменяемый каталог цветов ft.Colors
+
+    Строится один раз на процесс и используется всеми сессиями только
+    для чтения. Каждый цвет разрешается в HEX по таблице палитры Material
+    (у токенов цветовой схемы HEX нет — он зависит от темы), а поиск по
+    имени, значению Flet и HEX идёт через словари за O(1). Контраст WCAG
+    с белым и чёрным считается один раз на HEX и хранится в записи.
+
+    Attributes:
+        colors: Записи цветов в порядке категорий, внутри — по имени
+        categories: Категория -> кортеж записей (в порядке COLOR_CATEGORIES)
+        category_counts: Категория -> количество цветов
+        search_keys: Строка поиска для каждой записи colors (в нижнем регистре)
+    """
+
+    __slots__ = ("colors", "categories", "category_counts", "search_keys",
+                 "_by_name", "_by_value", "_by_hex", "_search_index", "_nearest_index",
+                 "_lock")
+
+    def __init__(self, records: List[Dict[str, Any]]):
+        grouped: Dict[str, List[Mapping[str, Any]]] = {
+            category: [] for category in COLOR_CATEGORIES
+        }
+        # Один проход: запись дополняется объектом цвета, строкой для
+        # копирования, HEX и контрастом (общим для цветов с одним HEX)
+        contrasts: Dict[Optional[str], Optional[Mapping[str, Any]]] = {}
+        for record in sorted(records, key=lambda x: x['name']):
+            color_name = record['name']
+            hex_code = resolve_hex(record['value'])
+            if hex_code not in contrasts:
+                contrasts[hex_code] = contrast_entry(hex_code)
+            contrast = contrasts[hex_code]
+            grouped[record['category']].append(MappingProxyType({
+                'name': color_name,
+                'value': record['value'],
+                'category': record['category'],
+                'object': ft.Colors[color_name],
+                'display_value': f"ft.Colors.{color_name}",
+                'hex': hex_code,
+                'contrast': contrast,
+                'text_color': (contrast['text_color'] if contrast
+                               else scheme_text_color(color_name)),
+            }))
+
+        self.categories: Mapping[str, Tuple[Mapping[str, Any], ...]] = MappingProxyType({
+            category: tuple(colors) for category, colors in grouped.items()
+        })
+        self.category_counts: Mapping[str, int] = MappingProxyType({
+            category: len(colors) for category, colors in grouped.items()
+        })
+        self.colors: Tuple[Mapping[str, Any], ...] = tuple(
+            color for colors in self.categories.values() for color in colors
+        )
+
+        # Словари точного поиска: имя и значение -> позиция, HEX -> позиции
+        self._by_name: Dict[str, int] = {}
+        self._by_value: Dict[str, int] = {}
+        by_hex: Dict[str, List[int]] = {}
+        for color_id, color in enumerate(self.colors):
+            self._by_name[color['name'].lower()] = color_id
+            self._by_value[color['value'].lower()] = color_id
+            if color['hex']:
+                by_hex.setdefault(color['hex'], []).append(color_id)
+        self._by_hex: Mapping[str, Tuple[int, ...]] = MappingProxyType({
+            hex_code: tuple(ids) for hex_code, ids in by_hex.items()
+        })
+
+        # Имя, значение, строка для копирования и HEX ищутся по одному ключу
+        self.search_keys: Tuple[str, ...] = tuple(
+            f"{color['name']} {color['value']} {color['display_value']} {color['hex'] or ''}".lower()
+            for color in self.colors
+        )
+        self._search_index: Optional[TrigramIndex] = None
+        self._nearest_index: Optional[NearestColorIndex] = None
+        self._lock = threading.Lock()
+
+    @property
+    def search_index(self) -> TrigramIndex:
+        """Индекс триграмм по ключам поиска (строится при первом поиске)"""
+        if self._search_index is None:
+            with self._lock:
+                if self._search_index is None:
+                    self._search_index = TrigramIndex(self.search_keys)
+        return self._search_index
+
+    @property
+    def nearest_index(self) -> NearestColorIndex:
+        """Координаты палитры в OKLab (строятся при первом поиске ближайших)"""
+        if self._nearest_index is None:
+            with self._lock:
+                if self._nearest_index is None:
+                    self._nearest_index = NearestColorIndex(self.colors)
+        return self._nearest_index
+
+    def warm(self) -> TrigramIndex:
+        """Строит индекс поиска заранее, чтобы первое нажатие клавиши не ждало его"""
+        return self.search_index
+
+    def by_name(self, name: str) -> Optional[Mapping[str, Any]]:
+        """Цвет по имени константы ("RED_100", без учёта регистра)"""
+        color_id = self._by_name.get(name.strip().lower())
+        return None if color_id is None else self.colors[color_id]
+
+    def by_value(self, value: str) -> Optional[Mapping[str, Any]]:
+        """Цвет по значению Flet ("red100")"""
+        color_id = self._by_value.get(value.strip().lower())
+        return None if color_id is None else self.colors[color_id]
+
+    def by_hex(self, hex_code: str) -> Tuple[Mapping[str, Any], ...]:
+        """Все цвета с данным HEX ("#F44336" -> RED и RED_500)"""
+        return tuple(self.colors[color_id] for color_id in self.hex_ids(hex_code))
+
+    def lookup(self, text: str) -> Optional[Mapping[str, Any]]:
+        """Цвет по имени, значению Flet, "ft.Colors.NAME" или HEX (первый из совпавших)"""
+        text = text.strip()
+        if text.startswith("ft.Colors."):
+            text = text[len("ft.Colors."):]
+        color = self.by_name(text) or self.by_value(text)
+        if color is None:
+            matches = self.by_hex(text)
+            color = matches[0] if matches else None
+        return color
+
+    def hex_ids(self, text: str) -> Tuple[int, ...]:
+        """Позиции цветов с HEX, записанным в любой допустимой форме"""
+        hex_code = normalize_hex(text)
+        return self._by_hex.get(hex_code, ()) if hex_code else ()
+
+    def search(self, query: str, within: Optional[Sequence[int]] = None) -> Sequence[int]:
+        """
+        Находит цвета, ключ поиска которых содержит query
+
+        Запрос в виде HEX ("#f00", "ffF44336") дополнительно находит цвета
+        с этим HEX, даже если он записан в другой форме.
+
+        Args:
+            query: Строка поиска (в нижнем регистре)
+            within: Позиции, среди которых искать (результат более короткого
+                запроса, который содержится в query)
+
+        Returns:
+            Отсортированные позиции найденных цветов в colors
+        """
+        if within is not None:
+            # Уточнение запроса: проверяем только прошлый результат
+            keys = self.search_keys
+            found = [color_id for color_id in within if query in keys[color_id]]
+        else:
+            found = self.search_index.search(query)
+
+        # Точные совпадения HEX не зависят от прошлого результата
+        hex_ids = self.hex_ids(query)
+        if hex_ids:
+            found = sorted(set(found).union(hex_ids))
+        return found
+
+
+_catalog: Optional[ColorCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_color_catalog() -> ColorCatalog:
+    """Возвращает общий для процесса каталог цветов, создавая его при первом вызове"""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = ColorCatalog(reflect_colors())
+    return _catalog
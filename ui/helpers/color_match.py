@@ -0,0 +1,220 @@
+# ui/helpers/color_match.py
+import heapq
+import math
+import re
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from ui.helpers.material_palette import normalize_hex
+
+try:
+    import numpy as np
+except ImportError:
+    # Без NumPy расстояния считаются на чистом Python
+    np = None
+
+RGB = Tuple[int, int, int]
+ColorInput = Union[str, Sequence[int]]
+
+_RGB_RE = re.compile(r'^(?:rgb)?\(?\s*(\d{1,3})\s*,\s*(\d{1,3})\s*,\s*(\d{1,3})\s*\)?$')
+
+# Матрицы перехода sRGB (линейный) -> LMS и LMS' -> OKLab
+_LMS = (
+    (0.4122214708, 0.5363325363, 0.0514459929),
+    (0.2119034982, 0.6806995451, 0.1073969566),
+    (0.0883024619, 0.2817188376, 0.6299787005),
+)
+_LAB = (
+    (0.2104542553, 0.7936177850, -0.0040720468),
+    (1.9779984951, -2.4285922050, 0.4505937099),
+    (0.0259040371, 0.7827717662, -0.8086757660),
+)
+
+
+def parse_color(value: ColorInput) -> Optional[RGB]:
+    """
+    Разбирает цвет, введённый пользователем
+
+    Принимает HEX ("#F44336", "f00", "#FFF44336"), "R,G,B", "rgb(R, G, B)"
+    или кортеж из трёх чисел. Альфа-канал HEX игнорируется.
+
+    Returns:
+        (r, g, b) в диапазоне 0–255 или None, если это не цвет
+    """
+    if not isinstance(value, str):
+        channels = tuple(int(channel) for channel in value)
+        if len(channels) != 3 or not all(0 <= channel <= 255 for channel in channels):
+            return None
+        return channels
+
+    match = _RGB_RE.match(value.strip().lower())
+    if match:
+        channels = tuple(int(channel) for channel in match.groups())
+        return channels if all(channel <= 255 for channel in channels) else None
+
+    hex_code = normalize_hex(value)
+    if hex_code is None:
+        return None
+    digits = hex_code[-6:]
+    return int(digits[0:2], 16), int(digits[2:4], 16), int(digits[4:6], 16)
+
+
+def split_color_queries(text: str) -> List[str]:
+    """Делит строку на отдельные цвета (через пробел или ";")"""
+    # Пробелы внутри "R, G, B" и "rgb( ... )" разделителями не считаются
+    text = re.sub(r'\s*,\s*', ',', text.strip())
+    text = re.sub(r'\(\s+', '(', re.sub(r'\s+\)', ')', text))
+    return [part for part in re.split(r'[\s;]+', text) if part]
+
+
+def srgb_to_linear(channel: int) -> float:
+    """Гамма-декодирование канала sRGB (0–255 -> 0–1)"""
+    c = channel / 255
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+
+def relative_luminance(rgb: RGB) -> float:
+    """Относительная яркость по WCAG 2.x (0 — чёрный, 1 — белый)"""
+    r, g, b = (srgb_to_linear(channel) for channel in rgb)
+    return 0.2126 * r + 0.7152 * g + 0.0722 * b
+
+
+def contrast_ratio(luminance_a: float, luminance_b: float) -> float:
+    """Контраст WCAG двух цветов по их относительной яркости (1–21)"""
+    lighter, darker = max(luminance_a, luminance_b), min(luminance_a, luminance_b)
+    return (lighter + 0.05) / (darker + 0.05)
+
+
+def wcag_level(ratio: float) -> str:
+    """
+    Уровень соответствия WCAG для текста
+
+    "AAA" (от 7:1), "AA" (от 4.5:1), "AA18" (от 3:1 — только крупный
+    текст от 18 pt) или "—".
+    """
+    if ratio >= 7:
+        return "AAA"
+    if ratio >= 4.5:
+        return "AA"
+    if ratio >= 3:
+        return "AA18"
+    return "—"
+
+
+def rgb_to_oklab(rgb: RGB) -> Tuple[float, float, float]:
+    """Переводит цвет sRGB (0–255) в OKLab"""
+    linear = [srgb_to_linear(channel) for channel in rgb]
+    lms = [math.copysign(abs(v) ** (1 / 3), v)
+           for v in (sum(k * c for k, c in zip(row, linear)) for row in _LMS)]
+    return tuple(sum(k * c for k, c in zip(row, lms)) for row in _LAB)
+
+
+def _rgb_to_oklab_matrix(rgb):
+    """Векторный перевод массива (N, 3) sRGB в OKLab"""
+    c = rgb / 255.0
+    linear = np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    return np.cbrt(linear @ np.array(_LMS).T) @ np.array(_LAB).T
+
+
+class NearestColorIndex:
+    """
+    Поиск ближайших по восприятию цветов палитры
+
+    Расстояние — евклидово в OKLab (ΔE_OK). Координаты палитры считаются
+    один раз; с NumPy запрос (и пакет запросов) — одно векторное
+    вычисление матрицы расстояний, без NumPy — проход по ~250 точкам
+    на чистом Python. Полупрозрачные цвета и токены схемы без HEX
+    в поиск не входят; цвета с одинаковым HEX объединены.
+
+    Args:
+        colors: Записи каталога цветов (с ключом 'hex')
+        vectorized: Считать через NumPy (по умолчанию — если он установлен;
+            False — всегда на чистом Python)
+    """
+
+    def __init__(self, colors: Sequence[Mapping[str, Any]], vectorized: bool = None):
+        groups: Dict[str, List[Mapping[str, Any]]] = {}
+        for color in colors:
+            hex_code = color.get('hex')
+            # Только непрозрачные "#RRGGBB"
+            if hex_code and len(hex_code) == 7:
+                groups.setdefault(hex_code, []).append(color)
+
+        self.hexes: Tuple[str, ...] = tuple(groups)
+        self.tokens: Tuple[Tuple[Mapping[str, Any], ...], ...] = tuple(
+            tuple(group) for group in groups.values()
+        )
+        self.labs: Tuple[Tuple[float, float, float], ...] = tuple(
+            rgb_to_oklab(parse_color(hex_code)) for hex_code in self.hexes
+        )
+        use_numpy = np is not None and vectorized is not False
+        self._matrix = np.array(self.labs) if use_numpy else None
+
+    @property
+    def vectorized(self) -> bool:
+        """Используется ли NumPy"""
+        return self._matrix is not None
+
+    def __len__(self) -> int:
+        return len(self.hexes)
+
+    def nearest(self, color: ColorInput, k: int = 5) -> List[Dict[str, Any]]:
+        """
+        k ближайших цветов палитры
+
+        Args:
+            color: HEX, "R,G,B" или кортеж (r, g, b)
+            k: Сколько цветов вернуть
+
+        Returns:
+            Словари hex, distance, colors (записи с этим HEX) по возрастанию
+            расстояния; пустой список, если цвет не разобран
+        """
+        return self.nearest_many([color], k)[0]
+
+    def nearest_many(self, colors: Sequence[ColorInput], k: int = 5) -> List[List[Dict[str, Any]]]:
+        """Пакетный поиск: результат nearest() для каждого цвета"""
+        parsed = [parse_color(color) for color in colors]
+        valid = [rgb for rgb in parsed if rgb is not None]
+        k = max(0, min(k, len(self.hexes)))
+
+        if not valid or not k:
+            ranked = [[] for _ in valid]
+        elif self._matrix is not None:
+            ranked = self._rank_vectorized(valid, k)
+        else:
+            ranked = [self._rank_python(rgb, k) for rgb in valid]
+
+        results = iter(ranked)
+        return [
+            self._describe(next(results)) if rgb is not None else []
+            for rgb in parsed
+        ]
+
+    def _rank_vectorized(self, colors: List[RGB], k: int) -> List[List[Tuple[float, int]]]:
+        """Матрица расстояний (запросы x палитра) одним вычислением"""
+        queries = _rgb_to_oklab_matrix(np.array(colors, dtype=float))
+        distances = np.sqrt(
+            ((queries[:, None, :] - self._matrix[None, :, :]) ** 2).sum(axis=2)
+        )
+        # k ближайших без полной сортировки, затем порядок внутри них
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        nearest_distances = np.take_along_axis(distances, nearest, axis=1)
+        order = np.argsort(nearest_distances, axis=1)
+        nearest = np.take_along_axis(nearest, order, axis=1).tolist()
+        nearest_distances = np.take_along_axis(nearest_distances, order, axis=1).tolist()
+        return [list(zip(row_distances, row_ids))
+                for row_distances, row_ids in zip(nearest_distances, nearest)]
+
+    def _rank_python(self, rgb: RGB, k: int) -> List[Tuple[float, int]]:
+        """Проход по палитре на чистом Python"""
+        L, a, b = rgb_to_oklab(rgb)
+        return heapq.nsmallest(k, (
+            (math.sqrt((L - pl) ** 2 + (a - pa) ** 2 + (b - pb) ** 2), i)
+            for i, (pl, pa, pb) in enumerate(self.labs)
+        ))
+
+    def _describe(self, ranked: List[Tuple[float, int]]) -> List[Dict[str, Any]]:
+        return [
+            {'hex': self.hexes[i], 'distance': distance, 'colors': self.tokens[i]}
+            for distance, i in ranked
+        ]
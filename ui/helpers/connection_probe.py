@@ -0,0 +1,262 @@
+# ui/helpers/connection_probe.py
+import asyncio
+import contextlib
+import math
+import os
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import flet as ft
+
+# Адрес проверки задаётся FLETAPP_PROBE_URL: tcp://host:port или
+# http(s)://host[:port]/path. Без него проверка выключена — приложение
+# само по себе никуда не подключается
+DEFAULT_PROBE_TIMEOUT = 3.0
+
+# Период проверок, пока адрес доступен
+PROBE_INTERVAL = 30.0
+
+# Экспоненциальная задержка между проверками, пока адрес недоступен
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+# Сколько последних задержек хранится для перцентилей
+LATENCY_WINDOW = 50
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    """Перцентиль по методу ближайшего ранга (значения отсортированы)"""
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class ConnectionProbe:
+    """
+    Асинхронная проверка доступности сети
+
+    Проверка открывает TCP-соединение (tcp://host:port) или отправляет
+    HEAD-запрос (http:// и https://) с таймаутом. Пока адрес доступен,
+    проверки идут раз в interval секунд; после сбоя — с экспоненциально
+    растущей задержкой и случайным разбросом (jitter), чтобы вкладки и
+    процессы не стучались одновременно.
+
+    Одновременные вызовы check() ждут одну и ту же проверку. Задержки
+    успешных проверок хранятся в скользящем окне для p50/p95.
+
+    Без адреса (FLETAPP_PROBE_URL не задан) или с неподдерживаемым
+    адресом проверка выключена: enabled равно False, а watch() ничего
+    не запускает.
+
+    Args:
+        url: Адрес проверки (по умолчанию FLETAPP_PROBE_URL)
+        timeout: Таймаут в секундах (по умолчанию FLETAPP_PROBE_TIMEOUT)
+        interval: Период проверок, пока адрес доступен
+        backoff_base: Начальная задержка после сбоя
+        backoff_max: Максимальная задержка после сбоев
+        window: Размер окна задержек
+    """
+
+    def __init__(
+        self,
+        url: str = None,
+        timeout: float = None,
+        interval: float = PROBE_INTERVAL,
+        backoff_base: float = BACKOFF_BASE,
+        backoff_max: float = BACKOFF_MAX,
+        window: int = LATENCY_WINDOW,
+    ):
+        self.url = url or os.environ.get("FLETAPP_PROBE_URL", "").strip() or None
+        self.timeout = timeout or float(
+            os.environ.get("FLETAPP_PROBE_TIMEOUT") or DEFAULT_PROBE_TIMEOUT
+        )
+        self.interval = interval
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        parts = urlsplit(self.url or "")
+        if self.url and parts.scheme not in ("tcp", "http", "https"):
+            print(f"[ConnectionProbe] Неподдерживаемый адрес проверки: {self.url}")
+            self.url = None
+        self.enabled = self.url is not None
+        self.scheme = parts.scheme if self.enabled else None
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or {"tcp": 80, "http": 80, "https": 443}.get(self.scheme)
+        self.path = parts.path or "/"
+
+        # Состояние последней проверки
+        self.is_up: Optional[bool] = None
+        self.last_error: Optional[str] = None
+        self.last_checked: Optional[datetime] = None
+        self.failures = 0
+        # Растёт при каждом изменении состояния (для подписчиков)
+        self.version = 0
+
+        self.latencies: deque = deque(maxlen=window)
+        self.probe_count = 0
+
+        # Текущая проверка (общая для одновременных вызовов)
+        self._inflight: Optional[asyncio.Future] = None
+
+        # Фоновый мониторинг работает, пока есть подключённые сессии
+        self._pages: "weakref.WeakSet[ft.Page]" = weakref.WeakSet()
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+
+    @property
+    def target(self) -> str:
+        """Адрес проверки для отображения"""
+        if not self.enabled:
+            return "проверка выключена (FLETAPP_PROBE_URL)"
+        if self.scheme == "tcp":
+            return f"{self.host}:{self.port}"
+        return self.url
+
+    def latency_percentiles(self) -> Optional[Tuple[float, float]]:
+        """Задержка p50 и p95 (мс) по окну успешных проверок"""
+        if not self.latencies:
+            return None
+        values = sorted(self.latencies)
+        return percentile(values, 0.5), percentile(values, 0.95)
+
+    def next_delay(self) -> float:
+        """Пауза до следующей проверки с учётом сбоев подряд"""
+        if not self.failures:
+            return self.interval
+        # Половина задержки фиксирована, половина случайна (equal jitter)
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (self.failures - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def check(self) -> Dict[str, Any]:
+        """
+        Проверяет доступность адреса
+
+        Если проверка уже идёт, ждёт её результата вместо новой.
+
+        Returns:
+            Словарь: ok, latency_ms, error, checked_at
+        """
+        if not self.enabled:
+            raise RuntimeError("Проверка подключения выключена: задайте FLETAPP_PROBE_URL")
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(self._probe_once())
+        # shield: отмена одного ожидающего не отменяет общую проверку
+        return await asyncio.shield(self._inflight)
+
+    async def _probe_once(self) -> Dict[str, Any]:
+        """Одна проверка и обновление состояния"""
+        self.probe_count += 1
+        started = time.perf_counter()
+        error = None
+        try:
+            await asyncio.wait_for(self._connect(), self.timeout)
+        except asyncio.TimeoutError:
+            error = f"Таймаут {self.timeout:g} с"
+        except (OSError, ValueError) as e:
+            error = str(e) or e.__class__.__name__
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        ok = error is None
+        if ok:
+            self.latencies.append(latency_ms)
+            self.failures = 0
+        else:
+            self.failures += 1
+        self.is_up = ok
+        self.last_error = error
+        self.last_checked = datetime.now()
+        self.version += 1
+
+        return {
+            'ok': ok,
+            'latency_ms': latency_ms if ok else None,
+            'error': error,
+            'checked_at': self.last_checked,
+        }
+
+    async def _connect(self):
+        """Открывает соединение (и для HTTP читает строку статуса)"""
+        reader, writer = await asyncio.open_connection(
+            self.host, self.port, ssl=(self.scheme == "https") or None
+        )
+        try:
+            if self.scheme == "tcp":
+                return
+            writer.write(
+                f"HEAD {self.path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"User-Agent: FletApp\r\nConnection: close\r\n\r\n".encode("ascii")
+            )
+            await writer.drain()
+            status_line = await reader.readline()
+            parts = status_line.split()
+            if len(parts) < 2 or not parts[1].isdigit():
+                raise ValueError("Некорректный ответ HTTP")
+            status = int(parts[1])
+            # 4xx — сервер доступен; 5xx — считаем сбоем
+            if status >= 500:
+                raise ValueError(f"HTTP {status}")
+        finally:
+            writer.close()
+            # Дожидаемся закрытия транспорта (для https — и завершения TLS)
+            with contextlib.suppress(OSError):
+                await writer.wait_closed()
+
+    def watch(self, page: ft.Page):
+        """
+        Запускает фоновый мониторинг для сессии страницы
+
+        Мониторинг один на процесс и останавливается, когда не остаётся
+        подключённых страниц. Выключенная проверка ничего не запускает.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._pages.add(page)
+            if self._monitor_task is None or self._monitor_task.done():
+                page.loop.call_soon_threadsafe(self._start_monitor)
+
+    def _start_monitor(self):
+        """Запускает задачу мониторинга (в потоке цикла событий)"""
+        if self._monitor_task is None or self._monitor_task.done():
+            self._monitor_task = asyncio.ensure_future(self._monitor())
+
+    def _has_watchers(self) -> bool:
+        with self._lock:
+            return any(page.connection is not None for page in self._pages)
+
+    async def _monitor(self):
+        """Периодические проверки с экспоненциальной задержкой после сбоев"""
+        while self._has_watchers():
+            try:
+                await self.check()
+            except Exception as e:
+                print(f"[ConnectionProbe] Ошибка проверки: {e}")
+            try:
+                # Сон до следующей проверки (ручная проверка его не сбивает)
+                await asyncio.sleep(self.next_delay())
+            except asyncio.CancelledError:
+                break
+
+    def stop(self):
+        """Останавливает фоновый мониторинг"""
+        if self._monitor_task and not self._monitor_task.done():
+            self._monitor_task.cancel()
+
+
+_probe: Optional[ConnectionProbe] = None
+_probe_lock = threading.Lock()
+
+
+def get_connection_probe() -> ConnectionProbe:
+    """Возвращает общую для процесса проверку подключения"""
+    global _probe
+    if _probe is None:
+        with _probe_lock:
+            if _probe is None:
+                _probe = ConnectionProbe()
+    return _probe
@@ -0,0 +1,308 @@
+# ui/helpers/icon_catalog.py
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import flet as ft
+from ui.helpers.catalog_snapshot import load_snapshot, save_snapshot
+from ui.helpers.icon_index import TokenRanker, TrigramIndex, icon_search_key, icon_search_keys
+
+# Категория по умолчанию для иконок без совпадений
+DEFAULT_CATEGORY = "Разное"
+
+# Правила категоризации: категория -> токены имени иконки (части между "_")
+CATEGORY_PATTERNS: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "Навигация": ('ARROW', 'CHEVRON', 'NAVIGATE', 'BACK', 'FORWARD',
+                  'UP', 'DOWN', 'LEFT', 'RIGHT', 'HOME', 'MENU'),
+    "Действия": ('ADD', 'REMOVE', 'DELETE', 'EDIT', 'SAVE', 'CLOSE',
+                 'CHECK', 'CANCEL', 'DOWNLOAD', 'UPLOAD', 'SHARE',
+                 'PRINT', 'SEARCH', 'FILTER', 'SETTINGS'),
+    "Социальные": ('PERSON', 'PEOPLE', 'GROUP', 'ACCOUNT', 'FACE',
+                   'THUMB', 'LIKE', 'HEART', 'STAR', 'COMMENT'),
+    "Файлы и папки": ('FILE', 'FOLDER', 'DOCUMENT', 'IMAGE', 'PHOTO',
+                      'VIDEO', 'MUSIC', 'CLOUD'),
+    "Уведомления": ('NOTIFICATION', 'ALARM', 'WARNING', 'ERROR',
+                    'INFO', 'HELP'),
+    "Коммуникации": ('MAIL', 'EMAIL', 'PHONE', 'MESSAGE', 'CHAT', 'CALL'),
+    "Время": ('TIME', 'DATE', 'CALENDAR', 'CLOCK', 'TIMER', 'HISTORY'),
+    "Карты и места": ('LOCATION', 'MAP', 'PLACE', 'NAVIGATE', 'DIRECTION'),
+    DEFAULT_CATEGORY: ('KEY', 'LOCK', 'UNLOCK', 'VISIBILITY', 'EYE', 'SORT',
+                       'REFRESH', 'CODE', 'LINK', 'ATTACH', 'TAG', 'BOOKMARK',
+                       'FLAG', 'PALETTE', 'COLOR', 'BRIGHTNESS', 'VOLUME',
+                       'MIC', 'CAMERA', 'HEADPHONES', 'BATTERY', 'WIFI',
+                       'NETWORK', 'BLUETOOTH', 'USB', 'HARDWARE', 'DEVICE',
+                       'COMPUTER', 'PHONE', 'TABLET', 'TV', 'WATCH'),
+})
+
+
+class IconCatalog:
+    """
+    Неизменяемый каталог иконок ft.Icons
+
+    Строится один раз на процесс и используется всеми сессиями и
+    представлениями только для чтения.
+
+    Attributes:
+        icons: Записи иконок, отсортированные по имени
+        categories: Категория -> кортеж имён иконок
+        category_counts: Категория -> количество иконок
+        category_options: Подписи для выпадающего списка категорий
+        category_ids: Категория -> множество позиций иконок в icons
+    """
+
+    __slots__ = ("icons", "categories", "category_counts", "category_options",
+                 "category_ids", "_search_index", "_ranker", "_lock")
+
+    def __init__(self, icons: List[Dict[str, Any]]):
+        icons.sort(key=lambda x: x['name'])
+
+        categories: Dict[str, List[str]] = {}
+        category_ids: Dict[str, List[int]] = {}
+        for icon_id, icon_data in enumerate(icons):
+            # Иконка входит во все свои категории
+            for category in icon_data['categories']:
+                categories.setdefault(category, []).append(icon_data['name'])
+                category_ids.setdefault(category, []).append(icon_id)
+
+        # Записи отдаём только на чтение
+        self.icons: Tuple[Mapping[str, Any], ...] = tuple(
+            MappingProxyType(icon_data) for icon_data in icons
+        )
+        self.categories: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+            name: tuple(names) for name, names in categories.items()
+        })
+        self.category_counts: Mapping[str, int] = MappingProxyType({
+            name: len(names) for name, names in categories.items()
+        })
+        # Категории в алфавитном порядке вместе со счётчиками
+        self.category_options: Tuple[str, ...] = tuple(
+            f"{name} ({self.category_counts[name]})"
+            for name in sorted(self.category_counts)
+        )
+        self.category_ids: Mapping[str, frozenset] = MappingProxyType({
+            name: frozenset(ids) for name, ids in category_ids.items()
+        })
+
+        self._search_index: Optional[TrigramIndex] = None
+        self._ranker: Optional[TokenRanker] = None
+        self._lock = threading.Lock()
+
+    @property
+    def search_index(self) -> TrigramIndex:
+        """Индекс триграмм по именам иконок (строится при первом поиске)"""
+        if self._search_index is None:
+            with self._lock:
+                if self._search_index is None:
+                    self._search_index = TrigramIndex(icon_search_keys(self.icons))
+        return self._search_index
+
+    @property
+    def ranker(self) -> TokenRanker:
+        """Ранжирование по токенам имён с допуском опечаток (строится при первом поиске)"""
+        if self._ranker is None:
+            with self._lock:
+                if self._ranker is None:
+                    self._ranker = TokenRanker(icon_search_keys(self.icons))
+        return self._ranker
+
+    def warm(self) -> Tuple[TrigramIndex, TokenRanker]:
+        """Строит индекс поиска и ранжирование заранее, до первого запроса"""
+        return self.search_index, self.ranker
+
+    def search(self, query: str, category: Optional[str] = None) -> List[Mapping[str, Any]]:
+        """
+        Поиск иконок по подстроке с необязательным фильтром категории
+
+        Args:
+            query: Строка поиска в нижнем регистре (пустая — все иконки)
+            category: Название категории без счётчика (None — все категории)
+
+        Returns:
+            Найденные записи в алфавитном порядке
+        """
+        if query:
+            ids = self.search_index.search(icon_search_key(query))
+        else:
+            ids = range(len(self.icons))
+        if category is not None:
+            allowed = self.category_ids.get(category, frozenset())
+            ids = [icon_id for icon_id in ids if icon_id in allowed]
+        return [self.icons[icon_id] for icon_id in ids]
+
+    def rank(self, query: str, category: Optional[str] = None,
+             limit: int = 60) -> List[Mapping[str, Any]]:
+        """
+        Ранжированный поиск с допуском опечаток ("dleete" -> DELETE)
+
+        Args:
+            query: Строка поиска
+            category: Название категории без счётчика (None — все категории)
+            limit: Сколько лучших результатов вернуть
+
+        Returns:
+            Записи по убыванию релевантности
+        """
+        allowed = None
+        if category is not None:
+            allowed = self.category_ids.get(category, frozenset())
+        ranked = self.ranker.rank(icon_search_key(query), limit, allowed)
+        return [self.icons[icon_id] for _, icon_id in ranked]
+
+    def __len__(self) -> int:
+        return len(self.icons)
+
+
+class CategoryMatcher:
+    """
+    Однопроходная категоризация иконок по токенам имени
+
+    Таблица токен -> битовая маска категорий строится один раз из правил.
+    Имя делится на токены по "_", и каждый токен ищется в таблице за O(1),
+    поэтому UP совпадает с ARROW_UP, но не с CUPS или GROUP. Иконка
+    получает все подходящие категории в порядке правил; множественное
+    число (ARROWS, NOTIFICATIONS) сводится к единственному.
+
+    Args:
+        patterns: Категория -> токены
+        default: Категория для иконок без совпадений
+    """
+
+    def __init__(self, patterns: Mapping[str, Tuple[str, ...]], default: str = DEFAULT_CATEGORY):
+        self.category_names: Tuple[str, ...] = tuple(patterns)
+        self.default = (default,)
+
+        self._masks: Dict[str, int] = {}
+        for bit, category in enumerate(self.category_names):
+            for token in patterns[category]:
+                self._masks[token] = self._masks.get(token, 0) | (1 << bit)
+
+        # Маска -> кортеж категорий (различных масок немного)
+        self._labels: Dict[int, Tuple[str, ...]] = {}
+
+    def _token_mask(self, token: str) -> int:
+        mask = self._masks.get(token)
+        if mask is not None:
+            return mask
+        # Множественное число: ARROWS -> ARROW, BOXES -> BOX
+        if token.endswith('ES') and token[:-2] in self._masks:
+            return self._masks[token[:-2]]
+        if token.endswith('S'):
+            return self._masks.get(token[:-1], 0)
+        return 0
+
+    def categorize(self, name: str) -> Tuple[str, ...]:
+        """Возвращает все категории иконки в порядке правил"""
+        mask = 0
+        for token in name.split('_'):
+            if token:
+                mask |= self._token_mask(token)
+
+        if not mask:
+            return self.default
+
+        labels = self._labels.get(mask)
+        if labels is None:
+            labels = self._labels[mask] = tuple(
+                category for bit, category in enumerate(self.category_names)
+                if mask & (1 << bit)
+            )
+        return labels
+
+
+_matcher = CategoryMatcher(CATEGORY_PATTERNS)
+
+
+def categorize_icon(name: str) -> Tuple[str, ...]:
+    """Определяет категории иконки по её имени"""
+    return _matcher.categorize(name)
+
+
+def _icon_record(name: str, value: str, categories: Tuple[str, ...]) -> Dict[str, Any]:
+    """Создаёт запись иконки"""
+    return {
+        'name': name,
+        'value': value,
+        'display_name': name.replace('_', ' ').title(),
+        # Основная категория для подписи и полный список для фильтров
+        'category': categories[0],
+        'categories': categories,
+    }
+
+
+def reflect_icons() -> List[Dict[str, Any]]:
+    """Собирает записи иконок из ft.Icons через рефлексию"""
+    icons = []
+    for attr_name in dir(ft.Icons):
+        if not attr_name.startswith('_') and attr_name.isupper():
+            try:
+                icon_value = getattr(ft.Icons, attr_name)
+            except AttributeError:
+                continue
+
+            icons.append(_icon_record(attr_name, icon_value.value, categorize_icon(attr_name)))
+    return icons
+
+
+def _snapshot_rules() -> Dict[str, Any]:
+    """Правила, от которых зависит снимок каталога иконок"""
+    return {"patterns": dict(CATEGORY_PATTERNS), "default": DEFAULT_CATEGORY}
+
+
+def _icons_to_payload(icons: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Упаковывает записи по колонкам; наборы категорий хранятся один раз"""
+    labels: Dict[Tuple[str, ...], int] = {}
+    label_ids = [labels.setdefault(icon['categories'], len(labels)) for icon in icons]
+    return {
+        "names": [icon['name'] for icon in icons],
+        "values": [icon['value'] for icon in icons],
+        "labels": [list(label) for label in labels],
+        "label_ids": label_ids,
+    }
+
+
+def _icons_from_payload(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Восстанавливает записи иконок из снимка"""
+    labels = [tuple(label) for label in payload["labels"]]
+    return [
+        _icon_record(name, value, labels[label_id])
+        for name, value, label_id in zip(payload["names"], payload["values"], payload["label_ids"])
+    ]
+
+
+def build_icon_catalog(use_snapshot: bool = True) -> IconCatalog:
+    """
+    Строит каталог иконок
+
+    Если на диске есть снимок для установленной версии Flet и текущих
+    правил категоризации, каталог восстанавливается из него без
+    рефлексии по ft.Icons. Иначе каталог строится заново и снимок
+    перезаписывается.
+
+    Args:
+        use_snapshot: Читать и сохранять снимок на диске
+    """
+    rules = _snapshot_rules()
+    payload = load_snapshot("icons", rules) if use_snapshot else None
+
+    if payload is not None:
+        icons = _icons_from_payload(payload)
+    else:
+        icons = reflect_icons()
+        if use_snapshot:
+            save_snapshot("icons", rules, _icons_to_payload(icons))
+
+    return IconCatalog(icons)
+
+
+_catalog: Optional[IconCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_icon_catalog() -> IconCatalog:
+    """Возвращает общий для процесса каталог иконок, создавая его при первом вызове"""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = build_icon_catalog()
+    return _catalog
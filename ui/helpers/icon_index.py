@@ -0,0 +1,296 @@
+# ui/helpers/icon_index.py
+import heapq
+import threading
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+# Длина n-граммы основного индекса
+GRAM_SIZE = 3
+
+# Сколько токенов запроса помнит ранжирование
+MATCH_CACHE_SIZE = 256
+
+
+def _grams(text: str, size: int) -> Set[str]:
+    """Возвращает множество подстрок длины size"""
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class TrigramIndex:
+    """
+    Инвертированный индекс триграмм для поиска подстрок
+
+    Запрос из трёх и более символов раскладывается на триграммы, списки
+    вхождений пересекаются, начиная с самого короткого, и подстрока
+    проверяется только у оставшихся кандидатов. Запросы из одного-двух
+    символов отвечаются готовой таблицей коротких подстрок.
+
+    Args:
+        keys: Строка поиска для каждой записи (в нижнем регистре)
+    """
+
+    def __init__(self, keys: Sequence[str]):
+        self.keys = keys
+
+        trigrams: Dict[str, List[int]] = {}
+        short: Dict[str, List[int]] = {}
+
+        for record_id, key in enumerate(keys):
+            # Идентификаторы растут, поэтому списки вхождений уже отсортированы
+            for gram in _grams(key, GRAM_SIZE):
+                trigrams.setdefault(gram, []).append(record_id)
+            for gram in _grams(key, 1) | _grams(key, 2):
+                short.setdefault(gram, []).append(record_id)
+
+        self._trigrams: Dict[str, Tuple[int, ...]] = {
+            gram: tuple(ids) for gram, ids in trigrams.items()
+        }
+        self._short: Dict[str, Tuple[int, ...]] = {
+            gram: tuple(ids) for gram, ids in short.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def search(self, query: str) -> Sequence[int]:
+        """
+        Находит записи, ключ которых содержит query
+
+        Args:
+            query: Строка поиска в нижнем регистре
+
+        Returns:
+            Отсортированные идентификаторы найденных записей
+        """
+        if not query:
+            return range(len(self.keys))
+
+        if len(query) < GRAM_SIZE:
+            return self._short.get(query, ())
+
+        postings = []
+        for gram in _grams(query, GRAM_SIZE):
+            ids = self._trigrams.get(gram)
+            if not ids:
+                return ()
+            postings.append(ids)
+
+        # Пересекаем от самого короткого списка к самому длинному
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates.intersection_update(ids)
+            if not candidates:
+                return ()
+
+        # Триграммы могут совпасть вразброс — проверяем подстроку
+        keys = self.keys
+        return [record_id for record_id in sorted(candidates) if query in keys[record_id]]
+
+
+def icon_search_key(text: str) -> str:
+    """
+    Приводит имя иконки или запрос к ключу поиска
+
+    Отображаемое имя отличается от имени только пробелами вместо "_",
+    поэтому оба ищутся по одному ключу: "arrow back" == "arrow_back".
+    """
+    return text.lower().replace(' ', '_')
+
+
+def icon_search_keys(icons: Iterable) -> Tuple[str, ...]:
+    """Строит ключи поиска для записей иконок"""
+    return tuple(icon_search_key(icon['name']) for icon in icons)
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Расстояние Дамерау–Левенштейна (с перестановкой соседних символов)
+
+    Считает не дальше limit: если расстояние больше, возвращает limit + 1.
+    """
+    len_a, len_b = len(a), len(b)
+    if abs(len_a - len_b) > limit:
+        return limit + 1
+
+    prev_prev: List[int] = []
+    prev = list(range(len_b + 1))
+    for i in range(1, len_a + 1):
+        current = [i] + [0] * len_b
+        row_min = i
+        char_a = a[i - 1]
+        for j in range(1, len_b + 1):
+            cost = 0 if char_a == b[j - 1] else 1
+            value = min(prev[j] + 1, current[j - 1] + 1, prev[j - 1] + cost)
+            if (i > 1 and j > 1 and char_a == b[j - 2]
+                    and a[i - 2] == b[j - 1]):
+                value = min(value, prev_prev[j - 2] + 1)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        # Вся строка уже хуже порога — дальше не считаем
+        if row_min > limit:
+            return limit + 1
+        prev_prev, prev = prev, current
+
+    return min(prev[len_b], limit + 1)
+
+
+class TokenRanker:
+    """
+    Ранжированный поиск по токенам имён с допуском опечаток
+
+    Имя иконки делится на токены по "_" (ARROW, BACK, IOS, ...). Каждый
+    токен запроса сравнивается со словарём токенов (его размер — сотни
+    слов, а не тысячи иконок): точное совпадение, префикс или опечатка в
+    пределах расстояния Дамерау–Левенштейна. Оценки переносятся на иконки
+    через списки вхождений, а лучшие k результатов отбираются
+    ограниченной кучей без полной сортировки каталога.
+
+    Args:
+        keys: Ключ поиска для каждой записи (имя в нижнем регистре через "_")
+    """
+
+    # Оценки совпадения токена
+    EXACT_SCORE = 1.0
+    PREFIX_SCORE = 0.8
+    TYPO_SCORE = 0.7
+
+    # Штраф за каждый лишний токен имени (чтобы ARROW_BACK был выше ARROW_BACK_IOS_NEW)
+    EXTRA_TOKEN_PENALTY = 0.02
+
+    def __init__(self, keys: Sequence[str]):
+        self.keys = keys
+
+        postings: Dict[str, List[int]] = {}
+        token_counts: List[int] = []
+        for record_id, key in enumerate(keys):
+            tokens = {token for token in key.split('_') if token}
+            token_counts.append(len(tokens))
+            for token in tokens:
+                postings.setdefault(token, []).append(record_id)
+
+        self._postings: Dict[str, Tuple[int, ...]] = {
+            token: tuple(ids) for token, ids in postings.items()
+        }
+        self._token_counts: Tuple[int, ...] = tuple(token_counts)
+
+        # Словарь токенов, сгруппированный по длине, для отсечения по длине.
+        # Рядом храним множество символов токена для быстрой предпроверки
+        self._tokens_by_length: Dict[int, List[Tuple[str, frozenset]]] = {}
+        for token in self._postings:
+            self._tokens_by_length.setdefault(len(token), []).append(
+                (token, frozenset(token))
+            )
+
+        # Токены запроса повторяются при наборе ("arr", "arro", "arrow back").
+        # Ранжирование общее для всех сессий, а обработчики Flet выполняются
+        # в пуле потоков — кэш меняется только под замком
+        self._match_cache: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def typo_limit(token: str) -> int:
+        """Допустимое число опечаток для токена запроса"""
+        if len(token) <= 2:
+            return 0
+        if len(token) <= 6:
+            return 1
+        return 2
+
+    def match_token(self, query_token: str) -> Dict[str, float]:
+        """Находит токены словаря, похожие на токен запроса, с их оценками"""
+        with self._lock:
+            matches = self._match_cache.get(query_token)
+        if matches is None:
+            # Считаем вне замка: одновременный подсчёт одного токена безвреден
+            matches = self._match_token(query_token)
+            with self._lock:
+                if len(self._match_cache) >= MATCH_CACHE_SIZE:
+                    self._match_cache.clear()
+                self._match_cache[query_token] = matches
+        return matches
+
+    def clear_cache(self):
+        """Очищает кэш совпадений токенов запроса"""
+        with self._lock:
+            self._match_cache.clear()
+
+    def _match_token(self, query_token: str) -> Dict[str, float]:
+        limit = self.typo_limit(query_token)
+        query_length = len(query_token)
+        query_chars = set(query_token)
+        matches: Dict[str, float] = {}
+
+        for length, tokens in self._tokens_by_length.items():
+            if length < query_length - limit:
+                continue
+            check_full = abs(length - query_length) <= limit
+            for token, token_chars in tokens:
+                if token == query_token:
+                    matches[token] = self.EXACT_SCORE
+                    continue
+                if length > query_length and token.startswith(query_token):
+                    matches[token] = self.PREFIX_SCORE + 0.1 * query_length / length
+                    continue
+                # Каждая правка убирает не больше одного "чужого" символа запроса
+                if not limit or len(query_chars - token_chars) > limit:
+                    continue
+
+                distance = limit + 1
+                if check_full:
+                    distance = bounded_edit_distance(query_token, token, limit)
+                if distance > limit and length > query_length:
+                    # Опечатка в начале длинного слова: "delte" -> "delete..."
+                    prefix = token[:query_length]
+                    if len(query_chars.difference(prefix)) <= limit:
+                        distance = bounded_edit_distance(query_token, prefix, limit) + 1
+                if distance <= limit:
+                    matches[token] = self.TYPO_SCORE * (1 - distance / (query_length + 1))
+
+        return matches
+
+    def rank(self, query: str, k: int = 60, allowed=None) -> List[Tuple[float, int]]:
+        """
+        Возвращает k лучших записей по релевантности
+
+        Args:
+            query: Ключ запроса (в нижнем регистре, токены через "_")
+            k: Сколько результатов оставить
+            allowed: Необязательное множество допустимых идентификаторов
+
+        Returns:
+            Пары (оценка, идентификатор) по убыванию оценки
+        """
+        query_tokens = [token for token in query.split('_') if token]
+        if not query_tokens or k <= 0:
+            return []
+
+        scores: Dict[int, float] = {}
+        for query_token in query_tokens:
+            best: Dict[int, float] = {}
+            for token, score in self.match_token(query_token).items():
+                for record_id in self._postings[token]:
+                    if score > best.get(record_id, 0.0):
+                        best[record_id] = score
+            for record_id, score in best.items():
+                scores[record_id] = scores.get(record_id, 0.0) + score
+
+        if allowed is not None:
+            scores = {record_id: score for record_id, score in scores.items()
+                      if record_id in allowed}
+
+        token_counts = self._token_counts
+        penalty = self.EXTRA_TOKEN_PENALTY
+        query_length = len(query_tokens)
+
+        def relevance(item):
+            record_id, score = item
+            extra = max(0, token_counts[record_id] - query_length)
+            return score - penalty * extra
+
+        # heapq.nlargest держит кучу из k элементов: O(n log k) вместо полной сортировки.
+        # При равной оценке выше идёт меньший идентификатор, т.е. имя по алфавиту
+        best_items = heapq.nlargest(
+            k, scores.items(), key=lambda item: (relevance(item), -item[0])
+        )
+        return [(relevance(item), item[0]) for item in best_items]
@@ -0,0 +1,352 @@
+# ui/helpers/loop_monitor.py
+import asyncio
+import bisect
+import math
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import flet as ft
+
+from ui.helpers.connection_probe import percentile
+from ui.helpers.ticker import WAKEUP_MARGIN, TickerSubscription, get_ticker
+
+# Период замеров задержки цикла событий, пока пользователь что-то делает (секунды)
+LAG_INTERVAL = 0.25
+
+# Через сколько секунд без действий пользователя замеры переходят на общий
+# таймер: одно пробуждение в секунду, которое у футера и так есть
+LAG_IDLE_AFTER = 10.0
+
+# Задержка, после которой цикл событий считается перегруженным (мс)
+DEFAULT_LAG_THRESHOLD_MS = 100
+
+# Сколько секунд без превышений нужно, чтобы состояние "перегружен" снялось
+LAG_RECOVERY = 5.0
+
+# Верхние границы корзин гистограммы задержек (мс); последняя корзина — всё выше
+LAG_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Сколько последних задержек хранится для перцентилей (минута замеров)
+LAG_WINDOW = 240
+
+# Сколько последних запусков обработчиков помнится для поиска виновника
+RECENT_HANDLERS = 32
+
+# Запуск обработчика: [имя, начало, конец, поток]; время — по time.monotonic()
+HandlerRun = List[Any]
+
+
+class LoopLagMonitor:
+    """
+    Монитор задержки цикла событий
+
+    Замер сравнивает фактическое время пробуждения с ожидаемым: разница —
+    сколько цикл был занят синхронной работой (загрузка, фильтры, сборка
+    патчей). Задержки раскладываются по корзинам гистограммы и хранятся в
+    скользящем окне для p50/p95/p99.
+
+    Пока пользователь что-то делает (обработчики и отправки действий), своя
+    задача засыпает на interval секунд. Через LAG_IDLE_AFTER секунд без
+    действий она завершается, и в простое замером служит опоздание тика
+    общего таймера (Ticker) — отдельных пробуждений монитор не добавляет.
+    Первое же действие снова запускает частые замеры.
+
+    Если задержка превысила порог, монитор переходит в состояние
+    degraded (снимается через recovery секунд без превышений) и пишет в
+    лог обработчик, который выполнялся во время задержки. Пока нагрузка
+    держится, в лог попадает не больше одной строки за recovery секунд —
+    худшая задержка периода и её обработчик.
+    Текущие обработчики отмечаются через running() (и декоратор traced):
+    это два вызова time.monotonic() и короткий замок на запуск, поэтому
+    отметка включена всегда. Запуски отмечаются из всех потоков, но
+    виновником задержки считается только обработчик в потоке цикла
+    событий: синхронные обработчики Flet выполняются в пуле потоков и
+    цикл не блокируют. Пересёкшиеся с задержкой обработчики пула
+    записываются в лог отдельно, как параллельные.
+
+    Как и проверка подключения, монитор один на процесс и работает, пока
+    есть подключённые сессии.
+
+    Args:
+        interval: Период замеров в секундах, пока есть действия пользователя
+        threshold_ms: Порог задержки (по умолчанию FLETAPP_LAG_THRESHOLD_MS)
+        recovery: Секунд без превышений до снятия состояния degraded
+    """
+
+    def __init__(self, interval: float = LAG_INTERVAL, threshold_ms: float = None,
+                 recovery: float = LAG_RECOVERY):
+        self.interval = interval
+        self.threshold_ms = threshold_ms or float(
+            os.environ.get("FLETAPP_LAG_THRESHOLD_MS") or DEFAULT_LAG_THRESHOLD_MS
+        )
+        self.recovery = recovery
+
+        # Гистограмма и окно задержек
+        self.histogram: List[int] = [0] * (len(LAG_BUCKETS) + 1)
+        self.lags: deque = deque(maxlen=LAG_WINDOW)
+        self.samples = 0
+        self.max_lag_ms = 0.0
+
+        # Состояние перегрузки и последняя задержка выше порога
+        self.degraded = False
+        self.stalls = 0
+        self.last_stall: Optional[Dict[str, Any]] = None
+        # Растёт при каждом изменении состояния (для подписчиков)
+        self.version = 0
+        self._degraded_until = 0.0
+
+        # Сводка превышений для лога: не чаще раза в recovery секунд
+        self._next_log = 0.0
+        self._worst_stall: Optional[Dict[str, Any]] = None
+        self._pending_stalls = 0
+
+        # Обработчики (из всех потоков): выполняющиеся и недавние
+        self._runs_lock = threading.Lock()
+        self._running: List[HandlerRun] = []
+        self._recent: "deque[HandlerRun]" = deque(maxlen=RECENT_HANDLERS)
+
+        # Замеры идут, пока есть подключённые сессии: частые — своей задачей
+        # после действий пользователя, в простое — по тикам общего таймера
+        self._pages: "weakref.WeakSet[ft.Page]" = weakref.WeakSet()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._tick_subscription: Optional[TickerSubscription] = None
+        self._last_activity = 0.0
+        self._active = False
+        self._lock = threading.Lock()
+
+    # --- Текущий обработчик ---------------------------------------------------
+
+    def enter(self, name: str, activity: bool = True) -> HandlerRun:
+        """
+        Отмечает начало обработчика
+
+        Args:
+            name: Имя обработчика
+            activity: Действие пользователя — включает частые замеры
+                (False — фоновая работа вроде отправки тиков часов)
+        """
+        run = [name, time.monotonic(), None, threading.get_ident()]
+        with self._runs_lock:
+            self._running.append(run)
+        if activity:
+            self._last_activity = run[1]
+            if not self._active:
+                self._activate()
+        return run
+
+    def exit(self, run: HandlerRun):
+        """Отмечает конец обработчика, начатого enter()"""
+        run[2] = time.monotonic()
+        with self._runs_lock:
+            # Корутины и потоки завершаются не в порядке начала — ищем по ссылке
+            for i in range(len(self._running) - 1, -1, -1):
+                if self._running[i] is run:
+                    del self._running[i]
+                    break
+            self._recent.append(run)
+
+    @contextmanager
+    def running(self, name: str, activity: bool = True) -> Iterator[None]:
+        """Блок кода, выполняющийся как обработчик name (activity — как в enter())"""
+        run = self.enter(name, activity)
+        try:
+            yield
+        finally:
+            self.exit(run)
+
+    def _overlapping(self, started: float, finished: float) -> List[Tuple[float, float, str, int]]:
+        """Запуски, пересёкшиеся с [started, finished]: (перекрытие, начало, имя, поток)"""
+        with self._runs_lock:
+            runs = [tuple(run) for run in self._recent] + [tuple(run) for run in self._running]
+        overlapping = []
+        for name, begin, end, thread_id in runs:
+            overlap = min(end if end is not None else finished, finished) - max(begin, started)
+            if overlap > 0:
+                overlapping.append((overlap, begin, name, thread_id))
+        return overlapping
+
+    def culprit(self, started: float, finished: float, loop_thread: int = None) -> Optional[str]:
+        """
+        Обработчик цикла событий, дольше всех выполнявшийся в [started, finished]
+
+        Учитываются только запуски в потоке цикла (loop_thread, по умолчанию
+        текущий поток): обработчики пула потоков цикл не блокируют. Для
+        корутин учитывается всё время до завершения, включая ожидания,
+        поэтому при равном перекрытии выбирается начатый позже.
+        """
+        loop_thread = loop_thread or threading.get_ident()
+        best: Optional[Tuple[float, float, str]] = None
+        for overlap, begin, name, thread_id in self._overlapping(started, finished):
+            if thread_id == loop_thread and (best is None or (overlap, begin) > best[:2]):
+                best = (overlap, begin, name)
+        return best[2] if best else None
+
+    def concurrent(self, started: float, finished: float, loop_thread: int = None) -> List[str]:
+        """Обработчики пула потоков, выполнявшиеся в [started, finished] (не виновники)"""
+        loop_thread = loop_thread or threading.get_ident()
+        return sorted({
+            name for _, _, name, thread_id in self._overlapping(started, finished)
+            if thread_id != loop_thread
+        })
+
+    # --- Замеры ---------------------------------------------------------------
+
+    def record(self, lag_ms: float, expected: float, now: float):
+        """Учитывает одну задержку пробуждения (expected и now — time.monotonic())"""
+        self.samples += 1
+        self.lags.append(lag_ms)
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        self.histogram[bisect.bisect_left(LAG_BUCKETS, lag_ms)] += 1
+
+        if lag_ms > self.threshold_ms:
+            # Цикл был занят с ожидаемого момента пробуждения до фактического;
+            # record() вызывается в потоке цикла событий
+            stall = {
+                'lag_ms': lag_ms,
+                'handler': self.culprit(expected, now),
+                'concurrent': self.concurrent(expected, now),
+                'at': time.time(),
+            }
+            self.stalls += 1
+            self.last_stall = stall
+            self._degraded_until = now + self.recovery
+            if not self.degraded:
+                self.degraded = True
+                self.version += 1
+                self._log_stall(stall, now, "Перегрузка цикла событий")
+            else:
+                # Под нагрузкой в лог идёт только худшая задержка за период recovery
+                self._pending_stalls += 1
+                if self._worst_stall is None or lag_ms > self._worst_stall['lag_ms']:
+                    self._worst_stall = stall
+                if now >= self._next_log:
+                    self._flush_stall_log(now)
+        elif self.degraded and now >= self._degraded_until:
+            self._flush_stall_log(now)
+            self.degraded = False
+            self.version += 1
+
+    def _log_stall(self, stall: Dict[str, Any], now: float, title: str):
+        """Пишет задержку в лог; следующая запись — не раньше чем через recovery"""
+        concurrent = ""
+        if stall['concurrent']:
+            concurrent = f", параллельно в пуле потоков: {', '.join(stall['concurrent'])}"
+        print(f"[LoopLagMonitor] {title}: задержка {stall['lag_ms']:.0f} мс "
+              f"(порог {self.threshold_ms:.0f} мс), обработчик: {stall['handler'] or 'неизвестен'}"
+              f"{concurrent}")
+        self._next_log = now + self.recovery
+
+    def _flush_stall_log(self, now: float):
+        """Пишет в лог худшую из накопленных задержек"""
+        if self._worst_stall is None:
+            return
+        self._log_stall(
+            self._worst_stall, now,
+            f"Превышений за {self.recovery:g} с: {self._pending_stalls}, худшее",
+        )
+        self._worst_stall = None
+        self._pending_stalls = 0
+
+    def lag_percentiles(self) -> Optional[Tuple[float, float, float]]:
+        """Задержка p50, p95 и p99 (мс) по окну замеров"""
+        if not self.lags:
+            return None
+        values = sorted(self.lags)
+        return percentile(values, 0.5), percentile(values, 0.95), percentile(values, 0.99)
+
+    def histogram_rows(self) -> List[Tuple[str, int]]:
+        """Гистограмма подписями корзин: [("≤1 мс", n), ..., (">2500 мс", n)]"""
+        labels = [f"≤{bound} мс" for bound in LAG_BUCKETS] + [f">{LAG_BUCKETS[-1]} мс"]
+        return list(zip(labels, self.histogram))
+
+    # --- Фоновые замеры -----------------------------------------------------
+
+    def watch(self, page: ft.Page):
+        """
+        Запускает замеры для сессии страницы
+
+        Замеры одни на процесс и останавливаются, когда не остаётся
+        подключённых страниц.
+        """
+        with self._lock:
+            self._pages.add(page)
+            self._loop = page.loop
+            if self._tick_subscription is None or not self._tick_subscription.active:
+                page.loop.call_soon_threadsafe(self._start_idle_sampling)
+
+    def _start_idle_sampling(self):
+        """Подписывает замеры простоя на общий таймер (в потоке цикла событий)"""
+        if self._tick_subscription is None or not self._tick_subscription.active:
+            self._tick_subscription = get_ticker().subscribe(self._on_tick, 1)
+
+    def _activate(self):
+        """Переходит на частые замеры (вызывается из любого потока)"""
+        with self._lock:
+            if self._active or self._loop is None:
+                return
+            self._active = True
+            loop = self._loop
+        loop.call_soon_threadsafe(self._start_monitor)
+
+    def _start_monitor(self):
+        """Запускает задачу частых замеров (в потоке цикла событий)"""
+        if self._monitor_task is None or self._monitor_task.done():
+            self._monitor_task = asyncio.ensure_future(self._monitor())
+
+    def _has_watchers(self) -> bool:
+        with self._lock:
+            return any(page.connection is not None for page in self._pages)
+
+    def _on_tick(self, now: float):
+        """Замер простоя: опоздание тика общего таймера от границы секунды"""
+        if not self._has_watchers():
+            self._tick_subscription.cancel()
+            return
+        if self._active:
+            # Замеры идут своей задачей
+            return
+        late = max(0.0, now - (math.floor(now) + WAKEUP_MARGIN))
+        finished = time.monotonic()
+        self.record(late * 1000, finished - late, finished)
+
+    async def _monitor(self):
+        """Засыпает на interval и замеряет опоздание пробуждения, пока есть действия"""
+        try:
+            while self._has_watchers() and time.monotonic() - self._last_activity < LAG_IDLE_AFTER:
+                expected = time.monotonic() + self.interval
+                try:
+                    await asyncio.sleep(self.interval)
+                except asyncio.CancelledError:
+                    break
+                now = time.monotonic()
+                self.record(max(0.0, now - expected) * 1000, expected, now)
+        finally:
+            with self._lock:
+                self._active = False
+
+    def stop(self):
+        """Останавливает замеры"""
+        if self._monitor_task and not self._monitor_task.done():
+            self._monitor_task.cancel()
+        if self._tick_subscription is not None:
+            self._tick_subscription.cancel()
+
+
+_monitor: Optional[LoopLagMonitor] = None
+_monitor_lock = threading.Lock()
+
+
+def get_loop_monitor() -> LoopLagMonitor:
+    """Возвращает общий для процесса монитор задержки цикла событий"""
+    global _monitor
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                _monitor = LoopLagMonitor()
+    return _monitor
@@ -0,0 +1,273 @@
+# ui/helpers/render_scheduler.py
+import asyncio
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+import flet as ft
+
+from ui.helpers.loop_monitor import get_loop_monitor
+
+
+class RenderScheduler:
+    """
+    Планировщик отрисовки одной сессии (страницы)
+
+    Компоненты не вызывают page.update() сами, а отмечают изменённые
+    контролы через mark_dirty(). Все отметки за один проход цикла событий
+    сливаются в одно обновление: контролы, чьи предки тоже отмечены,
+    отбрасываются, а остальные отправляются одним page.update(*controls).
+    Отметка без контролов означает изменение свойств самой страницы
+    (заголовок, тема) и обновляет всю страницу.
+
+    Изолированные контролы (is_isolated()) Flet при обновлении предка не
+    обходит вглубь, поэтому отмеченный потомок изолированного контрола
+    отправляется отдельно, даже если отмечен и предок.
+
+    Внутри interaction() отправка откладывается до выхода из блока, а
+    число отправок считается для статистики "отправок на действие".
+
+    Args:
+        page: Страница Flet (сессия)
+    """
+
+    def __init__(self, page: ft.Page):
+        self._page_ref = weakref.ref(page)
+        self._lock = threading.Lock()
+
+        # Отмеченные контролы (по id, в порядке отметки)
+        self._dirty: Dict[int, ft.Control] = {}
+        self._page_dirty = False
+        self._scheduled = False
+
+        # Глубина вложенных interaction(): пока > 0, отправка откладывается
+        self._batch_depth = 0
+        self._interaction: Optional[str] = None
+        self._interaction_flushes = 0
+
+        # Обратные вызовы after_flush(), ждущие ближайшей отправки
+        self._after_flush: List[Callable[[], None]] = []
+        # Идёт отправка: изменения уже забраны из _dirty, но ещё не отправлены
+        self._flushing = False
+        # Обратные вызовы, пришедшие во время этой отправки
+        self._in_flight: List[Callable[[], None]] = []
+
+        # Статистика
+        self.flush_count = 0
+        self.interaction_stats: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def page(self) -> Optional[ft.Page]:
+        return self._page_ref()
+
+    @property
+    def busy(self) -> bool:
+        """Есть ли неотправленные изменения или идущая отправка"""
+        with self._lock:
+            return bool(self._scheduled or self._flushing or self._batch_depth
+                        or self._page_dirty or self._dirty)
+
+    def mark_dirty(self, *controls: ft.Control):
+        """
+        Отмечает контролы для обновления в ближайшем проходе цикла событий
+
+        Args:
+            controls: Изменённые контролы; без аргументов — вся страница
+        """
+        with self._lock:
+            if not controls:
+                self._page_dirty = True
+            for control in controls:
+                self._dirty[id(control)] = control
+            self._schedule()
+
+    @contextmanager
+    def interaction(self, name: str) -> Iterator["RenderScheduler"]:
+        """
+        Действие пользователя: отметки внутри блока отправляются одним обновлением
+
+        Вложенные действия считаются частью внешнего.
+
+        Args:
+            name: Название действия для статистики ("navigate:icons", ...)
+        """
+        with self._lock:
+            self._batch_depth += 1
+            if self._batch_depth == 1:
+                self._close_interaction()
+                self._interaction = name
+                self._interaction_flushes = 0
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    if self._page_dirty or self._dirty:
+                        self._schedule()
+                    else:
+                        # Действие ничего не изменило на экране
+                        self._close_interaction()
+
+    def after_flush(self, callback: Callable[[], None]):
+        """
+        Вызывает callback после отправки накопленных изменений
+
+        Если отправлять нечего, callback вызывается сразу. Во время отправки
+        он ждёт её окончания: изменения, отмеченные вызывающим, могли уже
+        уйти в эту отправку.
+        """
+        with self._lock:
+            if self._page_dirty or self._dirty:
+                self._after_flush.append(callback)
+                return
+            if self._flushing:
+                self._in_flight.append(callback)
+                return
+        callback()
+
+    def flush(self):
+        """Отправляет накопленные изменения одним обновлением"""
+        with self._lock:
+            self._scheduled = False
+            if self._batch_depth:
+                return
+            page_dirty, self._page_dirty = self._page_dirty, False
+            dirty, self._dirty = self._dirty, {}
+            callbacks, self._after_flush = self._after_flush, []
+            self._flushing = True
+
+        try:
+            # Сборка и отправка патча идут в цикле событий — отмечаем их для монитора
+            # задержки; отправка без действия пользователя (тики часов) частых
+            # замеров не включает
+            with get_loop_monitor().running(f"flush:{self._interaction or 'render'}",
+                                            activity=self._interaction is not None):
+                self._send(page_dirty, dirty)
+        finally:
+            with self._lock:
+                self._flushing = False
+                callbacks += self._in_flight
+                self._in_flight = []
+            for callback in callbacks:
+                callback()
+
+    def _send(self, page_dirty: bool, dirty: Dict[int, ft.Control]):
+        """Отправляет отмеченные контролы (без покрытых предками)"""
+        page = self.page
+        if page is None or not (page_dirty or dirty):
+            return
+
+        if page_dirty:
+            dirty = {id(page): page, **dirty}
+        controls = self._minimal_controls(page, dirty)
+        if not controls:
+            return
+
+        try:
+            page.update(*controls)
+        except Exception as e:
+            print(f"[RenderScheduler] Ошибка обновления: {e}")
+            return
+
+        with self._lock:
+            self.flush_count += 1
+            if self._interaction is not None:
+                self._interaction_flushes += 1
+                # Отложенная отправка действия выполнена — действие завершено
+                if not self._batch_depth:
+                    self._close_interaction()
+
+    def flushes_per_interaction(self) -> Dict[str, float]:
+        """Среднее число отправок на одно действие каждого типа"""
+        with self._lock:
+            return {
+                name: stats['flushes'] / stats['count']
+                for name, stats in self.interaction_stats.items()
+                if stats['count']
+            }
+
+    def _schedule(self):
+        """Планирует flush() на ближайший проход цикла (вызывается под замком)"""
+        if self._scheduled or self._batch_depth:
+            return
+        page = self.page
+        loop = page.loop if page else None
+        if loop is None or loop.is_closed():
+            return
+        self._scheduled = True
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        # Синхронные обработчики Flet выполняются в потоках
+        if running is loop:
+            loop.call_soon(self.flush)
+        else:
+            loop.call_soon_threadsafe(self.flush)
+
+    def _close_interaction(self):
+        """Записывает статистику текущего действия (вызывается под замком)"""
+        if self._interaction is None:
+            return
+        stats = self.interaction_stats.setdefault(
+            self._interaction, {'count': 0, 'flushes': 0}
+        )
+        stats['count'] += 1
+        stats['flushes'] += self._interaction_flushes
+        self._interaction = None
+        self._interaction_flushes = 0
+
+    @staticmethod
+    def _minimal_controls(page: ft.Page, dirty: Dict[int, ft.Control]):
+        """Оставляет смонтированные контролы, которые не покрыты обновлением предка"""
+        index = page.index
+        controls = []
+        for control in dirty.values():
+            # Ещё не добавленный или уже удалённый контрол обновлять нечего
+            if control.uid is None or control.uid not in index:
+                continue
+            # Обход предка не заходит внутрь изолированного контрола
+            covered = False
+            node = control
+            while not node.is_isolated() and node.parent is not None:
+                node = node.parent
+                if id(node) in dirty:
+                    covered = True
+                    break
+            if not covered:
+                controls.append(control)
+        return controls
+
+
+_schedulers: "weakref.WeakKeyDictionary[ft.Page, RenderScheduler]" = weakref.WeakKeyDictionary()
+_schedulers_lock = threading.Lock()
+
+
+def get_render_scheduler(page: ft.Page) -> RenderScheduler:
+    """Возвращает планировщик отрисовки сессии (создаётся при первом вызове)"""
+    scheduler = _schedulers.get(page)
+    if scheduler is None:
+        with _schedulers_lock:
+            scheduler = _schedulers.get(page)
+            if scheduler is None:
+                scheduler = _schedulers[page] = RenderScheduler(page)
+    return scheduler
+
+
+def mark_dirty(page: Optional[ft.Page], *controls: ft.Control):
+    """Отмечает контролы для обновления (без страницы ничего не делает)"""
+    if page is not None:
+        get_render_scheduler(page).mark_dirty(*controls)
+
+
+@contextmanager
+def interaction(page: Optional[ft.Page], name: str) -> Iterator[None]:
+    """Объединяет обновления действия пользователя (без страницы — пустой блок)"""
+    if page is None:
+        yield
+        return
+    with get_render_scheduler(page).interaction(name):
+        yield
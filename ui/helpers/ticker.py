@@ -0,0 +1,188 @@
+# ui/helpers/ticker.py
+import asyncio
+import inspect
+import math
+import threading
+import time
+import weakref
+from typing import Callable, Dict, List, Optional
+
+import flet as ft
+
+# Запас после границы периода, чтобы не проснуться чуть раньше неё
+WAKEUP_MARGIN = 0.005
+
+
+class TickerSubscription:
+    """
+    Подписка на тики общего таймера
+
+    Обработчик хранится по слабой ссылке (для методов — через WeakMethod),
+    поэтому подписка не продлевает жизнь компонента. Подписка снимается
+    сама, когда компонент удалён или сессия страницы отключилась.
+    """
+
+    __slots__ = ("period", "slot", "_callback_ref", "_page_ref", "active")
+
+    def __init__(self, callback: Callable, period: int, page: Optional[ft.Page] = None):
+        self.period = period
+        # Номер последнего периода, о котором подписчик уже знает
+        self.slot = math.floor(time.time() / period)
+        if inspect.ismethod(callback):
+            self._callback_ref = weakref.WeakMethod(callback)
+        else:
+            self._callback_ref = lambda: callback
+        self._page_ref = weakref.ref(page) if page is not None else None
+        self.active = True
+
+    @property
+    def callback(self) -> Optional[Callable]:
+        """Обработчик или None, если его владелец уже удалён"""
+        return self._callback_ref() if self.active else None
+
+    @property
+    def alive(self) -> bool:
+        """Жив ли обработчик и подключена ли сессия его страницы"""
+        if self.callback is None:
+            return False
+        if self._page_ref is not None:
+            page = self._page_ref()
+            if page is None or page.connection is None:
+                return False
+        return True
+
+    def cancel(self):
+        """Снимает подписку"""
+        self.active = False
+
+
+class Ticker:
+    """
+    Общий для процесса таймер, на который подписываются все сессии
+
+    Вместо отдельной корутины с собственным sleep в каждой вкладке работает
+    одна задача: она просыпается на ближайшей границе периода (секунды,
+    минуты, ...) и за один проход вызывает всех подписчиков этого периода.
+    Обработчики только меняют свои контролы и отмечают их в планировщике
+    отрисовки, так что каждая сессия получает одно обновление на тик.
+    Число пробуждений цикла событий не зависит от числа сессий.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[int, List[TickerSubscription]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+        # Статистика
+        self.wakeups = 0
+        self.deliveries = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        """Количество активных подписок"""
+        with self._lock:
+            return sum(len(subs) for subs in self._subscriptions.values())
+
+    def subscribe(self, callback: Callable, period: int = 1,
+                  page: Optional[ft.Page] = None) -> TickerSubscription:
+        """
+        Подписывает обработчик на тики
+
+        Args:
+            callback: Обработчик callback(now); может быть корутинной функцией
+            period: Период в секундах; тики приходят на границах периода
+            page: Страница сессии: подписка снимается при её отключении
+
+        Returns:
+            Подписка (для отмены через cancel())
+        """
+        subscription = TickerSubscription(callback, max(1, int(period)), page)
+        loop = page.loop if page is not None else asyncio.get_running_loop()
+
+        with self._lock:
+            self._subscriptions.setdefault(subscription.period, []).append(subscription)
+            # Задачи нет (или она осталась в закрытом цикле) — запускаем новую
+            if self._task is None or self._task.done() or self._loop is not loop:
+                self._loop = loop
+                self._wakeup = None
+                loop.call_soon_threadsafe(self._start)
+            elif self._wakeup is not None:
+                # Новый период мог сдвинуть ближайшую границу
+                loop.call_soon_threadsafe(self._wakeup.set)
+        return subscription
+
+    def _start(self):
+        """Запускает задачу таймера (в потоке цикла событий)"""
+        if self._task is None or self._task.done() or self._task.get_loop() is not self._loop:
+            self._wakeup = asyncio.Event()
+            self._task = self._loop.create_task(self._run())
+
+    async def _run(self):
+        """Цикл таймера: одно пробуждение на ближайшей границе периода"""
+        while True:
+            now = time.time()
+            with self._lock:
+                if not self._subscriptions:
+                    # Подписчиков не осталось — задача завершается
+                    self._task = None
+                    break
+                deadline = min((math.floor(now / period) + 1) * period
+                               for period in self._subscriptions)
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(),
+                                       deadline - now + WAKEUP_MARGIN)
+                # Разбудила новая подписка — пересчитываем границу
+                continue
+            except asyncio.TimeoutError:
+                pass
+
+            self.wakeups += 1
+            self._fan_out(time.time())
+
+    def _fan_out(self, now: float):
+        """Вызывает подписчиков, для которых наступила граница периода"""
+        with self._lock:
+            due = []
+            for period in list(self._subscriptions):
+                # Отключённые сессии и удалённые компоненты отписываем
+                subs = [sub for sub in self._subscriptions[period] if sub.alive]
+                if not subs:
+                    del self._subscriptions[period]
+                    continue
+                self._subscriptions[period] = subs
+
+                slot = math.floor(now / period)
+                for sub in subs:
+                    if sub.slot != slot:
+                        sub.slot = slot
+                        due.append(sub)
+
+        for subscription in due:
+            callback = subscription.callback
+            if callback is None:
+                continue
+            try:
+                result = callback(now)
+                if inspect.isawaitable(result):
+                    asyncio.ensure_future(result)
+                self.deliveries += 1
+            except Exception as e:
+                print(f"[Ticker] Ошибка подписчика: {e}")
+
+
+_ticker: Optional[Ticker] = None
+_ticker_lock = threading.Lock()
+
+
+def get_ticker() -> Ticker:
+    """Возвращает общий таймер процесса"""
+    global _ticker
+    if _ticker is None:
+        with _ticker_lock:
+            if _ticker is None:
+                _ticker = Ticker()
+    return _ticker
@@ -0,0 +1,224 @@
+# ui/helpers/tracing.py
+import asyncio
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import flet as ft
+
+from ui.helpers.catalog_export import export_dir
+from ui.helpers.connection_probe import percentile
+from ui.helpers.loop_monitor import get_loop_monitor
+from ui.helpers.render_scheduler import get_render_scheduler
+from ui.helpers.update_meter import get_update_meter
+
+# Трассировка включается переменной окружения (читается при импорте):
+# без неё декоратор traced только отмечает текущий обработчик
+TRACE_ENABLED = os.environ.get("FLETAPP_TRACE", "").strip().lower() in ("1", "true", "yes", "on")
+
+# Сколько последних спанов хранится в кольцевом буфере
+DEFAULT_TRACE_BUFFER = 5000
+
+# Перцентили в сводке по обработчикам
+TRACE_PERCENTILES = (0.5, 0.95, 0.99)
+
+
+class Tracer:
+    """
+    Трассировка обработчиков событий интерфейса
+
+    Каждый вызов обёрнутого обработчика — спан: имя обработчика, время
+    выполнения на Python, число пакетов обновлений, отправленных клиенту,
+    и их размер. Пакеты считает UpdateMeter; они приписываются всем
+    открытым спанам сессии (вложенный обработчик входит и во внешний).
+
+    Обработчики отмечают изменения через планировщик отрисовки, и
+    отправка происходит уже после их возврата, поэтому спан закрывается
+    после ближайшей отправки планировщика. Закрытые спаны хранятся в
+    кольцевом буфере ограниченного размера.
+
+    Args:
+        capacity: Размер буфера (по умолчанию FLETAPP_TRACE_BUFFER)
+    """
+
+    def __init__(self, capacity: int = None):
+        capacity = capacity or int(os.environ.get("FLETAPP_TRACE_BUFFER") or DEFAULT_TRACE_BUFFER)
+        self.spans: "deque[Dict[str, Any]]" = deque(maxlen=max(1, capacity))
+        self._lock = threading.Lock()
+        # Открытые спаны по сессиям
+        self._open: Dict[str, List[Dict[str, Any]]] = {}
+        get_update_meter().add_listener(self._on_patch)
+
+    def start(self, name: str, page: Optional[ft.Page]) -> Dict[str, Any]:
+        """Открывает спан обработчика name на странице page"""
+        session = page.session_id if page is not None else None
+        span = {
+            'name': name,
+            'session': session,
+            'ts': time.time(),
+            'duration_ms': 0.0,
+            'updates': 0,
+            'bytes': 0,
+            '_page': page,
+            '_started': time.perf_counter(),
+        }
+        if page is not None:
+            get_update_meter().install(page)
+            with self._lock:
+                self._open.setdefault(session, []).append(span)
+        return span
+
+    def finish(self, span: Dict[str, Any], error: Optional[BaseException] = None):
+        """Фиксирует время спана и закрывает его после ближайшей отправки"""
+        span['duration_ms'] = (time.perf_counter() - span.pop('_started')) * 1000
+        if error is not None:
+            span['error'] = type(error).__name__
+        page = span.pop('_page')
+        if page is None:
+            self._close(span)
+            return
+        get_render_scheduler(page).after_flush(lambda: self._close(span))
+
+    def _close(self, span: Dict[str, Any]):
+        with self._lock:
+            spans = self._open.get(span['session'])
+            if spans is not None:
+                spans[:] = [open_span for open_span in spans if open_span is not span]
+                if not spans:
+                    del self._open[span['session']]
+            self.spans.append(span)
+
+    def _on_patch(self, session_id: str, patch: Dict[str, Any]):
+        """Приписывает отправленный пакет открытым спанам сессии"""
+        if not self._open.get(session_id):
+            return
+        with self._lock:
+            for span in self._open.get(session_id, ()):
+                span['updates'] += 1
+                span['bytes'] += patch['bytes']
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Копия закрытых спанов (от старых к новым)"""
+        with self._lock:
+            return list(self.spans)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Сводка по обработчикам
+
+        Returns:
+            Словари name, count, p50/p95/p99/max (мс), updates и bytes
+            (в среднем на вызов) в порядке первого появления обработчика
+        """
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for span in self.snapshot():
+            groups.setdefault(span['name'], []).append(span)
+
+        rows = []
+        for name, spans in groups.items():
+            durations = sorted(span['duration_ms'] for span in spans)
+            row = {'name': name, 'count': len(spans)}
+            for fraction in TRACE_PERCENTILES:
+                row[f"p{round(fraction * 100)}"] = percentile(durations, fraction)
+            row['max'] = durations[-1]
+            row['updates'] = sum(span['updates'] for span in spans) / len(spans)
+            row['bytes'] = sum(span['bytes'] for span in spans) / len(spans)
+            rows.append(row)
+        return rows
+
+    def clear(self):
+        """Очищает буфер спанов"""
+        with self._lock:
+            self.spans.clear()
+
+    def dump_jsonl(self, path: Optional[Path] = None) -> Path:
+        """
+        Записывает спаны в файл JSONL (по спану на строку)
+
+        Args:
+            path: Путь к файлу (по умолчанию trace-<время>.jsonl в export_dir())
+
+        Returns:
+            Путь к записанному файлу
+        """
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = Path(path) if path else export_dir() / f"trace-{stamp}.jsonl"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for span in self.snapshot():
+                f.write(json.dumps(span, ensure_ascii=False) + "\n")
+        return path
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Возвращает общий трассировщик процесса"""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer()
+    return _tracer
+
+
+def traced(name: str = None) -> Callable[[Callable], Callable]:
+    """
+    Декоратор обработчика событий
+
+    Обработчик всегда отмечается в мониторе задержки цикла событий как
+    текущий (это дёшево). С FLETAPP_TRACE каждый вызов ещё и записывается
+    спаном. Работает с обычными методами и корутинами компонентов, у
+    которых есть self.page; для корутин время спана — до их завершения,
+    включая ожидания.
+
+    Args:
+        name: Имя обработчика (по умолчанию Класс.метод)
+    """
+    def decorate(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+        monitor = get_loop_monitor()
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                run = monitor.enter(span_name)
+                span = get_tracer().start(span_name, getattr(self, 'page', None)) \
+                    if TRACE_ENABLED else None
+                error = None
+                try:
+                    return await func(self, *args, **kwargs)
+                except BaseException as e:
+                    error = e
+                    raise
+                finally:
+                    monitor.exit(run)
+                    if span is not None:
+                        get_tracer().finish(span, error)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            run = monitor.enter(span_name)
+            span = get_tracer().start(span_name, getattr(self, 'page', None)) \
+                if TRACE_ENABLED else None
+            error = None
+            try:
+                return func(self, *args, **kwargs)
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                monitor.exit(run)
+                if span is not None:
+                    get_tracer().finish(span, error)
+        return wrapper
+    return decorate
@@ -0,0 +1,295 @@
+# ui/helpers/update_meter.py
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+import flet as ft
+from flet.core.protocol import CommandEncoder
+
+# За сколько последних секунд считается скорость отправки сессии
+RATE_WINDOW = 10
+
+# Сколько последних минутных сводок хранится
+ROLLUP_MINUTES = 60
+
+# Имя для команд, контрол которых не найден (например, уже удалён)
+UNKNOWN_COMPONENT = "?"
+
+_encode = CommandEncoder(separators=(",", ":")).encode
+
+# Обработчик пакета: listener(session_id, patch)
+PatchListener = Callable[[str, Dict[str, Any]], None]
+
+
+def count_controls(command) -> int:
+    """Число контролов, которых касается команда"""
+    if command.name == "add":
+        # Вложенные команды — по одной на каждый добавленный контрол
+        return len(command.commands)
+    if command.name == "set":
+        return 1
+    if command.name == "remove":
+        return len(command.values)
+    return 0
+
+
+def command_uid(command) -> Optional[str]:
+    """uid контрола, которого касается команда (для add — контейнера)"""
+    if command.name == "add":
+        return command.attrs.get("to")
+    if command.name in ("set", "remove") and command.values:
+        return command.values[0]
+    return None
+
+
+def component_name(control: Optional[ft.Control]) -> str:
+    """
+    Компонент приложения, которому принадлежит контрол
+
+    Ближайший предок (или сам контрол), класс которого объявлен в пакете
+    ui (Footer, Sidebar, IconsView, ...); для контролов вне компонентов —
+    "Page".
+    """
+    node = control
+    while node is not None:
+        if isinstance(node, ft.Page):
+            return "Page"
+        if type(node).__module__.startswith("ui."):
+            return type(node).__name__
+        node = node.parent
+    return UNKNOWN_COMPONENT
+
+
+def _trim_window(recent: "deque[tuple]", horizon: float):
+    """Отбрасывает из окна пакеты, отправленные раньше horizon"""
+    while recent and recent[0][0] < horizon:
+        recent.popleft()
+
+
+class UpdateMeter:
+    """
+    Счётчик стоимости обновлений, отправляемых клиенту
+
+    Для каждого пакета (page.update(), control.update(), page.add(), ...)
+    измеряются время построения патча (обход дерева и сборка команд),
+    сериализованный размер и число затронутых контролов. Каждая команда
+    приписывается компоненту, которому принадлежит её контрол, так что
+    один пакет планировщика отрисовки делится между Footer, Sidebar и
+    представлением пропорционально их командам.
+
+    Стоимость сворачивается по минутам (последние ROLLUP_MINUTES), а
+    скорость отправки каждой сессии — в байтах в секунду за RATE_WINDOW.
+
+    Счётчик подключается к странице через install(): оборачиваются
+    построение патча страницы и send_commands её соединения.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._listeners: List[PatchListener] = []
+        # Страницы по сессиям: соединение веб-сервера общее для всех вкладок
+        self._pages: "weakref.WeakValueDictionary[str, ft.Page]" = weakref.WeakValueDictionary()
+
+        # Минутные сводки: {'minute', 'sessions': {session: bytes}, 'components': {...}}
+        self.minutes: "deque[Dict[str, Any]]" = deque(maxlen=ROLLUP_MINUTES)
+        # Последние пакеты сессий для скорости отправки: (время, байты)
+        self._recent: Dict[str, "deque[tuple]"] = {}
+        # Когда в следующий раз убирать окна закрытых и затихших сессий
+        self._next_sweep = 0.0
+
+        # Статистика
+        self.patches = 0
+
+    def add_listener(self, listener: PatchListener):
+        """Подписывает обработчик на каждый отправленный пакет"""
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def install(self, page: ft.Page):
+        """Подключает счётчик к странице и её соединению (повторно — ничего не делает)"""
+        with self._lock:
+            self._pages[page.session_id] = page
+        if getattr(page, "_fletapp_meter", None) is not self:
+            page._fletapp_meter = self
+            # Построение патча — приватный метод Page; без него время не измеряется
+            prepare_update = getattr(page, "_Page__prepare_update", None)
+            if prepare_update is not None:
+                def metered_prepare_update(*controls):
+                    started = time.perf_counter()
+                    result = prepare_update(*controls)
+                    self._local.prepared = ((time.perf_counter() - started) * 1000, result[1])
+                    return result
+                page._Page__prepare_update = metered_prepare_update
+
+        conn = page.connection
+        if conn is None or getattr(conn, "_fletapp_meter", None) is self:
+            return
+        send_commands = conn.send_commands
+
+        def metered_send_commands(session_id, commands):
+            result = send_commands(session_id, commands)
+            self._on_send(session_id, commands)
+            return result
+
+        conn.send_commands = metered_send_commands
+        conn._fletapp_meter = self
+
+    def _on_send(self, session_id: str, commands):
+        """Раскладывает отправленный пакет по компонентам"""
+        # Патч строится и отправляется в одном потоке под замком страницы
+        produce_ms, added_controls = getattr(self._local, "prepared", None) or (None, ())
+        self._local.prepared = None
+        if not commands:
+            return
+
+        # Соединение может быть общим для сессий — индекс берётся у страницы сессии
+        page = self._pages.get(session_id)
+        index = page.index if page is not None else {}
+
+        components: Dict[str, Dict[str, int]] = {}
+        total_bytes = 0
+        total_controls = 0
+        added = 0
+        for command in commands:
+            size = len(_encode(command).encode("utf-8"))
+            controls = count_controls(command)
+            if command.name == "add" and added < len(added_controls):
+                # Добавленные контролы идут подряд, по одному на вложенную команду
+                owner = added_controls[added]
+                added += controls
+            else:
+                owner = index.get(command_uid(command))
+            stats = components.setdefault(component_name(owner), {'bytes': 0, 'controls': 0})
+            stats['bytes'] += size
+            stats['controls'] += controls
+            total_bytes += size
+            total_controls += controls
+
+        patch = {
+            'bytes': total_bytes,
+            'controls': total_controls,
+            'produce_ms': produce_ms,
+            'components': components,
+        }
+        self._record(session_id, patch)
+        for listener in list(self._listeners):
+            try:
+                listener(session_id, patch)
+            except Exception as e:
+                print(f"[UpdateMeter] Ошибка обработчика: {e}")
+
+    def _record(self, session_id: str, patch: Dict[str, Any]):
+        """Добавляет пакет в минутную сводку и окно скорости"""
+        now = time.time()
+        minute = int(now // 60) * 60
+        with self._lock:
+            self.patches += 1
+            if not self.minutes or self.minutes[-1]['minute'] != minute:
+                self.minutes.append({'minute': minute, 'sessions': {}, 'components': {}})
+            rollup = self.minutes[-1]
+            rollup['sessions'][session_id] = rollup['sessions'].get(session_id, 0) + patch['bytes']
+
+            total = patch['bytes'] or 1
+            for name, stats in patch['components'].items():
+                component = rollup['components'].setdefault(
+                    name, {'patches': 0, 'bytes': 0, 'controls': 0, 'produce_ms': 0.0}
+                )
+                component['patches'] += 1
+                component['bytes'] += stats['bytes']
+                component['controls'] += stats['controls']
+                # Время построения делится между компонентами по размеру их команд
+                if patch['produce_ms'] is not None:
+                    component['produce_ms'] += patch['produce_ms'] * stats['bytes'] / total
+
+            recent = self._recent.setdefault(session_id, deque())
+            recent.append((now, patch['bytes']))
+            _trim_window(recent, now - RATE_WINDOW)
+            if now >= self._next_sweep:
+                self._sweep_recent(now)
+
+    def _sweep_recent(self, now: float):
+        """
+        Убирает устаревшие пакеты всех сессий (вызывается под замком)
+
+        Окна закрытых сессий и сессий, которые дольше RATE_WINDOW ничего
+        не получали, удаляются целиком. Проход по всем сессиям делается
+        не чаще раза в RATE_WINDOW секунд.
+        """
+        horizon = now - RATE_WINDOW
+        for session_id in list(self._recent):
+            page = self._pages.get(session_id)
+            recent = self._recent[session_id]
+            _trim_window(recent, horizon)
+            if not recent or page is None or page.connection is None:
+                del self._recent[session_id]
+        self._next_sweep = now + RATE_WINDOW
+
+    def bytes_per_second(self) -> Dict[str, float]:
+        """Скорость отправки каждой сессии (байт/с) за последние RATE_WINDOW секунд"""
+        with self._lock:
+            self._sweep_recent(time.time())
+            return {
+                session_id: sum(size for _, size in recent) / RATE_WINDOW
+                for session_id, recent in self._recent.items()
+            }
+
+    def rollups(self) -> List[Dict[str, Any]]:
+        """Копия минутных сводок (от старых к новым)"""
+        with self._lock:
+            return [
+                {
+                    'minute': rollup['minute'],
+                    'sessions': dict(rollup['sessions']),
+                    'components': {name: dict(stats) for name, stats in rollup['components'].items()},
+                }
+                for rollup in self.minutes
+            ]
+
+    def component_stats(self, minutes: int = 1) -> List[Dict[str, Any]]:
+        """
+        Стоимость отправки по компонентам за последние minutes минут
+
+        Returns:
+            Словари component, patches, bytes, controls, produce_ms и
+            bytes_per_second (средняя за период) по убыванию bytes
+        """
+        minutes = max(1, minutes)
+        now = time.time()
+        current_minute = int(now // 60) * 60
+        # Сводки есть только для минут с отправками — период берётся по часам
+        since = current_minute - (minutes - 1) * 60
+
+        totals: Dict[str, Dict[str, Any]] = {}
+        for rollup in self.rollups():
+            if rollup['minute'] < since:
+                continue
+            for name, stats in rollup['components'].items():
+                total = totals.setdefault(
+                    name, {'component': name, 'patches': 0, 'bytes': 0, 'controls': 0, 'produce_ms': 0.0}
+                )
+                for key in ('patches', 'bytes', 'controls', 'produce_ms'):
+                    total[key] += stats[key]
+
+        # Текущая минута ещё идёт — период считается до текущего момента
+        seconds = (minutes - 1) * 60 + max(1.0, now - current_minute)
+        for total in totals.values():
+            total['bytes_per_second'] = total['bytes'] / seconds
+        return sorted(totals.values(), key=lambda total: total['bytes'], reverse=True)
+
+
+_meter: Optional[UpdateMeter] = None
+_meter_lock = threading.Lock()
+
+
+def get_update_meter() -> UpdateMeter:
+    """Возвращает общий счётчик обновлений процесса"""
+    global _meter
+    if _meter is None:
+        with _meter_lock:
+            if _meter is None:
+                _meter = UpdateMeter()
+    return _meter
@@ -1,6 +1,7 @@
 # ui/layouts/appbar.py
 import flet as ft
 from flet.core.alert_dialog import AlertDialog
+from ui.helpers.tracing import traced
 
 
 class CustomAppBar(ft.Container):
@@ -104,6 +105,7 @@ class CustomAppBar(ft.Container):
             spacing=10,  # Расстояние между элементами
         )
 
+    @traced()
     def _handle_theme(self, e: ft.ControlEvent):
         self.page.theme_mode = "light" if self.page.theme_mode == "dark" else "dark"
         if self.page.theme_mode == "dark":
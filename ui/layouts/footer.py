@@ -2,13 +2,34 @@
 import flet as ft
 from datetime import datetime
 import asyncio
+import os
 from typing import Optional
+from ui.helpers.connection_probe import get_connection_probe
+from ui.helpers.loop_monitor import get_loop_monitor
+from ui.helpers.render_scheduler import mark_dirty
+from ui.helpers.ticker import TickerSubscription, get_ticker
+
+# Точность часов: период обновления в секундах и формат времени
+CLOCK_RESOLUTIONS = {
+    "seconds": (1, "%d/%m/%Y %H:%M:%S"),
+    "minutes": (60, "%d/%m/%Y %H:%M"),
+}
+
+# Как часто футер сверяется с результатами проверки подключения (секунды).
+# Сама проверка идёт в ConnectionProbe по своему расписанию
+STATUS_REFRESH_PERIOD = 1
 
 
 class Footer(ft.Container):
     """Футер приложения с информацией о версии, дате и статусе подключения"""
 
-    def __init__(self, page: ft.Page = None):
+    def __init__(self, page: ft.Page = None, clock_resolution: str = None):
+        """
+        Args:
+            page: Страница Flet
+            clock_resolution: Точность часов: "seconds" или "minutes"
+                (по умолчанию FLETAPP_CLOCK_RESOLUTION или "seconds")
+        """
         super().__init__()
         self.page = page
         self.height = 40
@@ -19,25 +40,38 @@ class Footer(ft.Container):
         # Статус подключения
         self._is_connected = True
         self._connection_last_check = datetime.now()
+        # Версия состояния проверки, уже показанная в футере
+        self._probe_version = 0
+        # Версия состояния монитора задержки цикла событий, уже показанная в футере
+        self._lag_version = 0
 
-        # Асинхронные задачи
-        self._update_time_task: Optional[asyncio.Task] = None
+        # Подписки на общий таймер процесса
+        self._clock_subscription: Optional[TickerSubscription] = None
+        self._monitor_subscription: Optional[TickerSubscription] = None
+
+        # Задача ручной проверки подключения
         self._check_task: Optional[asyncio.Task] = None
-        self._monitor_task: Optional[asyncio.Task] = None
 
         # Ссылки на элементы UI
         self.connection_status_text: Optional[ft.Text] = None
+        self.lag_status_text: Optional[ft.Text] = None
         self.connection_status_dot: Optional[ft.Container] = None
         self.time_display_text: Optional[ft.Text] = None
         self.version_text: Optional[ft.Text] = None
 
+        # Часы
+        self.clock_resolution = "seconds"
+        self.set_clock_resolution(
+            clock_resolution or os.environ.get("FLETAPP_CLOCK_RESOLUTION", "seconds")
+        )
+
         # Инициализация UI
         self.init_ui()
 
     def init_ui(self):
         """Инициализация интерфейса футера"""
         current_year = datetime.now().year
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
+        current_time = self._format_time()
 
         # Индикатор статуса подключения
         self.connection_status_dot = ft.Container(
@@ -45,12 +79,12 @@ class Footer(ft.Container):
             height=10,
             border_radius=5,
             bgcolor=ft.Colors.GREEN_500,
-            tooltip="Статус подключения\nКликните для проверки",
+            tooltip=self._probe_tooltip(get_connection_probe()),
             on_click=self._manual_connection_check,
         )
 
         self.connection_status_text = ft.Text(
-            value="Online",
+            value="Онлайн",
             size=12,
             color=ft.Colors.GREEN_700,
             weight=ft.FontWeight.W_400,
@@ -58,6 +92,17 @@ class Footer(ft.Container):
             no_wrap=True,
         )
 
+        # Перегрузка цикла событий (видна, пока монитор задержки в состоянии degraded)
+        self.lag_status_text = ft.Text(
+            value="Перегрузка",
+            size=12,
+            color=ft.Colors.ORANGE_700,
+            weight=ft.FontWeight.W_500,
+            font_family="Roboto",
+            no_wrap=True,
+            visible=False,
+        )
+
         # Время и дата
         self.time_display_text = ft.Text(
             value=current_time,
@@ -81,6 +126,7 @@ class Footer(ft.Container):
             controls=[
                 self.connection_status_dot,
                 self.connection_status_text,
+                self.lag_status_text,
             ],
             spacing=5,
             vertical_alignment=ft.CrossAxisAlignment.CENTER,
@@ -133,59 +179,138 @@ class Footer(ft.Container):
             self.page.run_task(self.start_background_tasks)
 
     async def start_background_tasks(self):
-        """Запуск фоновых задач"""
-        # Запускаем обновление времени
-        self._update_time_task = asyncio.create_task(self._update_time_loop())
-        # Запускаем мониторинг подключения
-        self._monitor_task = asyncio.create_task(self._connection_monitor_loop())
-
-    async def _update_time_loop(self):
-        """Цикл обновления времени"""
-        while True:
-            try:
-                current_time = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-                if self.time_display_text:
-                    self.time_display_text.value = current_time
-                    if self.page:
-                        self.page.update()
-                await asyncio.sleep(1)
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                print(f"[Footer] Ошибка обновления времени: {e}")
-                break
+        """Подписка на общий таймер: часы и мониторинг подключения"""
+        self._cancel_subscriptions()
+        ticker = get_ticker()
+        period, _ = CLOCK_RESOLUTIONS[self.clock_resolution]
+        self._clock_subscription = ticker.subscribe(self._on_clock_tick, period, page=self.page)
+        self._monitor_subscription = ticker.subscribe(
+            self._on_monitor_tick, STATUS_REFRESH_PERIOD, page=self.page
+        )
 
-    async def _connection_monitor_loop(self):
-        """Мониторинг подключения (имитация)"""
-        import random
+        # Проверка подключения и замер задержки цикла событий общие для процесса
+        # и работают, пока открыта хоть одна сессия
+        if self.page:
+            get_connection_probe().watch(self.page)
+            get_loop_monitor().watch(self.page)
+
+    def _cancel_subscriptions(self):
+        """Отписывается от общего таймера"""
+        for subscription in (self._clock_subscription, self._monitor_subscription):
+            if subscription:
+                subscription.cancel()
+        self._clock_subscription = None
+        self._monitor_subscription = None
+
+    def set_clock_resolution(self, resolution: str):
+        """
+        Установить точность часов
 
-        while True:
-            try:
-                await asyncio.sleep(30)  # Проверка каждые 30 секунд
+        Args:
+            resolution: "seconds" — обновление каждую секунду,
+                "minutes" — только часы и минуты, обновление раз в минуту
+        """
+        if resolution not in CLOCK_RESOLUTIONS:
+            print(f"[Footer] Неизвестная точность часов: {resolution}")
+            return
+        self.clock_resolution = resolution
+        if self.time_display_text:
+            self._show_time()
+
+        # Переподписываемся на таймер с новым периодом
+        if self._clock_subscription:
+            self._clock_subscription.cancel()
+            period, _ = CLOCK_RESOLUTIONS[resolution]
+            self._clock_subscription = get_ticker().subscribe(
+                self._on_clock_tick, period, page=self.page
+            )
+
+    def _format_time(self) -> str:
+        """Текущее время в формате выбранной точности"""
+        _, time_format = CLOCK_RESOLUTIONS[self.clock_resolution]
+        return datetime.now().strftime(time_format)
+
+    def _show_time(self):
+        """Обновляет текст часов, если он изменился (в диф уходит только он)"""
+        current_time = self._format_time()
+        if self.time_display_text.value != current_time:
+            self.time_display_text.value = current_time
+            mark_dirty(self.page, self.time_display_text)
+
+    def _on_clock_tick(self, now: float):
+        """Тик общего таймера на границе секунды или минуты"""
+        if self.time_display_text:
+            self._show_time()
+
+    def _on_monitor_tick(self, now: float):
+        """Показывает новый результат проверки подключения и задержки цикла событий"""
+        if get_connection_probe().version != self._probe_version:
+            self._show_probe_status()
+        if get_loop_monitor().version != self._lag_version:
+            self._show_lag_status()
+
+    def _show_lag_status(self):
+        """Показывает или скрывает отметку перегрузки цикла событий"""
+        monitor = get_loop_monitor()
+        self._lag_version = monitor.version
+        if not self.lag_status_text:
+            return
+        self.lag_status_text.visible = monitor.degraded
+        self.lag_status_text.tooltip = self._lag_tooltip(monitor)
+        mark_dirty(self.page, self.lag_status_text)
+
+    @staticmethod
+    def _lag_tooltip(monitor) -> str:
+        """Подсказка отметки перегрузки: последняя задержка, обработчик, перцентили"""
+        lines = [f"Цикл событий не успевает: задержка выше {monitor.threshold_ms:.0f} мс"]
+        if monitor.last_stall:
+            stall = monitor.last_stall
+            lines.append(f"Последняя: {stall['lag_ms']:.0f} мс, "
+                         f"обработчик: {stall['handler'] or 'неизвестен'}")
+        percentiles = monitor.lag_percentiles()
+        if percentiles:
+            p50, p95, p99 = percentiles
+            lines.append(f"Задержка: p50 {p50:.0f} мс, p95 {p95:.0f} мс, p99 {p99:.0f} мс")
+        return "\n".join(lines)
+
+    def _show_probe_status(self):
+        """Отображает состояние и задержки общей проверки подключения"""
+        probe = get_connection_probe()
+        self._probe_version = probe.version
+        if probe.is_up is None:
+            return
 
-                # Имитация случайных сбоев подключения (10% вероятность)
-                if random.random() < 0.1:
-                    self.set_connection_status(False, "Соединение потеряно")
-                    await asyncio.sleep(5)
-                    self.set_connection_status(True, "Соединение восстановлено")
+        if probe.is_up:
+            self.set_connection_status(True, "Онлайн")
+        else:
+            self.set_connection_status(False, "Офлайн")
 
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                print(f"[Footer] Ошибка мониторинга подключения: {e}")
-                break
+        if self.connection_status_dot:
+            self.connection_status_dot.tooltip = self._probe_tooltip(probe)
+
+    @staticmethod
+    def _probe_tooltip(probe) -> str:
+        """Подсказка индикатора: адрес, задержки p50/p95 и последняя ошибка"""
+        lines = [f"Статус подключения: {probe.target}"]
+        percentiles = probe.latency_percentiles()
+        if percentiles:
+            p50, p95 = percentiles
+            lines.append(f"Задержка: p50 {p50:.0f} мс, p95 {p95:.0f} мс "
+                         f"(последние {len(probe.latencies)})")
+        if probe.last_error:
+            lines.append(f"Ошибка: {probe.last_error}")
+        if probe.enabled:
+            lines.append("Кликните для проверки")
+        return "\n".join(lines)
 
     def _manual_connection_check(self, e):
         """Ручная проверка подключения"""
-        if self.page:
+        # Без FLETAPP_PROBE_URL проверять нечего: статус — подключение самой сессии
+        if self.page and get_connection_probe().enabled:
             self.page.run_task(self._async_manual_connection_check)
 
     async def _async_manual_connection_check(self):
         """Асинхронная ручная проверка подключения"""
-        # Если уже идет проверка, не запускаем новую
-        if self._check_task and not self._check_task.done():
-            return
-
         # Показываем состояние проверки
         self._update_connection_ui(
             ft.Colors.YELLOW_500,
@@ -194,26 +319,19 @@ class Footer(ft.Container):
         )
 
         try:
-            # Создаем задачу проверки
-            self._check_task = asyncio.create_task(self._perform_connection_check())
+            # Одновременные клики (и вкладки) ждут одну общую проверку
+            self._check_task = asyncio.ensure_future(self._perform_connection_check())
             await self._check_task
+        except asyncio.CancelledError:
+            pass
         except Exception as ex:
             print(f"[Footer] Ошибка проверки подключения: {ex}")
             self.set_connection_status(False, "Ошибка проверки")
 
     async def _perform_connection_check(self):
         """Выполнение проверки подключения"""
-        try:
-            # Имитация проверки сети (задержка 1-2 секунды)
-            await asyncio.sleep(1.5)
-
-            # В реальном приложении здесь была бы проверка сети
-            # Для демонстрации всегда возвращаем успех
-            self.set_connection_status(True, "Онлайн ✓")
-
-        except Exception as ex:
-            print(f"[Footer] Ошибка проверки подключения: {ex}")
-            self.set_connection_status(False, "Ошибка проверки")
+        await get_connection_probe().check()
+        self._show_probe_status()
 
     def _update_connection_ui(self, dot_color, message, text_color):
         """Обновление UI статуса подключения"""
@@ -226,8 +344,7 @@ class Footer(ft.Container):
 
         self._connection_last_check = datetime.now()
 
-        if self.page:
-            self.page.update()
+        mark_dirty(self.page, self.connection_status_dot, self.connection_status_text)
 
     def set_connection_status(self, is_connected: bool, message: str = None):
         """
@@ -281,8 +398,7 @@ class Footer(ft.Container):
         """
         if self.version_text:
             self.version_text.value = version
-            if self.page:
-                self.page.update()
+            mark_dirty(self.page, self.version_text)
 
     def get_version(self) -> str:
         """
@@ -297,24 +413,17 @@ class Footer(ft.Container):
 
     async def dispose(self):
         """Очистка ресурсов при удалении футера"""
-        # Отменяем все задачи
-        tasks_to_cancel = [
-            self._update_time_task,
-            self._monitor_task,
-            self._check_task
-        ]
-
-        for task in tasks_to_cancel:
-            if task and not task.done():
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
-
-        # Обнуляем ссылки на задачи
-        self._update_time_task = None
-        self._monitor_task = None
+        # Отписываемся от общего таймера
+        self._cancel_subscriptions()
+
+        # Отменяем ручную проверку подключения
+        task = self._check_task
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
         self._check_task = None
 
     def will_unmount(self):
@@ -1,5 +1,7 @@
 # ui/layouts/sidebar.py
 import flet as ft
+from ui.helpers.render_scheduler import interaction, mark_dirty
+from ui.helpers.tracing import traced
 
 
 class Sidebar(ft.Container):
@@ -136,6 +138,7 @@ class Sidebar(ft.Container):
 
         return menu_container
 
+    @traced()
     def _handle_menu_click(self, route: str):
         """
         Обработчик клика по элементу меню
@@ -143,17 +146,19 @@ class Sidebar(ft.Container):
         Args:
             route: Идентификатор маршрута
         """
-        # Запоминаем предыдущий активный маршрут
-        old_route = self.current_route
+        # Все изменения клика отправляются одним обновлением
+        with interaction(self.page, f"navigate:{route}"):
+            # Запоминаем предыдущий активный маршрут
+            old_route = self.current_route
 
-        # Устанавливаем новый активный маршрут
-        self.current_route = route
+            # Устанавливаем новый активный маршрут
+            self.current_route = route
 
-        # Обновляем визуальные стили кнопок
-        self._update_active_state(old_route, route)
+            # Обновляем визуальные стили кнопок
+            self._update_active_state(old_route, route)
 
-        # Вызываем функцию навигации
-        self.on_navigate(route)
+            # Вызываем функцию навигации
+            self.on_navigate(route)
 
     def _update_active_state(self, old_route: str, new_route: str):
         """
@@ -163,6 +168,7 @@ class Sidebar(ft.Container):
             old_route: Предыдущий активный маршрут
             new_route: Новый активный маршрут
         """
+        changed = []
 
         # 1. Сбрасываем стили для старого активного элемента
         if old_route in self.menu_items and old_route != "logout":
@@ -175,8 +181,7 @@ class Sidebar(ft.Container):
             item['icon'].color = self._get_icon_color(False, False)
             item['text'].color = self._get_text_color(False, False)
             item['text'].weight = ft.FontWeight.NORMAL
-            # Применяем изменения
-            item['container'].update()
+            changed.append(item['container'])
 
         # 2. Применяем активные стили для нового элемента (кроме logout)
         if new_route in self.menu_items and new_route != "logout":
@@ -189,8 +194,10 @@ class Sidebar(ft.Container):
             item['icon'].color = self._get_icon_color(False, True)
             item['text'].color = self._get_text_color(False, True)
             item['text'].weight = ft.FontWeight.BOLD
-            # Применяем изменения
-            item['container'].update()
+            changed.append(item['container'])
+
+        # Оба элемента уйдут одним обновлением вместе с остальными изменениями
+        mark_dirty(self.page, *changed)
 
     # ВСПОМОГАТЕЛЬНЫЕ МЕТОДЫ ДЛЯ УПРАВЛЕНИЯ СТИЛЯМИ
 
@@ -1,21 +1,48 @@
 # ui/main_app.py
 import flet as ft
 import asyncio
+from collections import OrderedDict
+from typing import Any, Dict
 from ui.views.dashboard import DashboardView
 from ui.views.settings import SettingsView
 from ui.views.colors import ColorsView
 from ui.views.icons import IconsView
+from ui.views.performance import PerformanceView
 from ui.layouts.appbar import CustomAppBar
 from ui.layouts.sidebar import Sidebar
 from ui.layouts.footer import Footer
+from ui.helpers.render_scheduler import interaction, mark_dirty
+from ui.helpers.tracing import TRACE_ENABLED, traced
+from ui.helpers.update_meter import get_update_meter
 
 
 class FletApp(ft.Container):
-    def __init__(self, page: ft.Page):
+    # Фабрики представлений: создаются при первом переходе на маршрут
+    VIEW_FACTORIES = {
+        "dashboard": DashboardView,
+        "settings": SettingsView,
+        "colors": ColorsView,
+        "icons": IconsView,
+        # Скрытый маршрут (нет в сайдбаре): открывается по Ctrl+Shift+P
+        "performance": PerformanceView,
+    }
+
+    def __init__(self, page: ft.Page, max_cached_views: int = 3):
+        """
+        Args:
+            page: Страница Flet
+            max_cached_views: Сколько созданных представлений держать в памяти
+        """
         super().__init__()
         self.page = page
         self.expand = True
 
+        # Кэш представлений (LRU) и сохранённое состояние вытесненных
+        self.max_cached_views = max(1, max_cached_views)
+        self.views: "OrderedDict[str, ft.Control]" = OrderedDict()
+        self.view_states: Dict[str, Dict[str, Any]] = {}
+        self.current_route = "dashboard"
+
         # Инициализация страницы
         self.setup_page()
 
@@ -32,20 +59,17 @@ class FletApp(ft.Container):
         self.page.window_min_height = 600
         self.page.window_width = 1200
         self.page.window_height = 800
+        self.page.on_keyboard_event = self.on_keyboard
+
+        # Стоимость обновлений по компонентам (страница Ctrl+Shift+P)
+        if TRACE_ENABLED:
+            get_update_meter().install(self.page)
 
     def init_ui(self):
         """Инициализация интерфейса"""
 
-        # Создаём представления и передаём page
-        self.views = {
-            "dashboard": DashboardView(page=self.page),
-            "settings": SettingsView(page=self.page),
-            "colors": ColorsView(page=self.page),
-            "icons": IconsView(page=self.page)
-        }
-
-        # Текущее активное представление
-        self.current_view = self.views["dashboard"]
+        # Текущее активное представление (остальные создаются при переходе)
+        self.current_view = self.get_view(self.current_route)
 
         # Создаём компоненты
         self.appbar = CustomAppBar(page=self.page)
@@ -99,15 +123,59 @@ class FletApp(ft.Container):
             spacing=0,
         )
 
+    def get_view(self, route: str) -> ft.Control:
+        """
+        Возвращает представление маршрута, создавая его при необходимости
+
+        Давно не используемые представления вытесняются из кэша; от них
+        остаётся только лёгкое состояние (поиск, страница, категория),
+        из которого представление восстанавливается при следующем переходе.
+        """
+        view = self.views.get(route)
+        if view is not None:
+            self.views.move_to_end(route)
+            return view
+
+        view = self.VIEW_FACTORIES[route](page=self.page)
+        state = self.view_states.pop(route, None)
+        if state and hasattr(view, 'restore_state'):
+            view.restore_state(state)
+
+        self.views[route] = view
+        self.evict_views(keep=route)
+        return view
+
+    def evict_views(self, keep: str = None):
+        """Вытесняет самые давние представления сверх лимита кэша"""
+        for route in list(self.views):
+            if len(self.views) <= self.max_cached_views:
+                break
+            view = self.views[route]
+            # Запрошенное и текущее (на экране) представления не трогаем
+            if route == keep or view is self.current_view:
+                continue
+            if hasattr(view, 'get_state'):
+                self.view_states[route] = view.get_state()
+            del self.views[route]
+
+    @traced()
     def on_navigate(self, route: str):
         """Обработчик навигации"""
-        if route in self.views:
-            # Обновляем активный маршрут в сайдбаре
-            self.sidebar.set_active_route(route)
+        if route not in self.VIEW_FACTORIES:
+            # Показать страницу 404
+            self.show_not_found_page()
+            return
 
-            # Создаем новый view
-            old_view = self.current_view
-            self.current_view = self.views[route]
+        # Все изменения перехода уходят клиенту одним обновлением
+        with interaction(self.page, f"navigate:{route}"):
+            # Обновляем активный маршрут в сайдбаре (у скрытых маршрутов пункта
+            # меню нет — подсветка остаётся как была)
+            if route in self.sidebar.menu_items:
+                self.sidebar.set_active_route(route)
+
+            # Берём view из кэша или создаём новый
+            self.current_route = route
+            self.current_view = self.get_view(route)
 
             # Обновляем layout
             self.update_layout()
@@ -125,12 +193,12 @@ class FletApp(ft.Container):
             elif hasattr(self.current_view, 'load_colors'):
                 self.current_view.load_colors()
 
-            # Обновляем страницу
-            if self.page:
-                self.page.update()
-        else:
-            # Показать страницу 404
-            self.show_not_found_page()
+    @traced()
+    def on_keyboard(self, e: ft.KeyboardEvent):
+        """Горячие клавиши: Ctrl+Shift+P — страница производительности"""
+        if e.ctrl and e.shift and e.key.upper() == "P":
+            with interaction(self.page, "navigate:performance"):
+                self.on_navigate("performance")
 
     def update_layout(self):
         """Обновление основного layout"""
@@ -138,6 +206,7 @@ class FletApp(ft.Container):
         content_row = self.content.controls[2]  # Row с sidebar и content
         # content_row.controls[2] это Container с current_view
         content_row.controls[2].content = self.current_view
+        mark_dirty(self.page, content_row.controls[2])
 
     def update_window_title(self, route: str):
         """Обновление заголовка окна в зависимости от маршрута"""
@@ -145,13 +214,15 @@ class FletApp(ft.Container):
             "dashboard": "Панель управления",
             "settings": "Настройки",
             "colors": "Цвета Flet",
-            "icons": "Иконки Flet"
+            "icons": "Иконки Flet",
+            "performance": "Производительность",
         }
 
         title = titles.get(route, "Flet App")
         if self.page:
             self.page.title = f"Flet App - {title}"
-            self.page.update()
+            # Заголовок — свойство страницы, поэтому отмечается вся страница
+            mark_dirty(self.page)
 
     def show_not_found_page(self):
         """Страница 404 с автоматическим редиректом"""
@@ -174,9 +245,7 @@ class FletApp(ft.Container):
         # Устанавливаем временную страницу
         content_row = self.content.controls[2]
         content_row.controls[2].content = not_found_view
-
-        if self.page:
-            self.page.update()
+        mark_dirty(self.page, content_row.controls[2])
 
         # Автоматический редирект через 3 секунды
         async def redirect_to_dashboard():
@@ -211,10 +280,7 @@ class FletApp(ft.Container):
 
     def get_current_view_name(self) -> str:
         """Получить название текущего представления"""
-        for name, view in self.views.items():
-            if view == self.current_view:
-                return name
-        return "unknown"
+        return self.current_route
 
     def refresh_current_view(self):
         """Обновить текущее представление"""
@@ -225,5 +291,4 @@ class FletApp(ft.Container):
         elif hasattr(self.current_view, 'refresh'):
             self.current_view.refresh()
 
-        if self.page:
-            self.page.update()
\ No newline at end of file
+        mark_dirty(self.page, self.current_view)
\ No newline at end of file
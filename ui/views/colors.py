@@ -1,8 +1,32 @@
 # ui/views/colors.py
 import flet as ft
-import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Mapping, Optional, Sequence
 import asyncio
+import threading
+from ui.helpers.color_catalog import ColorCatalog, get_color_catalog
+from ui.helpers.catalog_export import export_preview, export_to_file
+from ui.helpers.color_match import split_color_queries
+from ui.components.export_menu import ExportMenu
+from ui.helpers.render_scheduler import interaction, mark_dirty
+from ui.helpers.tracing import traced
+
+# Сколько карточек создаётся между передачами управления циклу событий
+CARD_CHUNK_SIZE = 64
+
+# Сколько ближайших цветов показывается на каждый введённый цвет
+NEAREST_COUNT = 6
+
+
+class ColorGrid(ft.GridView):
+    """
+    Сетка карточек цветов, изолированная от обновлений предков
+
+    Обновление контейнера темы не обходит карточки: сетка и карточки
+    отправляются только когда их отметили явно.
+    """
+
+    def is_isolated(self):
+        return True
 
 
 class ColorsView(ft.Container):
@@ -14,8 +38,21 @@ class ColorsView(ft.Container):
         self.expand = True
         self.padding = 10
 
-        # Кэш для всех цветов
-        self.all_colors_data: List[Dict[str, Any]] = []
+        # Общий каталог цветов (только для чтения)
+        self.catalog: Optional[ColorCatalog] = None
+        self.all_colors_data: Sequence[Mapping[str, Any]] = ()
+
+        # Карточки по позиции цвета в каталоге и заголовки категорий
+        self.color_cards: List[ft.Container] = []
+        self.category_headers: Dict[str, ft.Container] = {}
+
+        # Результат последнего поиска: запрос, режим и позиции видимых цветов
+        # (None — видны все)
+        self._last_query = ""
+        self._last_nearest = False
+        self._visible_ids: Optional[Sequence[int]] = None
+        # Обработчики on_change выполняются в потоках — поиск по одному
+        self._filter_lock = threading.Lock()
 
         # Флаг для предотвращения многократной инициализации
         self._initialized = False
@@ -52,20 +89,25 @@ class ColorsView(ft.Container):
             tooltip="Переключить светлую/тёмную тему"
         )
 
-        # Кнопка копирования всех цветов
-        self.copy_all_btn = ft.ElevatedButton(
-            "Копировать все",
-            icon=ft.Icons.COPY_ALL,
-            on_click=self.copy_all_colors,
-            tooltip="Скопировать список всех цветов",
-            height=40,
-            style=ft.ButtonStyle(
-                padding={ft.ControlState.DEFAULT: 8}
-            )
+        # Режим "ближайшие цвета": запрос — HEX или R,G,B (несколько через пробел)
+        self.nearest_toggle = ft.Switch(
+            label="Ближайшие",
+            value=False,
+            on_change=self.filter_colors,
+            tooltip="Найти ближайшие цвета Flet к HEX или R,G,B\n"
+                    "(несколько цветов — через пробел или ;)"
+        )
+        self.nearest_panel = ft.Column(spacing=4, visible=False)
+
+        # Экспорт цветов (с учётом поиска): файл или начало списка в буфер
+        self.export_menu = ExportMenu(
+            on_save=self.export_colors,
+            on_copy=self.copy_all_colors,
+            tooltip="Экспорт цветов (с учётом поиска)",
         )
 
         # Сетка цветов
-        self.colors_grid = ft.GridView(
+        self.colors_grid = ColorGrid(
             expand=True,
             runs_count=5,
             max_extent=100,
@@ -74,6 +116,16 @@ class ColorsView(ft.Container):
             run_spacing=4
         )
 
+        # Карточки берут цвета из токенов темы (SURFACE, ON_SURFACE), поэтому
+        # переключение режима — смена theme_mode одного контейнера
+        self.grid_theme_container = ft.Container(
+            content=self.colors_grid,
+            theme_mode=self._grid_theme_mode(),
+            bgcolor=ft.Colors.SURFACE,
+            padding=ft.padding.only(top=10),
+            expand=True,
+        )
+
         # Основной контент
         self.content = ft.Column(
             controls=[
@@ -96,22 +148,20 @@ class ColorsView(ft.Container):
                             controls=[
                                 self.search_field,
                                 ft.Container(width=10),
+                                self.nearest_toggle,
                                 self.theme_toggle,
                                 ft.Container(width=10),
-                                self.copy_all_btn
+                                self.export_menu
                             ],
                             vertical_alignment=ft.CrossAxisAlignment.CENTER,
                             spacing=8
                         ),
+                        self.nearest_panel,
                     ]),
                     padding=ft.padding.only(bottom=10)
                 ),
                 ft.Divider(height=1),
-                ft.Container(
-                    content=self.colors_grid,
-                    padding=ft.padding.only(top=10),
-                    expand=True,
-                )
+                self.grid_theme_container,
             ],
             scroll=ft.ScrollMode.AUTO,
             expand=True,
@@ -123,6 +173,25 @@ class ColorsView(ft.Container):
         if not self._initialized and self.page:
             self.page.run_task(self.load_colors_async)
 
+    def get_state(self) -> Dict[str, Any]:
+        """Лёгкое состояние представления (для восстановления после вытеснения)"""
+        return {
+            'search': self.search_field.value or "",
+            'dark': bool(self.theme_toggle.value),
+            'nearest': bool(self.nearest_toggle.value),
+        }
+
+    def restore_state(self, state: Dict[str, Any]):
+        """Восстанавливает состояние до загрузки цветов"""
+        self.search_field.value = state.get('search', "")
+        self.theme_toggle.value = state.get('dark', False)
+        self.nearest_toggle.value = state.get('nearest', False)
+        self.grid_theme_container.theme_mode = self._grid_theme_mode()
+
+    def _grid_theme_mode(self) -> ft.ThemeMode:
+        """Режим темы сетки по переключателю"""
+        return ft.ThemeMode.DARK if self.theme_toggle.value else ft.ThemeMode.LIGHT
+
     async def load_colors_async(self):
         """Асинхронная загрузка цветов"""
         if self._loading:
@@ -137,138 +206,97 @@ class ColorsView(ft.Container):
 
     async def _load_colors_task(self):
         """Задача загрузки цветов"""
-        # Получаем цвета
-        colors_data = await self._get_colors_data()
-        categorized = self._categorize_colors(colors_data)
+        # Каталог строится один раз на процесс и уже сгруппирован по категориям
+        self.catalog = get_color_catalog()
+        self.all_colors_data = self.catalog.colors
+        # Индекс поиска строим при загрузке, а не на первом нажатии клавиши
+        self.catalog.warm()
 
         # Очищаем сетку
         self.colors_grid.controls.clear()
-        self.all_colors_data.clear()
+        self.color_cards = []
+        self.category_headers = {}
+        self._last_query = ""
+        self._last_nearest = False
+        self._visible_ids = None
+        created = 0
 
         # Заполняем сетку
-        for category_name, colors in categorized.items():
+        for category_name, colors in self.catalog.categories.items():
             if not colors:
                 continue
 
             # Заголовок категории
-            self.colors_grid.controls.append(
-                ft.Container(
-                    content=ft.Text(
-                        category_name,
-                        size=14,
-                        weight=ft.FontWeight.BOLD,
-                        color=(ft.Colors.GREY_300 if self.theme_toggle.value
-                               else ft.Colors.GREY_700)
-                    ),
-                    padding=ft.padding.only(top=15, bottom=5, left=2),
-                    col=7
-                )
+            header = ft.Container(
+                content=ft.Text(
+                    category_name,
+                    size=14,
+                    weight=ft.FontWeight.BOLD,
+                    color=ft.Colors.ON_SURFACE_VARIANT
+                ),
+                padding=ft.padding.only(top=15, bottom=5, left=2),
+                col=7
             )
+            self.category_headers[category_name] = header
+            self.colors_grid.controls.append(header)
 
-            # Карточки цветов
+            # Карточки цветов (в порядке каталога)
             for color_data in colors:
                 card = self._create_color_card(color_data)
                 self.colors_grid.controls.append(card)
-                self.all_colors_data.append(color_data)
-
-        # Безопасное обновление только этого компонента
-        self.update()
-
-    async def _get_colors_data(self) -> List[Dict[str, Any]]:
-        """Асинхронно получает данные цветов"""
-        colors = []
-
-        # Получаем всех членов перечисления ft.Colors
-        for color_name, color_enum in ft.Colors.__members__.items():
-            colors.append({
-                'name': color_name,
-                'value': color_enum.value,
-                'object': color_enum,
-                'display_value': f"ft.Colors.{color_name}"
-            })
-
-            # Даем возможность другим задачам работать
-            await asyncio.sleep(0)
-
-        return colors
-
-    def _categorize_colors(self, colors_data: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
-        """Категоризирует цвета по типам"""
-        categories = {
-            "Основные цвета": [],
-            "Material Design": [],
-            "Системные цвета": [],
-            "Оттенки серого": [],
-            "Прочие": []
-        }
+                self.color_cards.append(card)
 
-        patterns = {
-            "Основные цвета": [
-                'RED', 'PINK', 'PURPLE', 'DEEP_PURPLE', 'INDIGO', 'BLUE',
-                'LIGHT_BLUE', 'CYAN', 'TEAL', 'GREEN', 'LIGHT_GREEN', 'LIME',
-                'YELLOW', 'AMBER', 'ORANGE', 'DEEP_ORANGE', 'BROWN', 'BLUE_GREY'
-            ],
-            "Оттенки серого": ['GREY', 'BLACK', 'WHITE']
-        }
-
-        for color in colors_data:
-            name = color['name']
-
-            if any(p in name for p in patterns["Основные цвета"]):
-                categories["Основные цвета"].append(color)
-            elif '_' in name and re.search(r'_\d+$', name):
-                categories["Material Design"].append(color)
-            elif any(p in name for p in patterns["Оттенки серого"]):
-                categories["Оттенки серого"].append(color)
-            elif re.search(r'(PRIMARY|SECONDARY|TERTIARY|ERROR|SURFACE|BACKGROUND|ON)', name):
-                categories["Системные цвета"].append(color)
-            else:
-                categories["Прочие"].append(color)
-
-        # Сортируем внутри категорий по имени
-        for cat in categories:
-            categories[cat].sort(key=lambda x: x['name'])
-
-        return categories
-
-    def _get_contrast_color_for_block(self, color_enum) -> ft.Colors:
-        """Возвращает контрастный цвет (BLACK или WHITE) для заданного цвета."""
-        color_name = color_enum.name
+                # Даём поработать другим задачам, но не после каждой карточки
+                created += 1
+                if created % CARD_CHUNK_SIZE == 0:
+                    await asyncio.sleep(0)
 
-        # Светлые цвета (черный текст)
-        if color_name in ['WHITE', 'TRANSPARENT']:
-            return ft.Colors.BLACK
+        # Восстановленный поиск применяем до отправки, одним обновлением
+        if self.search_field.value:
+            self._apply_search()
 
-        # Цвета с суффиксами _50, _100, _200, _300, _400
-        if re.search(r'_(50|100|200|300|400)$', color_name):
-            return ft.Colors.BLACK
-
-        # Некоторые основные светлые цвета
-        if color_name in ['YELLOW', 'AMBER', 'LIME']:
-            return ft.Colors.BLACK
-
-        # Оттенки серого до 400
-        if color_name.startswith('GREY_'):
-            num_part = color_name.split('_')[1]
-            if num_part.isdigit() and int(num_part) <= 400:
-                return ft.Colors.BLACK
-
-        # По умолчанию белый текст
-        return ft.Colors.WHITE
+        # Обновление только этого компонента (сетка изолирована и отмечается
+        # отдельно); если пользователь ушёл со страницы, пока цвета
+        # загружались, планировщик их пропустит
+        mark_dirty(self.page, self, self.colors_grid)
 
     def _create_color_card(self, color_data: Dict[str, Any]) -> ft.Container:
         """Создаёт карточку для отображения цвета"""
         name = color_data['name']
         obj = color_data['object']
         display_value = color_data['display_value']
-
-        # Контрастный цвет для иконки
-        icon_color = self._get_contrast_color_for_block(obj)
-
-        # Цвет для текста на фоне карточки
-        text_color = ft.Colors.BLACK if not self.theme_toggle.value else ft.Colors.WHITE
-
-        bg_color = ft.Colors.GREY_900 if self.theme_toggle.value else ft.Colors.WHITE
+        hex_code = color_data['hex']
+        contrast = color_data['contrast']
+
+        # Информация о цвете: название и (для цветов с HEX) контраст WCAG
+        info = [
+            ft.Text(
+                name.replace('_', ' ').title(),
+                size=12,
+                weight=ft.FontWeight.BOLD,
+                color=ft.Colors.ON_SURFACE,
+                max_lines=1,
+                overflow=ft.TextOverflow.ELLIPSIS,
+                text_align=ft.TextAlign.CENTER
+            ),
+        ]
+        if contrast:
+            # Контраст с белым (○) и чёрным (●) и уровни WCAG — одной строкой
+            info.append(ft.Text(
+                f"○ {contrast['on_white']:.1f} {contrast['white_level']}"
+                f"  ● {contrast['on_black']:.1f} {contrast['black_level']}",
+                size=9,
+                color=ft.Colors.ON_SURFACE_VARIANT,
+                max_lines=1,
+                text_align=ft.TextAlign.CENTER
+            ))
+
+        tooltip = f"Кликните чтобы скопировать\n{display_value}"
+        if hex_code:
+            tooltip += f"\n{hex_code}"
+        if contrast:
+            tooltip += (f"\nКонтраст с белым {contrast['on_white']:.2f}:1,"
+                        f" с чёрным {contrast['on_black']:.2f}:1")
 
         return ft.Container(
             content=ft.Column(
@@ -280,28 +308,19 @@ class ColorsView(ft.Container):
                         expand=True,
                         on_click=lambda e: self._copy_color(display_value),
                         ink=True,
-                        tooltip=f"Кликните чтобы скопировать\n{display_value}",
+                        tooltip=tooltip,
                         alignment=ft.alignment.center,
                         content=ft.Icon(
                             ft.Icons.CONTENT_COPY,
-                            color=icon_color,
+                            color=color_data['text_color'],
                             size=20,
                             opacity=0.4
                         )
                     ),
                     # Информация о цвете
                     ft.Container(
-                        content=ft.Column([
-                            ft.Text(
-                                name.replace('_', ' ').title(),
-                                size=12,
-                                weight=ft.FontWeight.BOLD,
-                                color=text_color,
-                                max_lines=1,
-                                overflow=ft.TextOverflow.ELLIPSIS,
-                                text_align=ft.TextAlign.CENTER
-                            ),
-                        ], spacing=0, tight=True),
+                        content=ft.Column(info, spacing=2, tight=True,
+                                          horizontal_alignment=ft.CrossAxisAlignment.CENTER),
                         padding=ft.padding.all(2)
                     )
                 ],
@@ -309,7 +328,7 @@ class ColorsView(ft.Container):
                 tight=True,
                 horizontal_alignment=ft.CrossAxisAlignment.CENTER
             ),
-            bgcolor=bg_color,
+            bgcolor=ft.Colors.SURFACE_CONTAINER_HIGHEST,
             data=color_data
         )
 
@@ -329,70 +348,162 @@ class ColorsView(ft.Container):
         except Exception as e:
             self._show_snackbar(f"Ошибка копирования: {str(e)}")
 
+    def export_records(self) -> Sequence[Mapping[str, Any]]:
+        """Цвета для экспорта: результат поиска или весь каталог"""
+        catalog = self.catalog or get_color_catalog()
+        if self._visible_ids is None:
+            return catalog.colors
+        return [catalog.colors[color_id] for color_id in self._visible_ids]
+
+    async def export_colors(self, fmt: str):
+        """Сохраняет цвета в файл (запись идёт в отдельном потоке)"""
+        records = self.export_records()
+        label = "filtered" if self._visible_ids is not None else None
+        try:
+            path = await export_to_file(records, "colors", fmt, label=label)
+            self._show_snackbar(f"Сохранено цветов: {len(records)} → {path}")
+        except (OSError, ValueError) as e:
+            self._show_snackbar(f"Ошибка экспорта: {e}")
+
     def copy_all_colors(self, e):
-        """Копирует список всех цветов в буфер обмена"""
+        """Копирует начало выгрузки цветов (модуль .py) в буфер обмена"""
         try:
-            colors_text = "Палитра цветов Flet:\n\n"
-            for color in self.all_colors_data:
-                colors_text += f"{color['display_value']}  # {color['value']}\n"
+            colors_text, truncated = export_preview(self.export_records(), "colors", "py")
+            message = ("Скопировано начало списка — полный список через «Сохранить»"
+                       if truncated else "Цвета скопированы!")
 
             if self.page:
                 self.page.set_clipboard(colors_text)
-                self._show_snackbar("Все цвета скопированы!")
+                self._show_snackbar(message)
             else:
                 try:
                     import pyperclip
                     pyperclip.copy(colors_text)
-                    self._show_snackbar("Все цвета скопированы!")
+                    self._show_snackbar(message)
                 except ImportError:
                     self._show_snackbar("pyperclip не установлен")
         except Exception as e:
             self._show_snackbar(f"Ошибка: {str(e)}")
 
+    @traced()
     def filter_colors(self, e):
         """Фильтрует цвета по поисковому запросу"""
-        query = self.search_field.value.lower().strip()
-
-        for control in self.colors_grid.controls:
-            if hasattr(control, 'data') and control.data:
-                # Карточка цвета
-                name = control.data['name'].lower()
-                value = control.data['value'].lower()
-                display_value = control.data['display_value'].lower()
-                searchable = f"{name} {value} {display_value}".lower()
-
-                control.visible = query in searchable
-            else:
-                # Заголовок категории
-                control.visible = True
-
-        self.update()
+        # В обновление попадают только карточки и заголовки, сменившие видимость
+        with interaction(self.page, "colors:search"):
+            with self._filter_lock:
+                changed = self._apply_search()
+            if changed:
+                mark_dirty(self.page, *changed)
+
+    def _apply_search(self) -> List[ft.Control]:
+        """
+        Скрывает карточки, не подходящие под поисковый запрос
+
+        Returns:
+            Карточки и заголовки, у которых изменилась видимость
+        """
+        if not self.catalog or not self.color_cards:
+            return []
+
+        query = (self.search_field.value or "").lower().strip()
+        nearest = bool(self.nearest_toggle.value)
+        if query == self._last_query and nearest == self._last_nearest:
+            return []
+
+        changed: List[ft.Control] = []
+        if not query:
+            visible_ids = None
+        elif nearest:
+            visible_ids = self._search_nearest(query)
+        elif (not self._last_nearest and self._last_query
+              and self._last_query in query and self._visible_ids is not None):
+            # Уточнение ("bl" -> "blu"): ищем только среди прошлых совпадений
+            visible_ids = self.catalog.search(query, within=self._visible_ids)
+        else:
+            visible_ids = self.catalog.search(query)
+
+        # Панель ближайших цветов видна только в своём режиме
+        if not (nearest and query) and self.nearest_panel.visible:
+            self.nearest_panel.visible = False
+            self.nearest_panel.controls.clear()
+        if nearest and query or self._last_nearest and self._last_query:
+            changed.append(self.nearest_panel)
+
+        all_ids = range(len(self.color_cards))
+        old_visible = set(all_ids if self._visible_ids is None else self._visible_ids)
+        new_visible = set(all_ids if visible_ids is None else visible_ids)
+        self._last_query = query
+        self._last_nearest = nearest
+        self._visible_ids = visible_ids
+
+        # Меняем только карточки, чья видимость изменилась
+        for color_id in old_visible ^ new_visible:
+            card = self.color_cards[color_id]
+            card.visible = color_id in new_visible
+            changed.append(card)
+
+        # Заголовок категории без совпадений сворачивается
+        colors = self.catalog.colors
+        shown_categories = {colors[color_id]['category'] for color_id in new_visible}
+        for category_name, header in self.category_headers.items():
+            header_visible = category_name in shown_categories
+            if header.visible != header_visible:
+                header.visible = header_visible
+                changed.append(header)
+
+        return changed
+
+    def _search_nearest(self, query: str) -> List[int]:
+        """
+        Ищет ближайшие цвета к каждому введённому цвету и заполняет панель
+
+        Returns:
+            Позиции найденных цветов в каталоге
+        """
+        queries = split_color_queries(query)
+        results = self.catalog.nearest_index.nearest_many(queries, NEAREST_COUNT)
+
+        rows = []
+        found = set()
+        for text, matches in zip(queries, results):
+            if not matches:
+                rows.append(ft.Text(f"{text}: введите HEX или R,G,B", size=12,
+                                    color=ft.Colors.ERROR))
+                continue
+            chips = []
+            for match in matches:
+                names = ", ".join(color['name'] for color in match['colors'])
+                found.update(self.catalog.hex_ids(match['hex']))
+                chips.append(ft.Container(
+                    content=ft.Text(f"{names}  ΔE {match['distance'] * 100:.1f}", size=11,
+                                    color=match['colors'][0]['text_color']),
+                    bgcolor=match['hex'],
+                    padding=ft.padding.symmetric(horizontal=6, vertical=2),
+                    border_radius=4,
+                    tooltip=f"{match['hex']}\n{names}",
+                ))
+            rows.append(ft.Row([
+                ft.Text(text, size=12, weight=ft.FontWeight.BOLD, width=110),
+                *chips,
+            ], spacing=4, wrap=True))
+
+        self.nearest_panel.controls = rows
+        self.nearest_panel.visible = True
+        return sorted(found)
 
     def clear_search(self, e):
         """Очищает поле поиска"""
         self.search_field.value = ""
+        mark_dirty(self.page, self.search_field)
         self.filter_colors(e)
 
+    @traced()
     def toggle_background(self, e):
         """Переключает тему фона"""
-        bg = ft.Colors.GREY_900 if self.theme_toggle.value else ft.Colors.WHITE
-        text_color = ft.Colors.GREY_300 if self.theme_toggle.value else ft.Colors.GREY_700
-
-        for control in self.colors_grid.controls:
-            if hasattr(control, 'bgcolor'):
-                control.bgcolor = bg
-
-            # Обновляем цвет текста в заголовках
-            if hasattr(control, 'content'):
-                content = control.content
-                if isinstance(content, ft.Text) and hasattr(content, 'color'):
-                    content.color = text_color
-                elif hasattr(content, 'controls'):
-                    for item in content.controls:
-                        if isinstance(item, ft.Text) and hasattr(item, 'color'):
-                            item.color = text_color
-
-        self.update()
+        # Карточки не меняются: они берут цвета из темы контейнера
+        with interaction(self.page, "colors:theme"):
+            self.grid_theme_container.theme_mode = self._grid_theme_mode()
+            mark_dirty(self.page, self.grid_theme_container)
 
     def _show_snackbar(self, message: str):
         """Показывает SnackBar с сообщением"""
@@ -403,14 +514,11 @@ class ColorsView(ft.Container):
             )
             self.page.snack_bar = snackbar
             snackbar.open = True
-            if not self.page.disposed:
-                self.page.update()
+            mark_dirty(self.page)
         else:
             print(f"[Snackbar] {message}")
 
-    def get_color_by_name(self, name: str) -> Optional[Dict[str, Any]]:
-        """Поиск цвета по имени"""
-        for color in self.all_colors_data:
-            if color['name'].lower() == name.lower():
-                return color
-        return None
\ No newline at end of file
+    def get_color_by_name(self, name: str) -> Optional[Mapping[str, Any]]:
+        """Поиск цвета по имени, значению Flet или HEX"""
+        catalog = self.catalog or get_color_catalog()
+        return catalog.lookup(name)
\ No newline at end of file
@@ -1,7 +1,13 @@
 # ui/views/icons.py
 import flet as ft
 import asyncio
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Any, Dict, Optional, Mapping, Sequence
+from ui.helpers.catalog_export import export_preview, export_to_file
+from ui.helpers.icon_catalog import IconCatalog, get_icon_catalog
+from ui.components.export_menu import ExportMenu
+from ui.components.virtual_grid import VirtualGrid
+from ui.helpers.render_scheduler import interaction, mark_dirty
+from ui.helpers.tracing import traced
 
 
 class IconsView(ft.Container):
@@ -13,10 +19,11 @@ class IconsView(ft.Container):
         self.expand = True
         self.padding = 10
 
-        # Данные
-        self.all_icons_data: List[Dict[str, Any]] = []
-        self.displayed_icons: List[Dict[str, Any]] = []
-        self.categories: Dict[str, List[str]] = {}
+        # Данные (общий каталог, только для чтения)
+        self.catalog: Optional[IconCatalog] = None
+        self.all_icons_data: Sequence[Mapping[str, Any]] = ()
+        self.displayed_icons: Sequence[Mapping[str, Any]] = ()
+        self.categories: Mapping[str, Sequence[str]] = {}
 
         # Для debounce фильтрации
         self.filter_task: Optional[asyncio.Task] = None
@@ -27,10 +34,22 @@ class IconsView(ft.Container):
         self.page_size = 60
         self.is_loading = False
 
+        # Режим "Показать все": виртуализированная сетка вместо страниц
+        self.virtual_mode = False
+
+        # Изменение размера иконок: применяется только последнее значение слайдера
+        self.resize_task: Optional[asyncio.Task] = None
+        self.pending_icon_size: Optional[int] = None
+        self.resize_interval = 0.05
+
         # Фильтры
         self.current_category = "Все"
         self.current_search = ""
 
+        # Ранжированный поиск с допуском опечаток
+        self.ranked_search = False
+        self.ranked_limit = 120
+
         # Инициализация UI
         self.init_ui()
 
@@ -64,6 +83,14 @@ class IconsView(ft.Container):
             on_change=self.filter_by_category,
         )
 
+        # Режим поиска по релевантности
+        self.ranked_switch = ft.Switch(
+            label="По релевантности",
+            value=self.ranked_search,
+            on_change=self.toggle_ranked_search,
+            tooltip="Нечёткий поиск: учитывает опечатки и сортирует по совпадению",
+        )
+
         # Переключатель размера
         self.size_slider = ft.Slider(
             min=24,
@@ -78,6 +105,13 @@ class IconsView(ft.Container):
         # Информация о количестве
         self.stats_text = ft.Text("", size=12)
 
+        # Экспорт иконок (с учётом фильтров): файл или начало списка в буфер
+        self.export_menu = ExportMenu(
+            on_save=self.export_icons,
+            on_copy=self.copy_export_preview,
+            tooltip="Экспорт иконок (с учётом фильтров)",
+        )
+
         # Заголовок страницы
         self.header_text = ft.Text(
             "🖼️ Иконки Flet",
@@ -95,6 +129,19 @@ class IconsView(ft.Container):
             run_spacing=5,
         )
 
+        # Виртуализированная сетка для просмотра всего каталога
+        self.virtual_grid = VirtualGrid(
+            create_item=lambda: self.create_icon_card(size=int(self.size_slider.value)),
+            bind_item=lambda card, icon_data: self.bind_icon_card(
+                card, icon_data, int(self.size_slider.value)
+            ),
+            columns=self.get_runs_count(),
+            row_height=self.get_card_height(),
+            spacing=5,
+            viewport_height=self.get_viewport_height(),
+            expand=True,
+        )
+
         # Кнопки пагинации
         self.page_text = ft.Text("Страница 1", size=12)
         self.pagination_row = ft.Row(
@@ -114,7 +161,7 @@ class IconsView(ft.Container):
                 ft.TextButton(
                     "Показать все",
                     on_click=self.show_all,
-                    tooltip="Показать все иконки (может замедлить работу)"
+                    tooltip="Показать все иконки с прокруткой"
                 ),
             ],
             alignment=ft.MainAxisAlignment.CENTER,
@@ -128,6 +175,13 @@ class IconsView(ft.Container):
             visible=False
         )
 
+        # Контейнер сетки: страницы или виртуализированный список
+        self.grid_container = ft.Container(
+            content=self.icons_grid,
+            padding=ft.padding.only(top=10),
+            expand=True,
+        )
+
         # Собираем интерфейс
         self.content = ft.Column(
             controls=[
@@ -149,11 +203,14 @@ class IconsView(ft.Container):
                                 ft.Container(width=10),
                                 self.category_dropdown,
                                 ft.Container(width=10),
+                                self.ranked_switch,
+                                ft.Container(width=10),
                                 ft.Column([
                                     ft.Text("Размер:", size=12),
                                     self.size_slider,
                                 ], spacing=0),
                                 ft.Container(width=10),
+                                self.export_menu,
                                 self.loading_indicator,
                             ],
                             vertical_alignment=ft.CrossAxisAlignment.CENTER,
@@ -163,14 +220,10 @@ class IconsView(ft.Container):
                     padding=ft.padding.only(bottom=10)
                 ),
                 ft.Divider(height=1),
-                ft.Container(
-                    content=self.icons_grid,
-                    padding=ft.padding.only(top=10),
-                    expand=True,
-                ),
+                self.grid_container,
                 self.pagination_row
             ],
-            scroll=ft.ScrollMode.AUTO,
+            # Прокручивается сама сетка, а не вся страница
             expand=True,
             spacing=0
         )
@@ -184,90 +237,41 @@ class IconsView(ft.Container):
             return 6
         return max(3, min(8, int(self.page.width / 140)))
 
+    def get_card_height(self) -> int:
+        """Высота карточки в виртуализированной сетке для текущего размера иконок"""
+        # Иконка с отступами + две строки названия + категория
+        return int(self.size_slider.value) + 80
+
+    def get_viewport_height(self) -> float:
+        """Оценка высоты области сетки до первого события прокрутки"""
+        if not self.page or not self.page.height:
+            return 600
+        # Без шапки страницы, панели фильтров и футера
+        return max(200, self.page.height - 260)
+
     def load_icons(self):
         """Загружает все иконки"""
-        self.loading_indicator.visible = True
-        if self.page:
-            self.page.update()
-
+        # Каталог общий и уже построен — индикатор загрузки не нужен
         self.load_all_icons()
 
         # Обновляем статистику
         self.update_stats()
 
-        self.loading_indicator.visible = False
-        if self.page:
-            self.page.update()
-
     def load_all_icons(self):
-        """Загружает иконки из ft.Icons и категоризирует их"""
-        self.all_icons_data.clear()
-        self.categories.clear()
-
-        # Определяем категории
-        category_patterns = {
-            "Навигация": ['ARROW', 'CHEVRON', 'NAVIGATE', 'BACK', 'FORWARD',
-                          'UP', 'DOWN', 'LEFT', 'RIGHT', 'HOME', 'MENU'],
-            "Действия": ['ADD', 'REMOVE', 'DELETE', 'EDIT', 'SAVE', 'CLOSE',
-                         'CHECK', 'CANCEL', 'DOWNLOAD', 'UPLOAD', 'SHARE',
-                         'PRINT', 'SEARCH', 'FILTER', 'SETTINGS'],
-            "Социальные": ['PERSON', 'PEOPLE', 'GROUP', 'ACCOUNT', 'FACE',
-                           'THUMB', 'LIKE', 'HEART', 'STAR', 'COMMENT'],
-            "Файлы и папки": ['FILE', 'FOLDER', 'DOCUMENT', 'IMAGE', 'PHOTO',
-                              'VIDEO', 'MUSIC', 'CLOUD'],
-            "Уведомления": ['NOTIFICATION', 'ALARM', 'WARNING', 'ERROR',
-                            'INFO', 'HELP'],
-            "Коммуникации": ['MAIL', 'EMAIL', 'PHONE', 'MESSAGE', 'CHAT', 'CALL'],
-            "Время": ['TIME', 'DATE', 'CALENDAR', 'CLOCK', 'TIMER', 'HISTORY'],
-            "Карты и места": ['LOCATION', 'MAP', 'PLACE', 'NAVIGATE', 'DIRECTION'],
-            "Разное": ['KEY', 'LOCK', 'UNLOCK', 'VISIBILITY', 'EYE', 'SORT',
-                       'REFRESH', 'CODE', 'LINK', 'ATTACH', 'TAG', 'BOOKMARK',
-                       'FLAG', 'PALETTE', 'COLOR', 'BRIGHTNESS', 'VOLUME',
-                       'MIC', 'CAMERA', 'HEADPHONES', 'BATTERY', 'WIFI',
-                       'NETWORK', 'BLUETOOTH', 'USB', 'HARDWARE', 'DEVICE',
-                       'COMPUTER', 'PHONE', 'TABLET', 'TV', 'WATCH']
-        }
+        """Подключает общий каталог иконок ft.Icons"""
+        # Каталог строится один раз на процесс и не копируется
+        if self.catalog is None:
+            self.catalog = get_icon_catalog()
+            self.all_icons_data = self.catalog.icons
+            self.categories = self.catalog.categories
 
-        # Получаем все атрибуты ft.Icons
-        for attr_name in dir(ft.Icons):
-            if not attr_name.startswith('_') and attr_name.isupper():
-                try:
-                    icon_value = getattr(ft.Icons, attr_name)
-
-                    # Определяем категорию
-                    category = "Разное"
-                    for cat_name, patterns in category_patterns.items():
-                        if any(pattern in attr_name.upper() for pattern in patterns):
-                            category = cat_name
-                            break
-
-                    # Добавляем в данные
-                    icon_data = {
-                        'name': attr_name,
-                        'value': icon_value,
-                        'display_name': attr_name.replace('_', ' ').title(),
-                        'category': category
-                    }
-
-                    self.all_icons_data.append(icon_data)
-
-                    # Добавляем в категорию
-                    if category not in self.categories:
-                        self.categories[category] = []
-                    self.categories[category].append(attr_name)
-
-                except:
-                    continue
-
-        # Сортируем по имени
-        self.all_icons_data.sort(key=lambda x: x['name'])
+            # Обновляем выпадающий список категорий
+            self.update_category_dropdown()
 
-        # Обновляем выпадающий список категорий
-        self.update_category_dropdown()
-
-        # Для начала показываем только первую страницу
-        self.displayed_icons = self.all_icons_data.copy()
-        self.load_page(0)
+        # При повторном показе сохраняем фильтры и страницу
+        self.displayed_icons = self.filter_icons()
+        last_page = max(0, (len(self.displayed_icons) - 1) // self.page_size)
+        self.load_page(min(self.current_page, last_page))
 
     def update_category_dropdown(self):
         """Обновляет список категорий в выпадающем меню"""
@@ -276,12 +280,9 @@ class IconsView(ft.Container):
             ft.dropdown.Option("Все")
         ]
 
-        # Добавляем категории в алфавитном порядке
-        for category in sorted(self.categories.keys()):
-            count = len(self.categories[category])
-            self.category_dropdown.options.append(
-                ft.dropdown.Option(f"{category} ({count})")
-            )
+        # Добавляем категории в алфавитном порядке (подписи со счётчиками из каталога)
+        for option in self.catalog.category_options:
+            self.category_dropdown.options.append(ft.dropdown.Option(option))
 
     def load_page(self, page_num: int):
         """Загружает конкретную страницу"""
@@ -290,8 +291,14 @@ class IconsView(ft.Container):
 
         self.current_page = page_num
 
+        if self.virtual_mode:
+            self.load_virtual_grid()
+            return
+
+        self.grid_container.content = self.icons_grid
+
         # Вычисляем какие иконки показывать
-        if self.page_size > 0 and len(self.displayed_icons) > self.page_size:
+        if len(self.displayed_icons) > self.page_size:
             start_idx = page_num * self.page_size
             end_idx = min(start_idx + self.page_size, len(self.displayed_icons))
             page_icons = self.displayed_icons[start_idx:end_idx]
@@ -306,38 +313,66 @@ class IconsView(ft.Container):
             # Обновляем кнопки
             self.pagination_row.controls[0].disabled = (page_num == 0)
             self.pagination_row.controls[2].disabled = (page_num >= total_pages - 1)
+            self.pagination_row.controls[3].text = "Показать все"
         else:
             # Показываем все иконки
             page_icons = self.displayed_icons
             self.pagination_row.visible = False
 
-        # Очищаем сетку
-        self.icons_grid.controls.clear()
+        # Переиспользуем карточки из пула вместо создания новых
+        self.bind_page_cards(page_icons)
 
-        # Добавляем иконки текущей страницы
+        mark_dirty(self.page, self.grid_container, self.pagination_row)
+
+    def bind_page_cards(self, page_icons: Sequence[Mapping[str, Any]]):
+        """
+        Привязывает карточки сетки к иконкам страницы
+
+        Карточки, созданные для прошлых страниц, остаются в сетке и получают
+        новые данные; лишние скрываются. В обновление попадают только
+        изменившиеся свойства (иконка, тексты, подсказка).
+        """
+        cards = self.icons_grid.controls
         icon_size = int(self.size_slider.value)
 
-        for icon_data in page_icons:
-            card = self.create_icon_card(icon_data, icon_size)
-            self.icons_grid.controls.append(card)
+        # Пул растёт только до размера самой большой страницы
+        while len(cards) < len(page_icons):
+            cards.append(self.create_icon_card(size=icon_size))
 
-        if self.page:
-            self.page.update()
+        for index, card in enumerate(cards):
+            if index < len(page_icons):
+                self.bind_icon_card(card, page_icons[index], icon_size)
+            else:
+                card.visible = False
 
-    def create_icon_card(self, icon_data: Dict[str, Any], size: int = 40):
-        """Создаёт карточку иконки"""
-        name = icon_data['name']
-        icon_value = icon_data['value']
-        display_name = icon_data['display_name']
-        category = icon_data.get('category', 'Разное')
+    def load_virtual_grid(self):
+        """Показывает весь результат в виртуализированной сетке"""
+        self.grid_container.content = self.virtual_grid
+
+        self.virtual_grid.viewport_height = self.get_viewport_height()
+        self.virtual_grid.set_items(
+            self.displayed_icons,
+            columns=self.get_runs_count(),
+            row_height=self.get_card_height(),
+        )
+
+        # Вместо пагинации — переключатель обратно на страницы
+        self.pagination_row.visible = True
+        self.page_text.value = f"Все иконки: {len(self.displayed_icons)}"
+        self.pagination_row.controls[0].disabled = True
+        self.pagination_row.controls[2].disabled = True
+        self.pagination_row.controls[3].text = "По страницам"
+
+        mark_dirty(self.page, self.grid_container, self.pagination_row)
 
-        return ft.Container(
+    def create_icon_card(self, icon_data: Optional[Mapping[str, Any]] = None, size: int = 40):
+        """Создаёт карточку иконки (пустую, если icon_data не передан)"""
+        card = ft.Container(
             content=ft.Column(
                 controls=[
                     # Иконка
                     ft.Container(
                         content=ft.Icon(
-                            icon_value,
                             size=size,
                             color=ft.Colors.BLUE,
                         ),
@@ -347,7 +382,6 @@ class IconsView(ft.Container):
                     # Название
                     ft.Container(
                         content=ft.Text(
-                            display_name,
                             size=10,
                             text_align=ft.TextAlign.CENTER,
                             max_lines=2,
@@ -358,7 +392,6 @@ class IconsView(ft.Container):
                     # Категория (маленькая метка)
                     ft.Container(
                         content=ft.Text(
-                            category,
                             size=8,
                             color=ft.Colors.GREY,
                             text_align=ft.TextAlign.CENTER,
@@ -376,18 +409,49 @@ class IconsView(ft.Container):
             border=ft.border.all(1, ft.Colors.GREY_300),
             border_radius=ft.border_radius.all(8),
             padding=5,
-            on_click=lambda e: self.copy_icon(icon_data),
-            data=icon_data,
-            tooltip=f"Категория: {category}\nft.Icons.{name}",
+            # Один обработчик на все карточки: данные берутся из card.data
+            on_click=self.on_icon_card_click,
             ink=True,
         )
 
+        if icon_data is not None:
+            self.bind_icon_card(card, icon_data, size)
+        return card
+
+    def bind_icon_card(self, card: ft.Container, icon_data: Mapping[str, Any],
+                       size: Optional[int] = None):
+        """Привязывает существующую карточку к данным иконки"""
+        icon_box, name_box, category_box = card.content.controls
+        category = icon_data.get('category', 'Разное')
+        categories = ", ".join(icon_data.get('categories', (category,)))
+
+        icon_box.content.name = icon_data['value']
+        name_box.content.value = icon_data['display_name']
+        category_box.content.value = category
+
+        if size is not None:
+            icon_box.content.size = size
+            icon_box.height = size + 20
+
+        card.tooltip = f"Категория: {categories}\nft.Icons.{icon_data['name']}"
+        card.data = icon_data
+        card.visible = True
+
+    def on_icon_card_click(self, e):
+        """Клик по карточке иконки"""
+        if e.control.data:
+            self.copy_icon(e.control.data)
+
+    @traced()
     async def on_search_change(self, e):
         """Обработчик поиска с debounce"""
         self.current_search = self.search_field.value.strip().lower()
 
-        # Показываем/скрываем кнопку очистки
-        self.search_field.suffix.visible = bool(self.current_search)
+        # Показываем/скрываем кнопку очистки (обновление — только при смене)
+        suffix_visible = bool(self.current_search)
+        if self.search_field.suffix.visible != suffix_visible:
+            self.search_field.suffix.visible = suffix_visible
+            mark_dirty(self.page, self.search_field.suffix)
 
         # Отменяем предыдущую задачу фильтрации
         if self.filter_task and not self.filter_task.done():
@@ -395,7 +459,8 @@ class IconsView(ft.Container):
 
         # Если строка пустая и категория "Все" - сразу загружаем оригинальные данные
         if not self.current_search and self.current_category == "Все":
-            await self.load_original_icons()
+            with interaction(self.page, "icons:search"):
+                await self.load_original_icons()
             return
 
         # Создаем новую задачу с задержкой
@@ -407,63 +472,66 @@ class IconsView(ft.Container):
             # Ждем 300мс перед фильтрацией
             await asyncio.sleep(0.3)
 
-            # Показываем индикатор загрузки
-            self.loading_indicator.visible = True
-            if self.page:
-                self.page.update()
-
-            # Применяем фильтры
-            self.apply_filters()
+            # Поиск по индексу занимает миллисекунды, поэтому индикатор
+            # загрузки не показываем: результат уходит одним обновлением
+            with interaction(self.page, "icons:search"):
+                self.apply_filters()
 
         except asyncio.CancelledError:
             # Задача была отменена
             pass
-        finally:
-            # Скрываем индикатор загрузки
-            self.loading_indicator.visible = False
-            if self.page:
-                self.page.update()
 
-    def apply_filters(self):
-        """Применяет все активные фильтры (категория + поиск)"""
-        # Начинаем со всех иконок
-        filtered = self.all_icons_data.copy()
+    def filter_icons(self):
+        """Возвращает иконки, подходящие под активные фильтры (категория + поиск)"""
+        if not self.current_search and self.current_category == "Все":
+            return self.all_icons_data
 
-        # Фильтрация по категории
+        # Убираем счетчик из названия категории если есть
+        category_name = None
         if self.current_category != "Все":
-            # Убираем счетчик из названия категории если есть
             category_name = self.current_category.split(" (")[0]
-            filtered = [icon for icon in filtered if icon['category'] == category_name]
 
-        # Фильтрация по тексту поиска
-        if self.current_search:
-            filtered = [
-                icon for icon in filtered
-                if self.current_search in icon['name'].lower() or
-                   self.current_search in icon['display_name'].lower()
-            ]
+        if self.ranked_search and self.current_search:
+            # Лучшие совпадения по релевантности, с учётом опечаток
+            return self.catalog.rank(self.current_search, category_name,
+                                     self.ranked_limit)
+        # Поиск по индексу триграмм вместо перебора всех иконок
+        return self.catalog.search(self.current_search, category_name)
 
-        self.displayed_icons = filtered
+    @traced()
+    def apply_filters(self):
+        """Применяет все активные фильтры (категория + поиск)"""
+        self.displayed_icons = self.filter_icons()
         self.current_page = 0
         self.load_page(0)
         self.update_stats()
 
+    @traced()
     async def filter_by_category(self, e):
         """Фильтрация по выбранной категории"""
         self.current_category = self.category_dropdown.value or "Все"
 
-        # Если категория "Все" и нет поиска - загружаем все иконки
-        if self.current_category == "Все" and not self.current_search:
-            await self.load_original_icons()
-        else:
-            # Применяем фильтры
-            self.apply_filters()
+        with interaction(self.page, "icons:category"):
+            # Если категория "Все" и нет поиска - загружаем все иконки
+            if self.current_category == "Все" and not self.current_search:
+                await self.load_original_icons()
+            else:
+                # Применяем фильтры
+                self.apply_filters()
+
+    async def toggle_ranked_search(self, e):
+        """Переключение между точным и ранжированным поиском"""
+        self.ranked_search = bool(self.ranked_switch.value)
+        if self.current_search:
+            with interaction(self.page, "icons:ranked"):
+                self.apply_filters()
 
     async def load_original_icons(self):
         """Загружает оригинальные иконки (без фильтрации)"""
-        self.displayed_icons = self.all_icons_data.copy()
+        self.displayed_icons = self.all_icons_data
         self.current_category = "Все"
         self.category_dropdown.value = "Все"
+        mark_dirty(self.page, self.category_dropdown)
         self.current_page = 0
         self.load_page(0)
         self.update_stats()
@@ -473,36 +541,76 @@ class IconsView(ft.Container):
         self.search_field.value = ""
         self.current_search = ""
         self.search_field.suffix.visible = False
+        mark_dirty(self.page, self.search_field)
 
-        # Если категория "Все" - загружаем все иконки
-        if self.current_category == "Все":
-            await self.load_original_icons()
-        else:
-            # Применяем фильтры (только по категории)
-            self.apply_filters()
+        with interaction(self.page, "icons:search"):
+            # Если категория "Все" - загружаем все иконки
+            if self.current_category == "Все":
+                await self.load_original_icons()
+            else:
+                # Применяем фильтры (только по категории)
+                self.apply_filters()
 
+    @traced()
     async def next_page(self, e):
         """Следующая страница"""
-        if self.page_size > 0:
-            total_pages = max(1, (len(self.displayed_icons) + self.page_size - 1) // self.page_size)
-            if self.current_page < total_pages - 1:
-                self.current_page += 1
+        total_pages = max(1, (len(self.displayed_icons) + self.page_size - 1) // self.page_size)
+        if self.current_page < total_pages - 1:
+            self.current_page += 1
+            with interaction(self.page, "icons:page"):
                 self.load_page(self.current_page)
 
+    @traced()
     async def prev_page(self, e):
         """Предыдущая страница"""
         if self.current_page > 0:
             self.current_page -= 1
-            self.load_page(self.current_page)
+            with interaction(self.page, "icons:page"):
+                self.load_page(self.current_page)
 
+    @traced()
     async def show_all(self, e):
-        """Показать все иконки на одной странице"""
-        self.page_size = 0
-        self.load_page(0)
+        """Переключает просмотр всех иконок с прокруткой и постраничный режим"""
+        self.virtual_mode = not self.virtual_mode
+        with interaction(self.page, "icons:show_all"):
+            self.load_page(0)
+
+    async def change_icon_size(self, e):
+        """Изменение размера иконок (тики слайдера объединяются)"""
+        self.pending_icon_size = int(self.size_slider.value)
 
-    def change_icon_size(self, e):
-        """Изменение размера иконок"""
-        self.load_page(self.current_page)
+        # Уже запланированное применение подхватит последнее значение
+        if self.resize_task and not self.resize_task.done():
+            return
+        self.resize_task = asyncio.create_task(self.apply_icon_size())
+
+    async def apply_icon_size(self):
+        """Применяет последнее значение слайдера к существующим карточкам"""
+        try:
+            applied = None
+            while self.pending_icon_size != applied:
+                # Даём накопиться тикам перетаскивания
+                await asyncio.sleep(self.resize_interval)
+                applied = self.pending_icon_size
+                self.resize_cards(applied)
+        except asyncio.CancelledError:
+            pass
+
+    def resize_cards(self, size: int):
+        """Меняет размер иконок на месте и отправляет одно обновление сетки"""
+        if self.virtual_mode:
+            # Высота строк меняется вместе с размером — перепривязываем окно
+            self.virtual_grid.row_height = self.get_card_height()
+            self.virtual_grid.refresh()
+            grid = self.virtual_grid
+        else:
+            for card in self.icons_grid.controls:
+                icon_box = card.content.controls[0]
+                icon_box.content.size = size
+                icon_box.height = size + 20
+            grid = self.icons_grid
+
+        mark_dirty(self.page, grid)
 
     def update_stats(self):
         """Обновление статистики"""
@@ -514,10 +622,9 @@ class IconsView(ft.Container):
         else:
             self.stats_text.value = f"Показано: {showing} из {total} | Категории: {len(self.categories)}"
 
-        if self.page:
-            self.page.update()
+        mark_dirty(self.page, self.stats_text)
 
-    def copy_icon(self, icon_data: Dict[str, Any]):
+    def copy_icon(self, icon_data: Mapping[str, Any]):
         """Копирует название иконки в буфер обмена"""
         try:
             copy_text = f"ft.Icons.{icon_data['name']}"
@@ -534,6 +641,42 @@ class IconsView(ft.Container):
         except Exception as e:
             self.show_snackbar(f"Ошибка: {str(e)}")
 
+    def export_records(self) -> Sequence[Mapping[str, Any]]:
+        """Иконки для экспорта: результат фильтров или весь каталог"""
+        if not self.all_icons_data:
+            return get_icon_catalog().icons
+        return self.displayed_icons
+
+    async def export_icons(self, fmt: str):
+        """Сохраняет иконки в файл (запись идёт в отдельном потоке)"""
+        records = self.export_records()
+        filtered = len(records) != len(self.all_icons_data)
+        try:
+            path = await export_to_file(records, "icons", fmt,
+                                        label="filtered" if filtered else None)
+            self.show_snackbar(f"Сохранено иконок: {len(records)} → {path}")
+        except (OSError, ValueError) as e:
+            self.show_snackbar(f"Ошибка экспорта: {e}")
+
+    def copy_export_preview(self, e):
+        """Копирует начало выгрузки иконок (модуль .py) в буфер обмена"""
+        try:
+            text, truncated = export_preview(self.export_records(), "icons", "py")
+            message = ("Скопировано начало списка — полный список через «Сохранить»"
+                       if truncated else "Иконки скопированы!")
+            if self.page:
+                self.page.set_clipboard(text)
+                self.show_snackbar(message)
+            else:
+                try:
+                    import pyperclip
+                    pyperclip.copy(text)
+                    self.show_snackbar(message)
+                except ImportError:
+                    self.show_snackbar("pyperclip не установлен")
+        except Exception as e:
+            self.show_snackbar(f"Ошибка: {str(e)}")
+
     def show_snackbar(self, message: str):
         """Показывает SnackBar с сообщением"""
         if self.page:
@@ -543,7 +686,7 @@ class IconsView(ft.Container):
             )
             self.page.snack_bar = snackbar
             snackbar.open = True
-            self.page.update()
+            mark_dirty(self.page)
 
     def did_mount(self):
         """Вызывается после монтирования компонента"""
@@ -563,8 +706,41 @@ class IconsView(ft.Container):
         if old_runs_count != new_runs_count:
             self.icons_grid.runs_count = new_runs_count
             self.load_page(self.current_page)
+        elif self.virtual_mode:
+            # Высота окна могла измениться — пересчитываем видимые строки
+            if self.virtual_grid.set_viewport_height(self.get_viewport_height()):
+                mark_dirty(self.page, self.virtual_grid)
+
+    def get_state(self) -> Dict[str, Any]:
+        """Лёгкое состояние представления (для восстановления после вытеснения)"""
+        return {
+            'search': self.search_field.value or "",
+            'category': self.current_category,
+            'page': self.current_page,
+            'icon_size': int(self.size_slider.value),
+            'ranked': self.ranked_search,
+            'virtual': self.virtual_mode,
+        }
+
+    def restore_state(self, state: Dict[str, Any]):
+        """
+        Восстанавливает состояние до загрузки иконок
+
+        Фильтры и страница применяются при следующем load_icons().
+        """
+        self.search_field.value = state.get('search', "")
+        self.current_search = self.search_field.value.strip().lower()
+        self.current_category = state.get('category', "Все")
+        self.category_dropdown.value = self.current_category
+        self.current_page = state.get('page', 0)
+        self.size_slider.value = state.get('icon_size', self.size_slider.value)
+        self.ranked_search = state.get('ranked', False)
+        self.ranked_switch.value = self.ranked_search
+        self.virtual_mode = state.get('virtual', False)
 
     def will_unmount(self):
         """Очистка ресурсов"""
         if self.filter_task and not self.filter_task.done():
-            self.filter_task.cancel()
\ No newline at end of file
+            self.filter_task.cancel()
+        if self.resize_task and not self.resize_task.done():
+            self.resize_task.cancel()
\ No newline at end of file
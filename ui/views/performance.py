@@ -0,0 +1,266 @@
+# ui/views/performance.py
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import flet as ft
+
+from ui.helpers.loop_monitor import get_loop_monitor
+from ui.helpers.render_scheduler import mark_dirty
+from ui.helpers.tracing import TRACE_ENABLED, get_tracer
+from ui.helpers.update_meter import RATE_WINDOW, get_update_meter
+
+# Колонки сводки: ключ строки Tracer.stats(), заголовок, формат
+TRACE_COLUMNS = (
+    ("name", "Обработчик", "{}"),
+    ("count", "Вызовов", "{:d}"),
+    ("p50", "p50, мс", "{:.2f}"),
+    ("p95", "p95, мс", "{:.2f}"),
+    ("p99", "p99, мс", "{:.2f}"),
+    ("max", "Макс., мс", "{:.2f}"),
+    ("updates", "Отправок", "{:.1f}"),
+    ("bytes", "Байт", "{:,.0f}"),
+)
+
+# Колонки стоимости отправки: ключ строки UpdateMeter.component_stats()
+METER_COLUMNS = (
+    ("component", "Компонент", "{}"),
+    ("patches", "Пакетов", "{:d}"),
+    ("controls", "Контролов", "{:d}"),
+    ("bytes", "Байт", "{:,d}"),
+    ("produce_ms", "Построение, мс", "{:.1f}"),
+    ("bytes_per_second", "Байт/с", "{:,.0f}"),
+)
+
+# Периоды сводки стоимости отправки (минуты)
+METER_PERIODS = (1, 5, 15, 60)
+
+
+class PerformanceView(ft.Container):
+    """
+    Скрытая страница "Производительность" (Ctrl+Shift+P)
+
+    Показывает сводку спанов трассировки по обработчикам: число вызовов,
+    p50/p95/p99 и максимум времени, отправки и байты в среднем на вызов.
+    Таблица сортируется по любой колонке; спаны можно сохранить в JSONL.
+
+    Ниже — стоимость отправки клиенту по компонентам за выбранный период
+    (UpdateMeter), скорость отправки каждой сессии и гистограмма задержки
+    цикла событий (она собирается и без трассировки).
+    """
+
+    def __init__(self, page: ft.Page = None):
+        super().__init__()
+        self.page = page
+        self.expand = True
+        self.padding = 20
+
+        # Сортировка: по p95, сначала самые медленные
+        self.sort_column = 3
+        self.sort_ascending = False
+
+        # Период сводки стоимости отправки (минуты)
+        self.meter_minutes = METER_PERIODS[0]
+
+        self.init_ui()
+
+    def init_ui(self):
+        """Инициализация интерфейса"""
+        self.status_text = ft.Text(size=12, color=ft.Colors.ON_SURFACE_VARIANT)
+        self.lag_text = ft.Text(size=12, color=ft.Colors.ON_SURFACE_VARIANT, selectable=True)
+
+        self.trace_table = ft.DataTable(
+            columns=[
+                ft.DataColumn(
+                    ft.Text(title),
+                    numeric=key != "name",
+                    on_sort=self.on_sort,
+                )
+                for key, title, _ in TRACE_COLUMNS
+            ],
+            sort_column_index=self.sort_column,
+            sort_ascending=self.sort_ascending,
+            column_spacing=24,
+        )
+
+        self.sessions_text = ft.Text(size=12, color=ft.Colors.ON_SURFACE_VARIANT)
+        self.meter_period_dropdown = ft.Dropdown(
+            label="Период",
+            value=str(self.meter_minutes),
+            options=[ft.dropdown.Option(str(minutes), f"{minutes} мин") for minutes in METER_PERIODS],
+            on_change=self.change_meter_period,
+            width=140,
+            dense=True,
+        )
+        self.meter_table = ft.DataTable(
+            columns=[
+                ft.DataColumn(ft.Text(title), numeric=key != "component")
+                for key, title, _ in METER_COLUMNS
+            ],
+            column_spacing=24,
+        )
+
+        self.content = ft.Column(
+            controls=[
+                ft.Row(
+                    controls=[
+                        ft.Text("⏱ Производительность", size=24, weight=ft.FontWeight.BOLD,
+                                expand=True),
+                        ft.IconButton(
+                            icon=ft.Icons.REFRESH,
+                            tooltip="Обновить",
+                            on_click=self.refresh,
+                        ),
+                        ft.IconButton(
+                            icon=ft.Icons.SAVE_ALT,
+                            tooltip="Сохранить спаны в JSONL",
+                            on_click=self.dump_spans,
+                            disabled=not TRACE_ENABLED,
+                        ),
+                        ft.IconButton(
+                            icon=ft.Icons.DELETE_SWEEP,
+                            tooltip="Очистить спаны",
+                            on_click=self.clear_spans,
+                            disabled=not TRACE_ENABLED,
+                        ),
+                    ],
+                ),
+                self.status_text,
+                ft.Divider(height=8),
+                ft.Row([self.trace_table], scroll=ft.ScrollMode.AUTO),
+                ft.Divider(height=24),
+                ft.Row(
+                    controls=[
+                        ft.Text("Отправка клиенту", size=18, weight=ft.FontWeight.BOLD,
+                                expand=True),
+                        self.meter_period_dropdown,
+                    ],
+                ),
+                self.sessions_text,
+                ft.Row([self.meter_table], scroll=ft.ScrollMode.AUTO),
+                ft.Divider(height=24),
+                ft.Text("Задержка цикла событий", size=18, weight=ft.FontWeight.BOLD),
+                self.lag_text,
+            ],
+            scroll=ft.ScrollMode.AUTO,
+            expand=True,
+        )
+        self.show_stats()
+
+    def did_mount(self):
+        """Сводка обновляется при каждом показе страницы"""
+        self.refresh(None)
+
+    def show_stats(self):
+        """Заполняет таблицы сводками трассировщика и счётчика обновлений"""
+        self.show_lag_stats()
+        if not TRACE_ENABLED:
+            self.status_text.value = "Трассировка выключена: запустите приложение с FLETAPP_TRACE=1"
+            self.trace_table.rows = []
+            self.meter_table.rows = []
+            return
+        self.show_trace_stats()
+        self.show_meter_stats()
+
+    def show_trace_stats(self):
+        """Сводка спанов по обработчикам"""
+
+        tracer = get_tracer()
+        rows = self.sorted_rows(tracer.stats())
+        self.status_text.value = (
+            f"Спанов в буфере: {len(tracer.spans)} из {tracer.spans.maxlen}"
+        )
+        self.trace_table.sort_column_index = self.sort_column
+        self.trace_table.sort_ascending = self.sort_ascending
+        self.trace_table.rows = [
+            ft.DataRow(cells=[
+                ft.DataCell(ft.Text(fmt.format(row[key])))
+                for key, _, fmt in TRACE_COLUMNS
+            ])
+            for row in rows
+        ]
+
+    def show_meter_stats(self):
+        """Стоимость отправки по компонентам и скорость отправки сессий"""
+        meter = get_update_meter()
+        rates = meter.bytes_per_second()
+        own_session = self.page.session_id if self.page else None
+        self.sessions_text.value = "Скорость отправки за {} с: {}".format(
+            RATE_WINDOW,
+            ", ".join(
+                f"{session}{' (эта)' if session == own_session else ''} — {rate:,.0f} Б/с"
+                for session, rate in sorted(rates.items(), key=lambda item: -item[1])
+            ) or "нет отправок",
+        )
+        self.meter_table.rows = [
+            ft.DataRow(cells=[
+                ft.DataCell(ft.Text(fmt.format(row[key])))
+                for key, _, fmt in METER_COLUMNS
+            ])
+            for row in meter.component_stats(self.meter_minutes)
+        ]
+
+    def show_lag_stats(self):
+        """Перцентили, гистограмма и последняя перегрузка цикла событий"""
+        monitor = get_loop_monitor()
+        percentiles = monitor.lag_percentiles()
+        if percentiles is None:
+            self.lag_text.value = "Замеров пока нет"
+            return
+        p50, p95, p99 = percentiles
+        lines = [
+            f"Замеров: {monitor.samples}, порог {monitor.threshold_ms:.0f} мс, "
+            f"превышений: {monitor.stalls}, максимум {monitor.max_lag_ms:.0f} мс",
+            f"p50 {p50:.1f} мс, p95 {p95:.1f} мс, p99 {p99:.1f} мс (последние {len(monitor.lags)})",
+            "  ".join(f"{label}: {count}" for label, count in monitor.histogram_rows() if count),
+        ]
+        if monitor.last_stall:
+            stall = monitor.last_stall
+            lines.append(f"Последняя перегрузка: {stall['lag_ms']:.0f} мс, "
+                         f"обработчик: {stall['handler'] or 'неизвестен'}")
+            if stall['concurrent']:
+                lines.append(f"Параллельно в пуле потоков: {', '.join(stall['concurrent'])}")
+        self.lag_text.value = "\n".join(lines)
+
+    def change_meter_period(self, e):
+        """Смена периода сводки стоимости отправки"""
+        self.meter_minutes = int(self.meter_period_dropdown.value)
+        self.refresh(e)
+
+    def sorted_rows(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Строки сводки в порядке выбранной колонки"""
+        key = TRACE_COLUMNS[self.sort_column][0]
+        return sorted(rows, key=lambda row: row[key], reverse=not self.sort_ascending)
+
+    def refresh(self, e: Optional[ft.ControlEvent]):
+        """Перечитывает спаны"""
+        self.show_stats()
+        mark_dirty(self.page, self)
+
+    def on_sort(self, e: ft.DataColumnSortEvent):
+        """Сортировка по нажатой колонке"""
+        self.sort_column = e.column_index
+        self.sort_ascending = e.ascending
+        self.refresh(e)
+
+    def clear_spans(self, e):
+        """Очищает буфер спанов"""
+        get_tracer().clear()
+        self.refresh(e)
+
+    async def dump_spans(self, e):
+        """Сохраняет спаны в JSONL (запись идёт в отдельном потоке)"""
+        try:
+            path = await asyncio.to_thread(get_tracer().dump_jsonl)
+            self.show_snackbar(f"Спаны сохранены → {path}")
+        except OSError as error:
+            self.show_snackbar(f"Ошибка сохранения: {error}")
+
+    def show_snackbar(self, message: str):
+        """Показывает SnackBar с сообщением"""
+        if self.page:
+            snackbar = ft.SnackBar(content=ft.Text(message, size=12), duration=2000)
+            self.page.snack_bar = snackbar
+            snackbar.open = True
+            mark_dirty(self.page)
+        else:
+            print(f"[Snackbar] {message}")